@@ -1,3 +1,38 @@
 """CLI to convert between NestedText and JSON, YAML or TOML, with explicit type casting."""
 
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
 __version__ = '0.2.7'
+
+if TYPE_CHECKING:
+    from .api import convert, convert_into  # noqa: TCH004
+    from .dumpers import AliasExpansion  # noqa: TCH004
+
+__all__ = ('AliasExpansion', 'convert', 'convert_into')
+
+
+def __getattr__(name: str) -> object:
+    """
+    Import the library API on first use, so the console scripts start without it.
+
+    Args:
+        name: An attribute of this package.
+
+    Returns:
+        The attribute, imported from its module.
+
+    Raises:
+        AttributeError: There's no such attribute.
+    """
+    if name in ('convert', 'convert_into'):
+        from . import api
+
+        return getattr(api, name)
+    if name == 'AliasExpansion':
+        from .dumpers import AliasExpansion
+
+        return AliasExpansion
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
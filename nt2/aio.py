@@ -0,0 +1,276 @@
+"""
+Async conversion functions, which offload the work to a thread or process pool.
+
+Parsing, casting and dumping are all CPU-bound,
+so running them directly in a coroutine would stall the event loop.
+Instead, a `ConversionPool` runs each `nt2.convert` call in an executor,
+with at most ``limit`` reading an async source or running (or queued in the executor) at once;
+any more wait their turn, without blocking the loop, or reading their sources yet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable
+from functools import lru_cache, partial
+from os import PathLike, cpu_count
+from typing import TYPE_CHECKING, TextIO
+from weakref import WeakKeyDictionary
+
+from .api import convert as _convert
+from .dumpers import WRITE_BUFFER_SIZE
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    from .casters import CastSchema
+    from .dumpers import AliasExpansion
+
+
+async def _read_source(source: object) -> object:
+    """
+    Read an async source fully, leaving any other source as is, for `nt2.convert`.
+
+    Args:
+        source: A stream with an async ``read`` method (like an ``asyncio.StreamReader``),
+            an async iterable of ``str`` or ``bytes`` chunks,
+            or any source accepted by `nt2.convert`.
+
+    Returns:
+        The content of an async source as ``str`` or ``bytes``, or else ``source`` itself.
+    """
+    read = getattr(source, 'read', None)
+    if read is not None and asyncio.iscoroutinefunction(read):
+        return await read()
+    if isinstance(source, AsyncIterable):
+        chunks = [chunk async for chunk in source]
+        return b''.join(chunks) if chunks and isinstance(chunks[0], bytes) else ''.join(chunks)
+    return source
+
+
+async def _write(writer: object, content: str):
+    """
+    Write content to a sync or async writer, waiting for it to drain between chunks.
+
+    Args:
+        writer: A text stream, an ``asyncio.StreamWriter`` (written as UTF-8),
+            or any object with a ``write`` method or coroutine taking a ``str``.
+        content: The content to write.
+    """
+    encode = isinstance(writer, asyncio.StreamWriter)
+    for start in range(0, len(content), WRITE_BUFFER_SIZE):
+        chunk = content[start : start + WRITE_BUFFER_SIZE]
+        written = writer.write(chunk.encode('utf-8') if encode else chunk)  # pyright: ignore
+        if asyncio.iscoroutine(written):
+            await written
+        if encode:
+            await writer.drain()  # pyright: ignore [reportAttributeAccessIssue]
+
+
+class ConversionPool:
+    """
+    Run conversions in an executor, at most ``limit`` at a time per event loop.
+
+    The executor may be a ``ThreadPoolExecutor`` or a ``ProcessPoolExecutor``.
+    Threads share memory and start quickly, and each keeps its own YAML parsers,
+    while processes let conversions run truly in parallel.
+    For a process pool, sources must be content, paths, or async sources
+    (which are read in the event loop), rather than already open sync streams.
+    """
+
+    def __init__(self, executor: Executor | None = None, limit: int | None = None):
+        """
+        Configure the executor and concurrency limit.
+
+        Args:
+            executor: The executor to run conversions in,
+                or ``None`` for the event loop's default executor.
+            limit: The most conversions to submit to the executor at once,
+                defaulting to the number of CPUs.
+        """
+        self.executor = executor
+        self.limit = limit or cpu_count() or 1
+        self._semaphores: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            WeakKeyDictionary()
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        """
+        Get the semaphore limiting conversions in the running event loop.
+
+        Returns:
+            A semaphore for ``limit`` conversions, created on first use in each loop.
+        """
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.limit)
+        return semaphore
+
+    async def convert(  # noqa: PLR0913
+        self,
+        source: str | bytes | PathLike | TextIO | AsyncIterable,
+        from_format: str,
+        to_format: str,
+        *,
+        schema: CastSchema | None = None,
+        layout: str = 'indented',
+        split: bool = False,
+        expansion: AliasExpansion | None = None,
+    ) -> str:
+        """
+        Convert content as `nt2.convert` does, in the executor, once under the limit.
+
+        An async source is only read once under the limit, too,
+        so conversions waiting their turn don't hold whole inputs in memory.
+
+        Args:
+            source: Content as ``str`` or UTF-8 ``bytes``, a path, a text stream,
+                a stream with an async ``read`` method,
+                or an async iterable of ``str`` or ``bytes`` chunks.
+            from_format: One of `nt2.api.FORMATS`.
+            to_format: One of `nt2.api.FORMATS`, or ``'schema'``.
+            schema: The `CastSchema` to up-type NestedText with, or ``None`` to leave it untyped.
+            layout: How to lay out JSON, as for `nt2.convert`.
+            split: Whether to write each element of a top-level NestedText list
+                as its own YAML document.
+            expansion: Options for checking the expansion of YAML by aliases.
+
+        Returns:
+            The converted content.
+        """
+        async with self._semaphore():
+            job = partial(
+                _convert,
+                await _read_source(source),
+                from_format,
+                to_format,
+                schema=schema,
+                layout=layout,
+                split=split,
+                expansion=expansion,
+            )
+            return await asyncio.get_running_loop().run_in_executor(self.executor, job)
+
+    async def convert_into(  # noqa: PLR0913
+        self,
+        writer: object,
+        source: str | bytes | PathLike | TextIO | AsyncIterable,
+        from_format: str,
+        to_format: str,
+        *,
+        schema: CastSchema | None = None,
+        layout: str = 'indented',
+        split: bool = False,
+        expansion: AliasExpansion | None = None,
+    ):
+        """
+        Convert content as `convert` does, then write it to a sync or async writer.
+
+        Args:
+            writer: A text stream, an ``asyncio.StreamWriter`` (written as UTF-8),
+                or any object with a ``write`` method or coroutine taking a ``str``.
+            source: Content or a source, as for `convert`.
+            from_format: One of `nt2.api.FORMATS`.
+            to_format: One of `nt2.api.FORMATS`, or ``'schema'``.
+            schema: The `CastSchema` to up-type NestedText with, or ``None`` to leave it untyped.
+            layout: How to lay out JSON, as for `nt2.convert`.
+            split: Whether to write each element of a top-level NestedText list
+                as its own YAML document.
+            expansion: Options for checking the expansion of YAML by aliases.
+        """
+        content = await self.convert(
+            source,
+            from_format,
+            to_format,
+            schema=schema,
+            layout=layout,
+            split=split,
+            expansion=expansion,
+        )
+        await _write(writer, content)
+
+
+@lru_cache(maxsize=None)
+def default_pool() -> ConversionPool:
+    """
+    Get the shared `ConversionPool`, using each event loop's default executor.
+
+    Returns:
+        A `ConversionPool` with the default executor and limit.
+    """
+    return ConversionPool()
+
+
+async def convert(  # noqa: PLR0913
+    source: str | bytes | PathLike | TextIO | AsyncIterable,
+    from_format: str,
+    to_format: str,
+    *,
+    schema: CastSchema | None = None,
+    layout: str = 'indented',
+    split: bool = False,
+    expansion: AliasExpansion | None = None,
+) -> str:
+    """
+    Convert content as `nt2.convert` does, with the `default_pool`.
+
+    Args:
+        source: Content or a source, as for `ConversionPool.convert`.
+        from_format: One of `nt2.api.FORMATS`.
+        to_format: One of `nt2.api.FORMATS`, or ``'schema'``.
+        schema: The `CastSchema` to up-type NestedText with, or ``None`` to leave it untyped.
+        layout: How to lay out JSON, as for `nt2.convert`.
+        split: Whether to write each element of a top-level NestedText list
+            as its own YAML document.
+        expansion: Options for checking the expansion of YAML by aliases.
+
+    Returns:
+        The converted content.
+    """
+    return await default_pool().convert(
+        source,
+        from_format,
+        to_format,
+        schema=schema,
+        layout=layout,
+        split=split,
+        expansion=expansion,
+    )
+
+
+async def convert_into(  # noqa: PLR0913
+    writer: object,
+    source: str | bytes | PathLike | TextIO | AsyncIterable,
+    from_format: str,
+    to_format: str,
+    *,
+    schema: CastSchema | None = None,
+    layout: str = 'indented',
+    split: bool = False,
+    expansion: AliasExpansion | None = None,
+):
+    """
+    Convert content as `nt2.convert` does, with the `default_pool`, then write it.
+
+    Args:
+        writer: A sync or async writer, as for `ConversionPool.convert_into`.
+        source: Content or a source, as for `ConversionPool.convert`.
+        from_format: One of `nt2.api.FORMATS`.
+        to_format: One of `nt2.api.FORMATS`, or ``'schema'``.
+        schema: The `CastSchema` to up-type NestedText with, or ``None`` to leave it untyped.
+        layout: How to lay out JSON, as for `nt2.convert`.
+        split: Whether to write each element of a top-level NestedText list
+            as its own YAML document.
+        expansion: Options for checking the expansion of YAML by aliases.
+    """
+    await default_pool().convert_into(
+        writer,
+        source,
+        from_format,
+        to_format,
+        schema=schema,
+        layout=layout,
+        split=split,
+        expansion=expansion,
+    )
@@ -0,0 +1,258 @@
+"""
+Conversion functions for use as a library, returning or writing content rather than printing it.
+
+Each call keeps its own state, and YAML is handled with per-thread ``ruamel.yaml`` objects,
+so these are safe to call from multiple threads at once.
+"""
+
+from __future__ import annotations
+
+import io
+from os import PathLike
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterator, TextIO
+
+from .dumpers import (
+    AliasExpansion,
+    _coalesce,
+    _require_toml_support,
+    render_json_as_schema,
+    render_toml_as_schema,
+    render_yaml_as_schema,
+    stream_json_as_nestedtext,
+    stream_nestedtext_as_json,
+    stream_nestedtext_as_jsonl,
+    stream_nestedtext_as_toml,
+    stream_nestedtext_as_yaml,
+    stream_toml_as_nestedtext,
+    stream_yaml_as_nestedtext,
+)
+
+if TYPE_CHECKING:
+    from .casters import CastSchema
+
+FORMATS = ('nestedtext', 'json', 'yaml', 'toml')
+JSON_LAYOUTS = ('indented', 'compact', 'lines', 'elements')
+
+
+def _open_source(source: str | bytes | PathLike | TextIO) -> Path | TextIO:
+    """
+    Interpret a conversion source as a path or text stream, for the render functions.
+
+    Args:
+        source: Content as ``str`` or UTF-8 ``bytes``, a path, or a text stream.
+
+    Returns:
+        A ``Path`` to read, or a text stream.
+    """
+    if isinstance(source, PathLike):
+        return Path(source)
+    if isinstance(source, bytes):
+        source = source.decode('utf-8-sig')
+    if isinstance(source, str):
+        stream = io.StringIO(source)
+        stream.name = '<string>'
+        return stream
+    return source
+
+
+def _check_formats(from_format: str, to_format: str, layout: str):
+    """
+    Check that a conversion is supported.
+
+    Args:
+        from_format: One of ``FORMATS``.
+        to_format: One of ``FORMATS``, or ``'schema'`` for a generated NestedText schema.
+        layout: One of ``JSON_LAYOUTS``.
+
+    Raises:
+        ValueError: The formats or layout are not supported.
+    """
+    if from_format not in FORMATS or to_format not in (*FORMATS, 'schema'):
+        msg = f"Unknown format in {from_format!r} -> {to_format!r}; choose from {FORMATS}"
+        raise ValueError(msg)
+    if (from_format == 'nestedtext') == (to_format in ('nestedtext', 'schema')):
+        msg = f"Can't convert {from_format!r} -> {to_format!r}; one side must be 'nestedtext'"
+        raise ValueError(msg)
+    if layout not in JSON_LAYOUTS:
+        msg = f"Unknown JSON layout {layout!r}; choose from {JSON_LAYOUTS}"
+        raise ValueError(msg)
+
+
+def _stream_from_nestedtext(
+    src: Path | TextIO,
+    to_format: str,
+    schema: CastSchema | None,
+    layout: str,
+    split: bool,  # noqa: FBT001
+) -> Iterator[str]:
+    """
+    Convert NestedText to JSON, YAML or TOML, generating it in pieces.
+
+    Args:
+        src: A path to a NestedText file, or a text stream.
+        to_format: ``'json'``, ``'yaml'``, or ``'toml'``.
+        schema: The `CastSchema` to up-type with, or ``None`` to leave the data untyped.
+        layout: One of ``JSON_LAYOUTS``, as for `dump_nestedtext_to_json`.
+        split: Whether to write each element of a top-level list as its own YAML document.
+
+    Yields:
+        Consecutive pieces of the converted content.
+    """
+    if schema is None:
+        from .casters import CastSchema
+
+        schema = CastSchema()
+    if to_format == 'json' and layout in ('lines', 'elements'):
+        yield from stream_nestedtext_as_jsonl(src, schema, layout == 'elements')
+    elif to_format == 'json':
+        yield from stream_nestedtext_as_json(src, schema, layout == 'compact')
+    elif to_format == 'yaml':
+        yield from stream_nestedtext_as_yaml(src, schema, split)
+    else:
+        yield from stream_nestedtext_as_toml(src, schema)
+
+
+def _stream_to_nestedtext(
+    src: Path | TextIO, from_format: str, to_format: str, expansion: AliasExpansion | None
+) -> Iterator[str]:
+    """
+    Convert JSON, YAML or TOML to NestedText (or a NestedText schema), generating it in pieces.
+
+    Args:
+        src: A path to a JSON, YAML or TOML file, or a text stream.
+        from_format: ``'json'``, ``'yaml'``, or ``'toml'``.
+        to_format: ``'nestedtext'``, or ``'schema'`` for a generated NestedText schema.
+        expansion: Options for checking the expansion of YAML by aliases.
+
+    Yields:
+        Consecutive pieces of the converted content.
+    """
+    if from_format == 'yaml':
+        if to_format == 'schema':
+            yield render_yaml_as_schema(src, expansion)
+        else:
+            yield from stream_yaml_as_nestedtext(src, expansion)
+    elif from_format == 'json':
+        if to_format == 'schema':
+            yield render_json_as_schema(src)
+        else:
+            yield from stream_json_as_nestedtext(src)
+    elif to_format == 'schema':
+        yield render_toml_as_schema(src)
+    else:
+        yield from stream_toml_as_nestedtext(src)
+
+
+def _stream_conversion(  # noqa: PLR0913
+    source: str | bytes | PathLike | TextIO,
+    from_format: str,
+    to_format: str,
+    schema: CastSchema | None,
+    layout: str,
+    split: bool,  # noqa: FBT001
+    expansion: AliasExpansion | None,
+) -> Iterator[str]:
+    """
+    Convert content between formats, generating it in pieces.
+
+    Args:
+        source: Content as ``str`` or UTF-8 ``bytes``, a path, or a text stream.
+        from_format: One of ``FORMATS``.
+        to_format: One of ``FORMATS``, or ``'schema'`` for a generated NestedText schema.
+        schema: The `CastSchema` to up-type NestedText with.
+        layout: One of ``JSON_LAYOUTS``.
+        split: Whether to write each element of a top-level NestedText list as its own
+            YAML document.
+        expansion: Options for checking the expansion of YAML by aliases.
+
+    Yields:
+        Consecutive pieces of the converted content.
+    """
+    _check_formats(from_format, to_format, layout)
+    if 'toml' in (from_format, to_format):
+        _require_toml_support()
+    src = _open_source(source)
+    if from_format == 'nestedtext':
+        yield from _stream_from_nestedtext(src, to_format, schema, layout, split)
+    else:
+        yield from _stream_to_nestedtext(src, from_format, to_format, expansion)
+
+
+def convert(  # noqa: PLR0913
+    source: str | bytes | PathLike | TextIO,
+    from_format: str,
+    to_format: str,
+    *,
+    schema: CastSchema | None = None,
+    layout: str = 'indented',
+    split: bool = False,
+    expansion: AliasExpansion | None = None,
+) -> str:
+    """
+    Convert content between NestedText and JSON, YAML or TOML, returning the result.
+
+    One of ``from_format`` and ``to_format`` must be ``'nestedtext'``,
+    except that ``to_format`` may instead be ``'schema'``,
+    to generate a NestedText schema from JSON, YAML or TOML.
+
+    Args:
+        source: Content as ``str`` or UTF-8 ``bytes``, a path, or a text stream.
+        from_format: One of ``FORMATS``.
+        to_format: One of ``FORMATS``, or ``'schema'``.
+        schema: The `CastSchema` to up-type NestedText with, or ``None`` to leave it untyped.
+        layout: How to lay out JSON, as for `dump_nestedtext_to_json`:
+            one of ``'indented'``, ``'compact'``, ``'lines'``, or ``'elements'``.
+        split: Whether to write each element of a top-level NestedText list
+            as its own YAML document.
+        expansion: Options for checking the expansion of YAML by aliases.
+
+    Returns:
+        The converted content.
+
+    Raises:
+        ValueError: The formats or layout are not supported.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    return ''.join(
+        _stream_conversion(source, from_format, to_format, schema, layout, split, expansion)
+    )
+
+
+def convert_into(  # noqa: PLR0913
+    writer: TextIO,
+    source: str | bytes | PathLike | TextIO,
+    from_format: str,
+    to_format: str,
+    *,
+    schema: CastSchema | None = None,
+    layout: str = 'indented',
+    split: bool = False,
+    expansion: AliasExpansion | None = None,
+):
+    """
+    Convert content as `convert` does, writing the result to ``writer`` as it's generated.
+
+    Args:
+        writer: A text stream (or anything with a ``write`` method taking a ``str``).
+        source: Content as ``str`` or UTF-8 ``bytes``, a path, or a text stream.
+        from_format: One of ``FORMATS``.
+        to_format: One of ``FORMATS``, or ``'schema'``.
+        schema: The `CastSchema` to up-type NestedText with, or ``None`` to leave it untyped.
+        layout: How to lay out JSON, as for `convert`.
+        split: Whether to write each element of a top-level NestedText list
+            as its own YAML document.
+        expansion: Options for checking the expansion of YAML by aliases.
+
+    Raises:
+        ValueError: The formats or layout are not supported.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    for content in _coalesce(
+        _stream_conversion(source, from_format, to_format, schema, layout, split, expansion)
+    ):
+        writer.write(content)
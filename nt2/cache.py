@@ -0,0 +1,127 @@
+"""A persistent, size-bounded cache of rendered output, keyed by input content and options."""
+
+from __future__ import annotations
+
+from contextlib import suppress
+from hashlib import sha256
+from os import utime
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import Callable
+
+from . import __version__
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Bumped whenever the layout of entry files changes
+_ENTRY_FORMAT = '2'
+
+
+class RenderCache:
+    """
+    Rendered output stored in a directory, one file per distinct conversion.
+
+    Each entry is keyed on the input bytes, the render function (so the source
+    and target formats), a token for any options (like a `CastSchema`'s queries),
+    and the nt2 version, so a hit can be returned without parsing anything.
+    Alongside the output, each entry keeps any diagnostics the render printed to stderr,
+    to be repeated on a hit.
+
+    Entries are touched when read, and once the directory grows past ``max_bytes``,
+    the least recently used entries are removed by `prune`.
+    """
+
+    def __init__(self, directory: str | Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Use (and create if needed) a cache directory.
+
+        Args:
+            directory: Where to store cache entries.
+            max_bytes: The total entry size to prune the cache down to.
+        """
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def key(self, src: str | Path, render: Callable[..., str], options: str = '') -> str:
+        """
+        Identify the output of rendering an input file with some options.
+
+        Args:
+            src: A path to an input file.
+            render: A function like `render_nestedtext_as_json`.
+            options: A token representing any other inputs to ``render``.
+
+        Returns:
+            A hex digest to store or look up the output with.
+        """
+        digest = sha256()
+        for part in (__version__, _ENTRY_FORMAT, render.__module__, render.__qualname__, options):
+            digest.update(part.encode('utf-8'))
+            digest.update(b'\0')
+        digest.update(Path(src).read_bytes())
+        return digest.hexdigest()
+
+    def _entry(self, key: str) -> Path:
+        return self.directory / key[:2] / key
+
+    def get(self, key: str) -> tuple[str, str] | None:
+        """
+        Look up stored output, marking it as recently used.
+
+        Args:
+            key: As from `key`.
+
+        Returns:
+            The stored output and diagnostics, or ``None`` if there are none.
+        """
+        entry = self._entry(key)
+        try:
+            data = entry.read_bytes()
+        except FileNotFoundError:
+            return None
+        with suppress(FileNotFoundError):
+            utime(entry)
+        header, _, data = data.partition(b'\n')
+        diagnostics_size = int(header)
+        return (data[diagnostics_size:].decode('utf-8'), data[:diagnostics_size].decode('utf-8'))
+
+    def put(self, key: str, content: str, diagnostics: str = ''):
+        """
+        Store output, replacing any existing entry atomically.
+
+        Args:
+            key: As from `key`.
+            content: The rendered output.
+            diagnostics: Anything the render printed to stderr.
+        """
+        encoded_diagnostics = diagnostics.encode('utf-8')
+        entry = self._entry(key)
+        entry.parent.mkdir(exist_ok=True)
+        with NamedTemporaryFile(
+            'wb', dir=entry.parent, prefix=f".{key}.", suffix='.tmp', delete=False
+        ) as tmp:
+            tmp.write(b'%d\n' % len(encoded_diagnostics))
+            tmp.write(encoded_diagnostics)
+            tmp.write(content.encode('utf-8'))
+        Path(tmp.name).replace(entry)
+
+    def prune(self):
+        """
+        Remove the least recently used entries, until the total size fits ``max_bytes``.
+
+        Temporary files (named with a leading dot) are skipped,
+        as other processes may still be writing them.
+        """
+        entries = []
+        for entry in self.directory.glob('??/[!.]*'):
+            with suppress(FileNotFoundError):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry))
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries, key=lambda item: item[0]):
+            if total <= self.max_bytes:
+                break
+            with suppress(FileNotFoundError):
+                entry.unlink()
+            total -= size
@@ -1,33 +1,53 @@
 """
 Provide any functions for transforming a "stringy" ``dict``/``list`` to one with more types.
 
-In practice, this is just `cast_stringy_data` and any support functions it needs.
+In practice, this is just `CastSchema`, `cast_stringy_data`, and any support functions they need.
 """
 
 from __future__ import annotations
 
 import re
+import sys
 from datetime import date, datetime, time
-from typing import Sequence, cast
-from uuid import uuid4
+from typing import TYPE_CHECKING, Iterable, Iterator, Sequence, cast
 
 try:
     from typing import TypeAlias
 except ImportError:
     from typing import Any as TypeAlias
 
-from .converters import Converter as _Converter, mk_json_types_converter, mk_unyamlable_converter
-from .yamlpath_tools import (
-    Processor,
-    YAMLPath as _YAMLPath,
-    mk_yamlpath_processor,
-    non_null_matches,
-)
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .converters import Converter
+    from .matchers import MatchState, QueryMatcher, Signature, Trail
+    from .yamlpath_tools import YAMLPath
+
+from nestedtext import load as _ntload
 
-Converter: TypeAlias = _Converter
 StringyDatum: TypeAlias = 'str | list | dict'
 StringyData: TypeAlias = 'list[StringyDatum] | dict[str, StringyDatum]'
-YAMLPath: TypeAlias = _YAMLPath
+
+
+def __getattr__(name: str) -> object:
+    """
+    Import ``YAMLPath`` on first use, as yamlpath (and ruamel.yaml) are slow to import.
+
+    Args:
+        name: An attribute of this module.
+
+    Returns:
+        The attribute, imported from its module.
+
+    Raises:
+        AttributeError: There's no such attribute.
+    """
+    if name == 'YAMLPath':
+        from .yamlpath_tools import YAMLPath
+
+        return YAMLPath
+    msg = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(msg)
 
 
 def _str_to_bool(informal_bool: str) -> bool:
@@ -83,18 +103,15 @@ def _str_to_num(informal_num: str) -> int | float:
         return inum if num == inum else num
 
 
-def _str_to_datey(informal_datey: str, time_marker: str) -> date | datetime | str:
+def _str_to_datey(informal_datey: str) -> date | datetime | time:
     """
-    Translate an ISO 8601 date/time ``str`` into a ``date``, ``datetime``, or marked time ``str``.
+    Translate an ISO 8601 date/time ``str`` into a ``date``, ``datetime``, or ``time``.
 
     Args:
         informal_datey: An ISO 8601 date/time ``str``.
-        time_marker: An arbitrary prefix (such as a UUID) which will be used
-            to create a "marked time" ``str``, rather than an (unyamlable) ``time`` instance.
 
     Returns:
-        An ``date``, ``datetime``, or marked time ``str`` equivalent of ``informal_datey``.
-            A marked time ``str`` is just ISO 8601 prefixed with ``time_marker``.
+        An ``date``, ``datetime``, or ``time`` equivalent of ``informal_datey``.
 
     Raises:
         ValueError: This doesn't look like enough like a date/time to translate.
@@ -106,51 +123,571 @@ def _str_to_datey(informal_datey: str, time_marker: str) -> date | datetime | st
             return datetime.fromisoformat(informal_datey)
         except ValueError:
             try:
-                val = time.fromisoformat(informal_datey)
+                return time.fromisoformat(informal_datey)
             except Exception as e:  # pragma: no cover
                 raise ValueError(': '.join(e.args)) from None
-            else:
-                return f"{time_marker}{val.isoformat()}"
 
 
-def _cast_datey(surgeon: Processor, date_paths: Sequence[str]) -> dict | list:
+def _locate(
+    data: dict | list, ypath: YAMLPath
+) -> tuple[dict | list, str | int, list[dict | list]]:
+    """
+    Follow a literal YAMLPath, such as one reported by yamlpath for a match, to its node.
+
+    Args:
+        data: The ``dict`` or ``list`` the path is relative to.
+        ypath: A YAMLPath composed only of key and index segments.
+
+    Returns:
+        The container of the node, the node's key or (non-negative) index within it,
+            and all containers on the way, including ``data`` and the node's container.
+
+    Raises:
+        KeyError: A key segment isn't in its container.
+        IndexError: An index segment is out of range.
+        TypeError: The path tries to descend through a scalar, or has a non-literal segment.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    ancestors = [data]
+    *refs, ref = (ref for _, ref in ypath.escaped)
+    for step in refs:
+        ancestors.append(ancestors[-1][step])
+    parent = ancestors[-1]
+    if isinstance(parent, list) and ref < 0:
+        ref += len(parent)
+    parent[ref]
+    return parent, ref, ancestors
+
+
+def _cast_str(
+    informal: str, type_names: set[str]
+) -> bool | float | date | datetime | time | str | None:
     r"""
-    Cast ``date``/``datetime``/``time`` strings to ``date``/``datetime``/``time`` objects.
+    Up-type a ``str`` matched by queries for one or more types.
 
-    We can't currently store a time type in the intermediary YAML doc object (``surgeon.data``),
-    so we mark times as special ``str``\ s within ``surgeon.data``,
-    then do a second pass to convert them to ``time`` objects on the way out.
+    When queries for several types match the same node,
+    the first applicable type wins, in the order: null, boolean, number, date.
+    Casting to null only applies to empty ``str``\ s.
 
     Args:
-        surgeon: A YAMLPath ``Processor`` with existing ``data`` to be up-typed.
-        date_paths: YAMLPath queries indicating nodes to be up-typed to
-            ``date``/``datetime``/``time``.
+        informal: The matched ``str``.
+        type_names: Schema type names ('null', 'boolean', 'number', 'date')
+            of all queries matching this node.
 
     Returns:
-        A nested ``dict`` or ``list`` containing some "up-typed" (casted) items
-            in addition to ``str``\ s.
+        The up-typed value, or ``informal`` itself if no cast applies.
 
     Raises:
-        ValueError: Up-typing a ``str`` failed due to an unexpected format.
+        ValueError: Up-typing failed due to an unexpected format.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    if 'null' in type_names and informal == '':
+        return None
+    if 'boolean' in type_names:
+        return _str_to_bool(informal)
+    if 'number' in type_names:
+        return _str_to_num(informal)
+    if 'date' in type_names:
+        return _str_to_datey(informal)
+    return informal
+
+
+def _is_broad(sig: Signature) -> bool:
+    """
+    Check whether a query may cover others, by ending in ``**``.
+
+    Args:
+        sig: The `query_signature` of a query.
+
+    Returns:
+        ``True`` if `covers` may find this query covering another.
+    """
+    from yamlpath.enums import PathSegmentTypes
+
+    return not isinstance(sig, str) and bool(sig) and sig[-1][0] is PathSegmentTypes.TRAVERSE
+
+
+def _distinct_queries(paths: Sequence[YAMLPath]) -> list[tuple[Signature, YAMLPath]]:
+    """
+    Drop duplicate and redundant queries among those for a single cast type.
+
+    Args:
+        paths: Parsed YAMLPath queries for one type.
+
+    Returns:
+        The signature and first spelling of each query not covered by another, in order.
     """
-    marked_times_present = False
-    time_marker = str(uuid4())
-    marked_time_converter = mk_unyamlable_converter(time_marker=time_marker)
+    from .matchers import covers, query_signature
+
+    distinct: dict[Signature, YAMLPath] = {}
+    for ypath in paths:
+        distinct.setdefault(query_signature(ypath), ypath)
+    broad = list(filter(_is_broad, distinct))
+    return [
+        (sig, ypath)
+        for sig, ypath in distinct.items()
+        if not any(other != sig and covers(other, sig) for other in broad)
+    ]
+
+
+def _find_conflicts(
+    buckets: dict[str, list[tuple[Signature, YAMLPath]]],
+) -> list[tuple[str, YAMLPath, str, YAMLPath]]:
+    r"""
+    Find pairs of queries which may cast the same node to different non-null types.
+
+    Null casting only applies to empty ``str``\ s, so it doesn't conflict with other types.
+
+    Args:
+        buckets: Distinct queries by type name, as from `_distinct_queries`.
+
+    Returns:
+        A ``(type_name, query, other_type_name, other_query)`` tuple for each conflict,
+            where ``type_name`` takes precedence.
+    """
+    from .matchers import covers
+
+    conflicts = []
+    typed = [(type_name, bucket) for type_name, bucket in buckets.items() if type_name != 'null']
+    for idx, (type_name, bucket) in enumerate(typed):
+        for other_type_name, other_bucket in typed[idx + 1 :]:
+            others = dict(other_bucket)
+            for sig, ypath in bucket:
+                if sig in others:
+                    conflicts.append((type_name, ypath, other_type_name, others[sig]))
+            for sig, ypath in filter(lambda query: _is_broad(query[0]), bucket):
+                conflicts.extend(
+                    (type_name, ypath, other_type_name, other_ypath)
+                    for other_sig, other_ypath in other_bucket
+                    if other_sig != sig and covers(sig, other_sig)
+                )
+            for other_sig, other_ypath in filter(lambda query: _is_broad(query[0]), other_bucket):
+                conflicts.extend(
+                    (type_name, ypath, other_type_name, other_ypath)
+                    for sig, ypath in bucket
+                    if sig != other_sig and covers(other_sig, sig)
+                )
+    return conflicts
+
+
+def _report_conflict(type_name: str, ypath: YAMLPath, other_type_name: str, other_ypath: YAMLPath):
+    """
+    Print to stderr that two queries may cast the same node to different types.
+
+    Args:
+        type_name: The type which takes precedence.
+        ypath: The query for ``type_name``.
+        other_type_name: The type which is overridden.
+        other_ypath: The query for ``other_type_name``.
+    """
+    print(
+        f"Conflicting cast types ({type_name} over {other_type_name}) for YAML Paths:",
+        ypath,
+        other_ypath,
+        sep='\n',
+        file=sys.stderr,
+    )
+
+
+def _default_converter() -> Converter:
+    """
+    Get the shared JSON ``Converter``, importing cattrs only when first needed.
+
+    Returns:
+        The ``Converter`` from ``get_converter('json')``.
+    """
+    from .converters import get_converter
+
+    return get_converter('json')
+
+
+class CastSchema:
+    """
+    A reusable, pre-parsed set of YAMLPath queries, grouped by the type to cast matches to.
 
-    for match in non_null_matches(surgeon, *date_paths):
-        if not isinstance(match.node, str) or match.node.startswith(time_marker):
-            continue
+    Every query is parsed and validated once, on construction,
+    so the same ``CastSchema`` can `cast` any number of documents without per-document setup.
+    """
+
+    SCHEMA_KEYS: tuple[str, ...] = ('null', 'boolean', 'number', 'date')
+
+    def __init__(
+        self,
+        bool_paths: Sequence[str] = (),
+        null_paths: Sequence[str] = (),
+        num_paths: Sequence[str] = (),
+        date_paths: Sequence[str] = (),
+    ):
+        """
+        Parse and validate all queries, grouped by cast type.
+
+        Within each type, equivalent spellings of a query are only kept once,
+        and queries covered by a broader one (ending in ``**``) are dropped.
+        Queries which may cast the same node to different non-null types
+        are reported to stderr, and listed in ``conflicts``.
+        As in `cast`, the first applicable type wins: null, boolean, number, then date.
+
+        Args:
+            bool_paths: YAMLPath queries indicating nodes to be up-typed to ``bool``.
+            null_paths: YAMLPath queries indicating nodes to be up-typed to ``None``.
+            num_paths: YAMLPath queries indicating nodes to be up-typed to ``int``/``float``.
+            date_paths: YAMLPath queries indicating nodes to be up-typed to
+                ``date``/``datetime``/``time``.
+
+        Raises:
+            ValueError: A query is not a valid YAMLPath.
+
+        # noqa: DAR401
+        # noqa: DAR402
+        """
+        self.bool_paths = self.null_paths = self.num_paths = self.date_paths = ()
+        self.conflicts: list[tuple[str, YAMLPath, str, YAMLPath]] = []
+        self._query_types: list[str] = []
+        self._queries: list[YAMLPath] = []
+        self._matcher: QueryMatcher | None = None
+        if not any((bool_paths, null_paths, num_paths, date_paths)):
+            # Leave yamlpath (and so ruamel.yaml) unimported, when there's nothing to parse
+            return
+
+        from .matchers import QueryMatcher
+        from .yamlpath_tools import parse_yamlpath
+
+        self.bool_paths = tuple(map(parse_yamlpath, bool_paths))
+        self.null_paths = tuple(map(parse_yamlpath, null_paths))
+        self.num_paths = tuple(map(parse_yamlpath, num_paths))
+        self.date_paths = tuple(map(parse_yamlpath, date_paths))
+
+        buckets = {
+            type_name: _distinct_queries(paths)
+            for type_name, paths in zip(
+                self.SCHEMA_KEYS,
+                (self.null_paths, self.bool_paths, self.num_paths, self.date_paths),
+            )
+        }
+        self.conflicts = _find_conflicts(buckets)
+        for conflict in self.conflicts:
+            _report_conflict(*conflict)
+
+        for type_name, bucket in buckets.items():
+            self._query_types.extend(type_name for _ in bucket)
+            self._queries.extend(ypath for _, ypath in bucket)
+        self._matcher = QueryMatcher(self._queries)
+
+    @property
+    def _compiled(self) -> QueryMatcher:
+        """
+        Get the compiled queries, of a schema which has any.
+
+        Returns:
+            The `QueryMatcher` for all kept queries.
+        """
+        return cast('QueryMatcher', self._matcher)
+
+    @property
+    def cache_token(self) -> str:
+        """
+        Represent the merged queries, so equivalent schemas are interchangeable as cache keys.
+
+        Returns:
+            Each kept query and its cast type, one per line, in order of precedence.
+        """
+        return '\n'.join(
+            f"{type_name} {ypath}" for type_name, ypath in zip(self._query_types, self._queries)
+        )
+
+    @classmethod
+    def from_schema_files(
+        cls,
+        *schema_files: str | Path,
+        bool_paths: Sequence[str] = (),
+        null_paths: Sequence[str] = (),
+        num_paths: Sequence[str] = (),
+        date_paths: Sequence[str] = (),
+        types: Sequence[str] = SCHEMA_KEYS,
+    ) -> CastSchema:
+        r"""
+        Create a ``CastSchema`` from NestedText schema files, plus any extra queries.
+
+        Args:
+            schema_files: NestedText documents, each a map from type names
+                ('null', 'boolean', 'number', 'date') to lists of YAMLPaths.
+            bool_paths: Extra YAMLPath queries for ``bool`` casting.
+            null_paths: Extra YAMLPath queries for ``None`` casting.
+            num_paths: Extra YAMLPath queries for ``int``/``float`` casting.
+            date_paths: Extra YAMLPath queries for ``date``/``datetime``/``time`` casting.
+            types: An allow-list of type names to take from the schema files,
+                for target formats which don't support them all.
+
+        Returns:
+            A new ``CastSchema`` combining the queries from all sources.
+        """
+        paths = {
+            'null': list(null_paths),
+            'boolean': list(bool_paths),
+            'number': list(num_paths),
+            'date': list(date_paths),
+        }
+        for schema_file in schema_files:
+            schema = cast(dict, _ntload(schema_file))
+            for type_name in types:
+                paths[type_name] = [*schema.get(type_name, ()), *paths[type_name]]
+        return cls(
+            bool_paths=paths['boolean'],
+            null_paths=paths['null'],
+            num_paths=paths['number'],
+            date_paths=paths['date'],
+        )
+
+    def _fallback_targets(
+        self, data: StringyData
+    ) -> tuple[dict[tuple[int, str | int], set[str]], set[int]]:
+        r"""
+        Resolve the queries which `QueryMatcher` can't compile, using yamlpath.
+
+        Args:
+            data: A ``dict`` or ``list`` to query.
+
+        Returns:
+            A map from ``(id(parent), key_or_index)`` of each matched ``str``
+                to the type names of the queries matching it,
+                and the ``id``\ s of all containers on the way to those matches.
+        """
+        targets: dict[tuple[int, str | int], set[str]] = {}
+        containers: set[int] = set()
+        matcher = self._compiled
+        if not matcher.fallback_ids:
+            return targets, containers
+
+        from .yamlpath_tools import mk_yamlpath_processor, non_null_matches
+
+        surgeon = mk_yamlpath_processor(data)
+        for query_id in matcher.fallback_ids:
+            for match in non_null_matches(surgeon, matcher.queries[query_id]):
+                if match.parent is None or not isinstance(match.node, str):
+                    continue
+                try:
+                    parent, ref, ancestors = _locate(data, match.path)
+                except (KeyError, IndexError, TypeError):  # pragma: no cover
+                    continue
+                targets.setdefault((id(parent), ref), set()).add(self._query_types[query_id])
+                containers.update(map(id, ancestors))
+        return targets, containers
+
+    def _cast_leaf(
+        self, informal: str, type_names: set[str], converter: Converter, trail: Trail
+    ) -> object:
+        """
+        Up-type a matched ``str``, and prepare it for the target format.
+
+        Args:
+            informal: The matched ``str``.
+            type_names: Schema type names of all queries matching this node.
+            converter: A ``Converter`` for the target format.
+            trail: The location of the node, for error messages.
+
+        Returns:
+            The up-typed value, as supported by the target format.
+
+        Raises:
+            ValueError: Up-typing failed due to an unexpected format.
+        """
         try:
-            datey = _str_to_datey(match.node, time_marker)
+            value = _cast_str(informal, type_names)
         except ValueError as e:  # pragma: no cover
-            raise ValueError(': '.join((*e.args, str(match.path)))) from e
-        else:
-            surgeon.set_value(cast(YAMLPath, match.path), datey)
-            if not marked_times_present and isinstance(datey, str):
-                marked_times_present = True
-    return (
-        marked_time_converter.unstructure(surgeon.data) if marked_times_present else surgeon.data
-    )
+            from .matchers import trail_to_yamlpath
+
+            raise ValueError(': '.join((*e.args, trail_to_yamlpath(trail)))) from e
+        if value is informal:
+            return value
+        return converter.unstructure(value)
+
+    def _cast_walk(
+        self,
+        stack: list[tuple[dict | list, dict | list, MatchState, Trail]],
+        converter: Converter,
+        matched_ids: set[int],
+        fallback: tuple[dict[tuple[int, str | int], set[str]], set[int]],
+    ):
+        """
+        Up-type the matching nodes below each container on the stack, into its copy.
+
+        Args:
+            stack: Tuples of a new container to fill in, the original it copies,
+                its `MatchState`, and the `Trail` leading to it.
+            converter: A ``Converter`` to ``unstructure`` up-typed values with.
+            matched_ids: Identifiers of the queries matched so far, to be updated.
+            fallback: The results of `_fallback_targets`.
+        """
+        matcher = self._compiled
+        fallback_targets, fallback_containers = fallback
+        while stack:
+            new, old, state, trail = stack.pop()
+            for ref, child, child_state in matcher.children(
+                state, old, exhaustive=id(old) in fallback_containers
+            ):
+                if isinstance(child, str):
+                    query_ids = matcher.matched_ids(child_state, child) if child_state else ()
+                    matched_ids.update(query_ids)
+                    type_names = {self._query_types[query_id] for query_id in query_ids}
+                    type_names.update(fallback_targets.get((id(old), ref), ()))
+                    if type_names:
+                        cast(dict, new)[ref] = self._cast_leaf(
+                            child, type_names, converter, (ref, trail)
+                        )
+                elif isinstance(child, (dict, list)) and (
+                    child_state or id(child) in fallback_containers
+                ):
+                    if child_state:
+                        matched_ids.update(matcher.matched_ids(child_state, child))
+                    new_child = dict(child) if isinstance(child, dict) else list(child)
+                    cast(dict, new)[ref] = new_child
+                    stack.append((new_child, child, child_state, (ref, trail)))
+
+    def _report_unmatched(self, matched_ids: set[int]):
+        """
+        Report to stderr each query which matched nothing.
+
+        Args:
+            matched_ids: Identifiers of the queries which matched something.
+        """
+        from .yamlpath_tools import report_unmatched
+
+        matcher = self._compiled
+        for query_id, query in enumerate(matcher.queries):
+            if query_id not in matched_ids and query_id not in matcher.fallback_ids:
+                report_unmatched(query)
+
+    def cast(self, data: StringyData, converter: Converter | None = None) -> list | dict:
+        r"""
+        Take nested ``StringyData`` and return a copy with matching nodes up-typed.
+
+        Matching, casting, and preparing values for the target format all happen
+        in a single traversal, which builds the result directly.
+        Containers that no query can reach are shared with ``data`` rather than copied.
+
+        Args:
+            data: A ``dict`` or ``list`` composed of ``str``, ``dict`` and ``list`` items
+                all the way down.
+            converter: A ``Converter`` used to ``unstructure`` the up-typed values
+                to match specific type support,
+                defaulting to the shared one from ``get_converter('json')``.
+
+        Returns:
+            A nested ``dict`` or ``list`` containing some "up-typed" (casted) items
+                in addition to ``str``\ s.
+
+        Raises:
+            ValueError: Up-typing a ``str`` failed due to an unexpected format.
+
+        # noqa: DAR401
+        # noqa: DAR402
+        """
+        doc = dict(data) if isinstance(data, dict) else list(data)
+
+        if not self:
+            return doc
+
+        converter = converter or _default_converter()
+        matcher = self._compiled
+        fallback_targets, fallback_containers = self._fallback_targets(data)
+        matched_ids = set(matcher.matched_ids(matcher.root_state, data))
+
+        self._cast_walk(
+            [(doc, data, matcher.root_state, None)],
+            converter,
+            matched_ids,
+            (fallback_targets, fallback_containers),
+        )
+        self._report_unmatched(matched_ids)
+
+        return doc
+
+    @property
+    def streamable(self) -> bool:
+        """
+        Report whether `cast_items` can be used, without the whole document at hand.
+
+        Returns:
+            ``False`` if any query relies on yamlpath,
+                or on the length of a top-level ``list`` (with a negative index).
+        """
+        matcher = self._matcher
+        if matcher is None:
+            return True
+        return not matcher.fallback_ids and not any(
+            index < 0 for qnode, _ in matcher.root_state for index in qnode.list_edges
+        )
+
+    def cast_items(
+        self, items: Iterable[tuple[str | int, StringyData]], converter: Converter | None = None
+    ) -> Iterator[tuple[str | int, list | dict | str]]:
+        r"""
+        Up-type the top-level items of a document one at a time, as with `cast`.
+
+        Only valid for a `streamable` schema.
+        Any queries left unmatched are reported once ``items`` are exhausted.
+
+        Args:
+            items: Each key (of a ``dict``) or index (of a ``list``) and value
+                at the top level of a document, in order.
+            converter: A ``Converter`` used to ``unstructure`` the up-typed values,
+                as for `cast`.
+
+        Yields:
+            Each key or index, and the value with matching nodes up-typed.
+
+        Raises:
+            ValueError: Up-typing a ``str`` failed due to an unexpected format.
+
+        # noqa: DAR401
+        # noqa: DAR402
+        """
+        if not self:
+            yield from items
+            return
+
+        converter = converter or _default_converter()
+        matcher = self._compiled
+        root_state = matcher.root_state
+        # Any container will do, as the root of the document
+        matched_ids = set(matcher.matched_ids(root_state, {}))
+        for ref, child in items:
+            if isinstance(ref, str):
+                child_state = matcher.map_child_state(root_state, ref)
+            else:
+                # With no negative indices at the top level, the length is irrelevant
+                child_state = matcher.list_child_state(root_state, ref, ref + 1)
+            if isinstance(child, str):
+                query_ids = matcher.matched_ids(child_state, child) if child_state else ()
+                matched_ids.update(query_ids)
+                type_names = {self._query_types[query_id] for query_id in query_ids}
+                if type_names:
+                    child = self._cast_leaf(child, type_names, converter, (ref, None))  # noqa: PLW2901
+            elif child_state:
+                matched_ids.update(matcher.matched_ids(child_state, child))
+                new_child = dict(child) if isinstance(child, dict) else list(child)
+                self._cast_walk(
+                    [(new_child, child, child_state, (ref, None))],
+                    converter,
+                    matched_ids,
+                    ({}, set()),
+                )
+                child = new_child  # noqa: PLW2901
+            yield ref, child
+        self._report_unmatched(matched_ids)
+
+    def __bool__(self) -> bool:
+        """
+        Report whether this schema has any queries at all.
+
+        Returns:
+            ``True`` if any queries are present.
+        """
+        return any((self.bool_paths, self.null_paths, self.num_paths, self.date_paths))
 
 
 def cast_stringy_data(
@@ -164,6 +701,9 @@ def cast_stringy_data(
     r"""
     Take nested ``StringyData`` and return a copy with matching nodes up-typed.
 
+    When casting many documents with the same queries,
+    prefer creating a `CastSchema` once and calling its ``cast`` method for each.
+
     Args:
         data: A ``dict`` or ``list`` composed of ``str``, ``dict`` and ``list`` items
             all the way down.
@@ -174,7 +714,7 @@ def cast_stringy_data(
             ``date``/``datetime``/``time``.
         converter: A ``Converter`` used to ``unstructure`` the result
             to match specific type support,
-            defaulting to one created with `mk_json_types_converter`.
+            defaulting to the shared one from ``get_converter('json')``.
 
     Returns:
         A nested ``dict`` or ``list`` containing some "up-typed" (casted) items
@@ -182,34 +722,10 @@ def cast_stringy_data(
 
     Raises:
         ValueError: Up-typing a ``str`` failed due to an unexpected format.
-    """
-    doc = dict(data) if isinstance(data, dict) else list(data)
-
-    if not any((bool_paths, null_paths, num_paths, date_paths)):
-        return doc
-
-    surgeon = mk_yamlpath_processor(doc)
-
-    for match in non_null_matches(surgeon, *null_paths):
-        if match.node == '':
-            surgeon.set_value(cast(YAMLPath, match.path), None)
-
-    for match in non_null_matches(surgeon, *bool_paths):
-        if not isinstance(match.node, str):
-            continue
-        try:
-            surgeon.set_value(cast(YAMLPath, match.path), _str_to_bool(match.node))
-        except ValueError as e:  # pragma: no cover
-            raise ValueError(': '.join((*e.args, str(match.path)))) from e
 
-    for match in non_null_matches(surgeon, *num_paths):
-        if not isinstance(match.node, str):
-            continue
-        try:
-            surgeon.set_value(cast(YAMLPath, match.path), _str_to_num(match.node))
-        except ValueError as e:  # pragma: no cover
-            raise ValueError(': '.join((*e.args, str(match.path)))) from e
-
-    doc = _cast_datey(surgeon, date_paths)
-
-    return (converter or mk_json_types_converter()).unstructure(doc)
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    return CastSchema(
+        bool_paths=bool_paths, null_paths=null_paths, num_paths=num_paths, date_paths=date_paths
+    ).cast(data, converter=converter)
@@ -1,9 +1,13 @@
-"""
+r"""
 These functions return ``cattrs.Converter`` instances.
 
 Each ``Converter`` has an ``unstructure`` method,
 which takes an object (usually a ``dict`` or YAML equivalent),
 and returns a new one whose elements have been traversed and transformed.
+They are all `DeepConverter`\ s, which traverse iteratively,
+so nesting depth is limited only by memory.
+
+`get_converter` provides a shared, once-created ``Converter`` per target format.
 
 The purpose is usually to prepare data for export into a given format,
 with its particular type support.
@@ -12,13 +16,15 @@ with its particular type support.
 from __future__ import annotations
 
 from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Any, Callable, cast
 
 try:
     from types import NoneType
 except ImportError:
     NoneType = type(None)
 from cattrs import Converter
-from ruamel.yaml.comments import CommentedMap, CommentedSeq, TaggedScalar
+from ruamel.yaml.comments import TaggedScalar
 from ruamel.yaml.scalarbool import ScalarBoolean
 from ruamel.yaml.scalarfloat import ScalarFloat
 from ruamel.yaml.scalarint import ScalarInt
@@ -26,6 +32,11 @@ from ruamel.yaml.scalarstring import ScalarString
 from ruamel.yaml.timestamp import TimeStamp
 from yamlpath.patches.timestamp import AnchoredDate
 
+try:
+    from typing import TypeAlias
+except ImportError:
+    from typing import Any as TypeAlias
+
 
 def _timestamp_to_datey(ts: TimeStamp) -> date | datetime:
     """
@@ -44,55 +55,246 @@ def _timestamp_to_datey(ts: TimeStamp) -> date | datetime:
     return datetime.fromisoformat(ts.isoformat())
 
 
-def mk_deep_converter() -> Converter:
+_SEQUENCE, _MAPPING, _UNKNOWN = object(), object(), object()
+Dispatch: TypeAlias = 'Callable[[Any], Any] | object | None'
+
+
+def _contains_itself(data: object) -> bool:
     r"""
-    Create a new recursively unstructuring ``cattrs.Converter``.
+    Check whether nested ``list``\ s and ``dict``\ s are among their own contents.
 
-    It can traverse ``dict``\ s, ``list``\ s, and their ``ruamel.yaml`` equivalents.
-    The other ``Converter``\ s here use this as a starting point,
-    before adding more unstructuring hooks.
+    Args:
+        data: Unstructured data, possibly with shared containers.
 
     Returns:
-        A new, recursively unstructuring ``cattrs.Converter``.
+        ``True`` if any container is its own descendant.
     """
-    c = Converter()
+    if not isinstance(data, (list, dict)):
+        return False
+    active: set[int] = {id(data)}
+    finished: set[int] = set()
+    stack = [(data, iter(data if isinstance(data, list) else data.values()))]
+    while stack:
+        node, children = stack[-1]
+        for child in children:
+            if isinstance(child, (list, dict)) and id(child) not in finished:
+                if id(child) in active:
+                    return True
+                active.add(id(child))
+                stack.append((child, iter(child if isinstance(child, list) else child.values())))
+                break
+        else:
+            stack.pop()
+            active.discard(id(node))
+            finished.add(id(node))
+    return False
+
+
+def measure_expansion(data: object) -> tuple[int, int]:
+    r"""
+    Count the nodes of nested data, with shared containers counted once, and then in full.
 
-    c.register_unstructure_hook(list, lambda lst: [c.unstructure(e) for e in lst])
-    c.register_unstructure_hook(
-        dict, lambda d: {c.unstructure(k): c.unstructure(v) for k, v in d.items()}
-    )
+    Shared containers come from YAML aliases, which NestedText can't express,
+    so each reference is written out in full.
 
-    c.register_unstructure_hook(CommentedSeq, lambda cs: [c.unstructure(e) for e in cs])
-    c.register_unstructure_hook(
-        CommentedMap, lambda cm: {c.unstructure(k): c.unstructure(v) for k, v in cm.items()}
-    )
+    Args:
+        data: Unstructured data without cycles, possibly with shared containers.
 
-    return c
+    Returns:
+        The number of nodes with each shared container's contents counted once,
+            and the number of nodes once every reference is expanded into a copy.
+    """
+    if not isinstance(data, (list, dict)):
+        return 1, 1
+    distinct = 1
+    sizes: dict[int, int] = {}
+    stack: list[tuple[list | dict, bool]] = [(data, False)]
+    while stack:
+        node, children_done = stack.pop()
+        if id(node) in sizes:
+            continue
+        children = node if isinstance(node, list) else node.values()
+        if not children_done:
+            stack.append((node, True))
+            stack.extend(
+                (child, False)
+                for child in children
+                if isinstance(child, (list, dict)) and id(child) not in sizes
+            )
+            continue
+        distinct += len(node)
+        sizes[id(node)] = 1 + sum(
+            sizes[id(child)] if isinstance(child, (list, dict)) else 1 for child in children
+        )
+    return distinct, sizes[id(data)]
+
+
+class DeepConverter(Converter):
+    r"""
+    A ``Converter`` whose ``unstructure`` traverses nested ``list``\ s and ``dict``\ s iteratively.
+
+    Each node's handling is looked up by its exact type in a table,
+    filled on first sight of each type from the registered hooks (respecting subclassing),
+    so most nodes cost a single ``dict`` lookup rather than a ``singledispatch`` call.
+
+    Subclasses of ``list`` and ``dict``,
+    like ``ruamel.yaml``'s ``CommentedSeq`` and ``CommentedMap``,
+    are unstructured into plain ``list``\ s and ``dict``\ s,
+    unless a hook is registered for them.
+    """
+
+    def __init__(self):
+        """Create a ``Converter`` with no extra hooks, and an empty dispatch table."""
+        super().__init__()
+        self._type_hooks: dict[type, Callable[[Any], Any]] = {}
+        self._dispatch_table: dict[type, Dispatch] = {}
+
+    def register_unstructure_hook(self, cls: Any = None, func: Callable | None = None) -> Any:  # noqa: ANN401
+        """
+        Register a hook, just as ``cattrs.Converter`` does, and reset the dispatch table.
+
+        Args:
+            cls: The type to use ``func`` for.
+            func: A function taking an instance of ``cls`` and returning its unstructured form.
+
+        Returns:
+            Whatever ``cattrs.Converter.register_unstructure_hook`` does.
+        """
+        if isinstance(cls, type) and func is not None:
+            self._type_hooks[cls] = func
+        self._dispatch_table.clear()
+        return super().register_unstructure_hook(cls, func)
+
+    def _dispatch(self, cls: type) -> Dispatch:
+        """
+        Decide how to unstructure instances of exactly ``cls``, and remember it.
+
+        Args:
+            cls: The type of a node.
+
+        Returns:
+            The hook to call for a leaf, ``None`` for a leaf kept as is,
+                or a marker for a sequence or mapping to traverse.
+        """
+        dispatch: Dispatch = self.get_unstructure_hook(cls)
+        for base in cls.__mro__:
+            if base in self._type_hooks:
+                dispatch = self._type_hooks[base]
+                break
+            if base is list:
+                dispatch = _SEQUENCE
+                break
+            if base is dict:
+                dispatch = _MAPPING
+                break
+            if base in (str, int, float, bool, NoneType):
+                dispatch = None
+                break
+        self._dispatch_table[cls] = dispatch
+        return dispatch
+
+    def _unstructure_node(
+        self,
+        node: object,
+        hook: Dispatch,
+        stack: list[tuple[Any, Any]],
+        memo: dict[int, Any],
+        shared: list[object],
+    ) -> Any:  # noqa: ANN401
+        """
+        Unstructure a leaf, or create an empty container to be filled later from ``stack``.
+
+        Args:
+            node: The object to unstructure.
+            hook: The dispatch table entry for the type of ``node``, if known.
+            stack: Pairs of source container and new unstructured container,
+                onto which a container ``node`` is pushed.
+            memo: The new container for the ``id`` of each source container seen so far.
+            shared: Source containers seen more than once, appended on each repeat.
+
+        Returns:
+            The unstructured leaf, or new (or already created) container.
+        """
+        if hook is _UNKNOWN:
+            hook = self._dispatch(type(node))
+        if hook is None:
+            return node
+        if hook is _SEQUENCE or hook is _MAPPING:
+            new_node = memo.get(id(node))
+            if new_node is not None:
+                shared.append(node)
+                return new_node
+            new_node = memo[id(node)] = [] if hook is _SEQUENCE else {}
+            stack.append((node, new_node))
+            return new_node
+        return cast(Callable, hook)(node)
+
+    def unstructure(self, obj: Any, unstructure_as: Any = None) -> Any:  # noqa: ANN401
+        """
+        Create an unstructured copy of ``obj``, traversing containers without recursion.
+
+        Each container is unstructured only once, however many times it's referenced
+        (as by YAML aliases), and the copies of those references share the result.
+
+        Args:
+            obj: The object to unstructure.
+            unstructure_as: A type to unstructure ``obj`` as, in which case
+                ``cattrs.Converter.unstructure`` handles it instead.
+
+        Returns:
+            The unstructured equivalent of ``obj``.
+
+        Raises:
+            ValueError: ``obj`` contains itself.
+        """
+        if unstructure_as is not None:
+            return super().unstructure(obj, unstructure_as)
+
+        get = self._dispatch_table.get
+        unstructure_node = self._unstructure_node
+        stack: list[tuple[Any, Any]] = []
+        memo: dict[int, Any] = {}
+        shared: list[object] = []
+        root = unstructure_node(obj, get(type(obj), _UNKNOWN), stack, memo, shared)
+        while stack:
+            src, dst = stack.pop()
+            if isinstance(dst, list):
+                append = dst.append
+                for item in src:
+                    hook = get(type(item), _UNKNOWN)
+                    append(
+                        item if hook is None else unstructure_node(item, hook, stack, memo, shared)
+                    )
+            else:
+                for key, val in src.items():
+                    hook = get(type(key), _UNKNOWN)
+                    new_key = (
+                        key if hook is None else unstructure_node(key, hook, stack, memo, shared)
+                    )
+                    hook = get(type(val), _UNKNOWN)
+                    dst[new_key] = (
+                        val if hook is None else unstructure_node(val, hook, stack, memo, shared)
+                    )
+        # Only a container reached more than once may be one of its own ancestors
+        if shared and _contains_itself(root):
+            msg = "Can't unstructure data which contains itself"
+            raise ValueError(msg)
+        return root
 
 
-def mk_unyamlable_converter(time_marker: str) -> Converter:
+def mk_deep_converter() -> Converter:
     r"""
-    Create a recursive ``Converter`` which replaces marked ``str``\ s with ``time`` instances.
+    Create a new recursively unstructuring ``cattrs.Converter``.
 
-    Args:
-        time_marker: An arbitrary prefix (such as a UUID) which, when encountered,
-            indicates the remainder of the containing ``str`` should be processed
-            as ISO 8601 and the element replaced by a ``datetime.time`` instance.
+    It can traverse ``dict``\ s, ``list``\ s, and their ``ruamel.yaml`` equivalents,
+    to any depth.
+    The other ``Converter``\ s here use this as a starting point,
+    before adding more unstructuring hooks.
 
     Returns:
-        A ``Converter`` whose ``unstructure`` method replaces marked ``str``\ s with
-            ``datetime.time`` instances.
+        A new, recursively unstructuring `DeepConverter`.
     """
-    c = mk_deep_converter()
-
-    c.register_unstructure_hook(
-        str,
-        lambda s: (
-            s if not s.startswith(time_marker) else time.fromisoformat(s.split(time_marker, 1)[1])
-        ),
-    )
-
-    return c
+    return DeepConverter()
 
 
 def mk_stringy_converter() -> Converter:
@@ -196,3 +398,35 @@ def mk_toml_types_converter() -> Converter:
     c.register_unstructure_hook(TimeStamp, _timestamp_to_datey)
 
     return c
+
+
+CONVERTER_FACTORIES: dict[str, Callable[[], Converter]] = {
+    'json': mk_json_types_converter,
+    'nestedtext': mk_stringy_converter,
+    'toml': mk_toml_types_converter,
+    'yaml': mk_yaml_types_converter,
+}
+
+
+@lru_cache(maxsize=None)
+def get_converter(target: str) -> Converter:
+    r"""
+    Get the shared ``Converter`` for a target format, creating it only on first use.
+
+    The shared instances are safe to use from any thread,
+    but shouldn't have more hooks registered;
+    use the ``mk_*_converter`` functions to get a private ``Converter`` for that.
+
+    Args:
+        target: A key of ``CONVERTER_FACTORIES``: 'json', 'nestedtext', 'toml', or 'yaml'.
+
+    Returns:
+        The same ``Converter`` for every call with the same ``target``.
+
+    Raises:
+        KeyError: There's no converter for ``target``.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    return CONVERTER_FACTORIES[target]()
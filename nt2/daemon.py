@@ -0,0 +1,365 @@
+"""
+A local server keeping nt2 loaded, and the console scripts' thin client mode.
+
+Each console script first tries to hand its arguments to a running ``nt2 serve``
+over a Unix socket, so the conversion runs in a warm process,
+without paying again for imports, converters and YAML parsers.
+With no server running (or output to a terminal, for color), the app runs locally as usual.
+
+Only the standard library is imported up front, to keep the client side quick.
+
+Messages each have a one byte kind and a four byte length, then the payload:
+
+- ``R``: (client) the request, as JSON: version, app name, arguments, and working directory
+- ``I``: (server) a request for more stdin; (client) the next chunk of stdin, empty at its end
+- ``O``, ``E``: (server) a chunk written to stdout or stderr
+- ``X``: (server) the exit code
+- ``V``: (server) a refusal, as the client's nt2 version differs
+
+Input and output are relayed in chunks as they're needed and produced,
+so (as when running locally) conversions of long streams run in constant memory.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import struct
+import sys
+from io import BufferedReader, BufferedWriter, RawIOBase, TextIOWrapper
+
+from . import __version__
+
+_HEADER = struct.Struct('!cI')
+_CHUNK_SIZE = 64 * 1024
+
+APPS = (
+    'NestedTextToJSON',
+    'NestedTextToYAML',
+    'NestedTextToTOML',
+    'JSONToNestedText',
+    'YAMLToNestedText',
+    'TOMLToNestedText',
+)
+
+
+def default_socket_path() -> str:
+    """
+    Get the server's socket path: ``$NT2_SOCKET``, or a per-user path in the runtime directory.
+
+    Returns:
+        A filesystem path for the Unix socket.
+    """
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR') or '/tmp'  # noqa: S108
+    return os.environ.get('NT2_SOCKET') or os.path.join(  # noqa: PTH118
+        runtime_dir, f"nt2-{os.getuid()}.sock"
+    )
+
+
+def _send(conn: socket.socket, kind: bytes, payload: bytes = b''):
+    """
+    Send one message.
+
+    Args:
+        conn: A connected socket.
+        kind: The message kind, a single byte.
+        payload: The message content.
+    """
+    conn.sendall(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def _recv_exactly(conn: socket.socket, size: int) -> bytes:
+    """
+    Receive an exact number of bytes.
+
+    Args:
+        conn: A connected socket.
+        size: The number of bytes to receive.
+
+    Returns:
+        The received bytes.
+
+    Raises:
+        ConnectionError: The connection closed first.
+    """
+    chunks = []
+    while size:
+        chunk = conn.recv(min(size, 1024 * 1024))
+        if not chunk:
+            msg = "nt2 server connection closed mid-message"
+            raise ConnectionError(msg)
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv(conn: socket.socket) -> tuple[bytes, bytes]:
+    """
+    Receive one message.
+
+    Args:
+        conn: A connected socket.
+
+    Returns:
+        The message kind and content.
+    """
+    kind, size = _HEADER.unpack(_recv_exactly(conn, _HEADER.size))
+    return kind, _recv_exactly(conn, size)
+
+
+class _RequestedStdin(RawIOBase):
+    """The client's stdin, requested a chunk at a time, only as it's read."""
+
+    name = '<stdin>'
+
+    def __init__(self, conn: socket.socket):
+        """
+        Wait to request anything.
+
+        Args:
+            conn: A socket connected to a client.
+        """
+        self._conn = conn
+        self._pending = b''
+        self._ended = False
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: bytearray | memoryview) -> int:  # type: ignore
+        """
+        Read the rest of the last chunk, or else request and read the next one.
+
+        Args:
+            buffer: Where to put the bytes read.
+
+        Returns:
+            The number of bytes read, zero only at the end of stdin.
+        """
+        if not self._pending and not self._ended:
+            _send(self._conn, b'I')
+            _, self._pending = _recv(self._conn)
+            self._ended = not self._pending
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+class _MessageWriter(RawIOBase):
+    """A byte stream sending everything written to it to the client, as one kind of message."""
+
+    def __init__(self, conn: socket.socket, kind: bytes):
+        """
+        Prepare to send.
+
+        Args:
+            conn: A socket connected to a client.
+            kind: The message kind, ``O`` or ``E``.
+        """
+        self._conn = conn
+        self._kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes | bytearray | memoryview) -> int:  # type: ignore
+        """
+        Send bytes to the client.
+
+        Args:
+            data: The bytes to send.
+
+        Returns:
+            The number of bytes sent, all of them.
+        """
+        _send(self._conn, self._kind, bytes(data))
+        return len(data)
+
+
+def _handle(conn: socket.socket):
+    """
+    Run one client's request in this (forked) process, with its stdio and working directory.
+
+    Args:
+        conn: A socket connected to a client.
+    """
+    from . import ui
+
+    _, payload = _recv(conn)
+    request = json.loads(payload)
+    if request['version'] != __version__ or request['app'] not in APPS:
+        _send(conn, b'V')
+        return
+
+    stdin = TextIOWrapper(BufferedReader(_RequestedStdin(conn), _CHUNK_SIZE), 'utf-8-sig')
+    out = TextIOWrapper(BufferedWriter(_MessageWriter(conn, b'O'), _CHUNK_SIZE), 'utf-8')
+    err = TextIOWrapper(
+        BufferedWriter(_MessageWriter(conn, b'E')),
+        'utf-8',
+        'backslashreplace',
+        line_buffering=True,
+    )
+    sys.stdin, sys.stdout, sys.stderr = stdin, out, err
+    try:
+        os.chdir(request['cwd'])
+        _, code = getattr(ui, request['app']).run(request['argv'], exit=False)
+    except SystemExit as e:
+        code = e.code if isinstance(e.code, int) or e.code is None else 1
+    except Exception:
+        import traceback
+
+        traceback.print_exc()
+        code = 1
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = sys.__stdin__, sys.__stdout__, sys.__stderr__
+        out.flush()
+        err.flush()
+    _send(conn, b'X', str(code or 0).encode())
+
+
+def _warm_up():
+    """Import and create everything conversions need, so each forked handler starts ready."""
+    from plumbum import colors
+
+    from . import ui  # noqa: F401
+    from .casters import CastSchema
+    from .converters import CONVERTER_FACTORIES, get_converter
+    from .dumpers import plain_yaml_dumper, plain_yaml_loader, yaml_editor
+
+    colors.use_color = 0
+    for target in CONVERTER_FACTORIES:
+        get_converter(target)
+    yaml_editor()
+    plain_yaml_loader()
+    plain_yaml_dumper()
+    CastSchema(bool_paths=['/**'])
+
+
+def serve(socket_path: str | None = None):
+    """
+    Serve conversion requests over a Unix socket, until interrupted or terminated.
+
+    Each request is handled in a process forked from this warmed-up one,
+    so requests run in parallel, and none can affect another.
+
+    Args:
+        socket_path: Where to create the socket, defaulting to `default_socket_path`.
+    """
+    import signal
+    from socketserver import BaseRequestHandler, ForkingMixIn, UnixStreamServer
+
+    class Handler(BaseRequestHandler):
+        def handle(self):
+            _handle(self.request)
+
+    class Server(ForkingMixIn, UnixStreamServer):
+        pass
+
+    socket_path = socket_path or default_socket_path()
+    _warm_up()
+    signal.signal(signal.SIGTERM, signal.default_int_handler)
+    if os.path.exists(socket_path):  # noqa: PTH110
+        os.unlink(socket_path)  # noqa: PTH108
+    # Only the owner may connect, from the moment the socket is bound
+    umask = os.umask(0o177)
+    try:
+        server = Server(socket_path, Handler)
+    finally:
+        os.umask(umask)
+    with server:
+        print(f"nt2 {__version__} serving on {socket_path}", file=sys.stderr)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            os.unlink(socket_path)  # noqa: PTH108
+
+
+def forward(app: str, argv: list[str]) -> int | None:
+    """
+    Run an app's request on the server, if one is running and a terminal won't miss out.
+
+    The server's socket must belong to the current user.
+
+    Args:
+        app: The name of a `ui` app class, from ``APPS``.
+        argv: The command line, starting with the program name.
+
+    Returns:
+        The exit code, or ``None`` if the request should run locally instead.
+    """
+    if not hasattr(socket, 'AF_UNIX') or sys.stdout.isatty():
+        return None
+    socket_path = default_socket_path()
+    try:
+        if os.stat(socket_path).st_uid != os.getuid():  # noqa: PTH116
+            return None
+        conn = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        conn.connect(socket_path)
+    except OSError:
+        return None
+    with conn:
+        request = {'version': __version__, 'app': app, 'argv': argv, 'cwd': os.getcwd()}  # noqa: PTH109
+        _send(conn, b'R', json.dumps(request).encode('utf-8'))
+        while True:
+            kind, payload = _recv(conn)
+            if kind == b'V':
+                return None
+            if kind == b'I':
+                _send(conn, b'I', sys.stdin.buffer.read1(_CHUNK_SIZE) if sys.stdin else b'')
+            elif kind == b'O':
+                sys.stdout.buffer.write(payload)
+                sys.stdout.flush()
+            elif kind == b'E':
+                sys.stderr.buffer.write(payload)
+                sys.stderr.flush()
+            else:
+                return int(payload)
+
+
+def _run(app: str):
+    """
+    Run an app, on the server if possible, and exit.
+
+    Args:
+        app: The name of a `ui` app class, from ``APPS``.
+    """
+    code = forward(app, sys.argv)
+    if code is None:
+        from . import ui
+
+        getattr(ui, app).run()
+    sys.exit(code)
+
+
+def nt2json():
+    """Run `ui.NestedTextToJSON`, on the server if possible."""
+    _run('NestedTextToJSON')
+
+
+def nt2yaml():
+    """Run `ui.NestedTextToYAML`, on the server if possible."""
+    _run('NestedTextToYAML')
+
+
+def nt2toml():
+    """Run `ui.NestedTextToTOML`, on the server if possible."""
+    _run('NestedTextToTOML')
+
+
+def json2nt():
+    """Run `ui.JSONToNestedText`, on the server if possible."""
+    _run('JSONToNestedText')
+
+
+def yaml2nt():
+    """Run `ui.YAMLToNestedText`, on the server if possible."""
+    _run('YAMLToNestedText')
+
+
+def toml2nt():
+    """Run `ui.TOMLToNestedText`, on the server if possible."""
+    _run('TOMLToNestedText')
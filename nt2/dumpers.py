@@ -1,401 +1,1974 @@
-"""Main functions to be called by the UI Application classes, after CLI option parsing."""
+"""
+Main functions to be called by the UI Application classes, after CLI option parsing.
+
+Heavier dependencies (rich, ruamel.yaml, yamlpath, cattrs) are only imported by
+the functions needing them, to keep startup quick for each console script.
+"""
 
 from __future__ import annotations
 
-import io
-import sys
-from json import dump as _jdump, dumps as _jdumps, loads as _jloads
-from json.decoder import JSONDecodeError
-from typing import TYPE_CHECKING
+import io
+import sys
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager, redirect_stderr
+from functools import lru_cache, partial
+from itertools import chain, islice, repeat
+from json import dumps as _jdumps, loads as _jloads
+from json.decoder import JSONDecodeError
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+if TYPE_CHECKING:
+    from plumbum import LocalPath
+    from rich.console import Console as RichConsole
+    from ruamel.yaml.main import YAML
+
+    from .casters import CastSchema, StringyData
+    from .converters import Converter
+from os import PathLike, cpu_count, environ
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from textwrap import indent
+from typing import BinaryIO, Callable, Iterable, Iterator, NamedTuple, Sequence, TextIO, cast
+
+from nestedtext import dumps as _ntdumps, load as _ntload
+
+from .json_backends import get_json_backend
+from .streaming import TopLevelItems
+
+
+def _get_converter(target: str) -> Converter:
+    """
+    Get the shared ``Converter`` for a target format, importing cattrs only when needed.
+
+    Args:
+        target: A target format name, as for `converters.get_converter`.
+
+    Returns:
+        The shared ``Converter`` for ``target``.
+    """
+    from .converters import get_converter
+
+    return get_converter(target)
+
+
+try:
+    from tomli import load as tload, loads as tloads
+    from tomli_w import dumps as _tdumps
+except ImportError:
+    TOML_SUPPORT = False
+else:
+    TOML_SUPPORT = True
+
+
+_T = TypeVar('_T')
+
+
+class _PerThread(Generic[_T]):
+    """
+    A factory wrapper keeping one instance for each thread, created on first use there.
+
+    ``ruamel.yaml`` objects keep parsing and emitting state on themselves,
+    so a single shared one can't load or dump in two threads at once.
+    Like an ``lru_cache``-wrapped function, it's called to get the instance,
+    and `cache_clear` discards it (only for the calling thread).
+    """
+
+    def __init__(self, factory: Callable[[], _T]):
+        """
+        Wrap a factory.
+
+        Args:
+            factory: A function creating a new instance.
+        """
+        self.factory = factory
+        self._local = threading.local()
+
+    def cache_clear(self):
+        """Discard the calling thread's instance, so the next call creates a new one."""
+        self._local.__dict__.pop('instance', None)
+
+    def __call__(self) -> _T:
+        """
+        Get the calling thread's instance, creating it if needed.
+
+        Returns:
+            The instance for this thread.
+        """
+        try:
+            return self._local.instance
+        except AttributeError:
+            self._local.instance = self.factory()
+            return self._local.instance
+
+
+@_PerThread
+def yaml_editor() -> YAML:
+    """
+    Get this thread's YAML editor, creating it on first use.
+
+    Returns:
+        An object able to ``.load`` and ``.dump`` YAML, as from `mk_yaml_editor`.
+    """
+    from .yamlpath_tools import mk_yaml_editor
+
+    return mk_yaml_editor()
+
+
+def yload(stream: TextIO) -> dict | list:
+    """
+    Parse YAML with this thread's YAML editor.
+
+    Args:
+        stream: A YAML file-like object.
+
+    Returns:
+        Parsed YAML data, usually as a ``ruamel.yaml`` ``CommentedMap`` or ``CommentedSeq``.
+    """
+    return yaml_editor().load(stream)
+
+
+@_PerThread
+def plain_yaml_loader() -> YAML:
+    """
+    Get this thread's plain YAML loader, creating it on first use.
+
+    Returns:
+        An object able to ``.load`` YAML, as from `mk_plain_yaml_loader`.
+    """
+    from .yamlpath_tools import mk_plain_yaml_loader
+
+    return mk_plain_yaml_loader()
+
+
+def yload_plain(stream: TextIO) -> dict | list:
+    r"""
+    Parse YAML into plain Python objects, more quickly than `yload`.
+
+    Content the plain loader can't load just as `yload` would (like merge keys or custom tags),
+    or can't load at all, is parsed again by `yload`, for the same result or error.
+
+    Args:
+        stream: A YAML file-like object.
+
+    Returns:
+        Parsed YAML data, which once unstructured matches that of `yload`.
+    """
+    from ruamel.yaml.error import YAMLError
+
+    content = stream.read()
+    try:
+        return plain_yaml_loader().load(content)
+    except YAMLError:
+        # The loader keeps unfinished construction state after an error, so start afresh next time
+        plain_yaml_loader.cache_clear()
+        retry = io.StringIO(content)
+        # Keep the file name for error messages
+        retry.name = getattr(stream, 'name', '<file>')
+        return yload(retry)
+
+
+@lru_cache(maxsize=None)
+def rich_console() -> RichConsole:
+    """
+    Get the shared Rich Console for stdout, creating it on first use.
+
+    Returns:
+        An initialized Rich Console object.
+    """
+    from rich.console import Console as RichConsole
+
+    return RichConsole()
+
+
+def _syntax_print(content: str, syntax: str, console: RichConsole | None = None):
+    """
+    Print a syntax-highlighted rendering of the content to terminal.
+
+    Args:
+        content: Any code to be syntax-highlighted.
+        syntax: A syntax name recognized by pygments (via rich).
+        console: An initialized Rich Console object used to print with,
+            defaulting to `rich_console`.
+    """
+    from rich.syntax import Syntax as RichSyntax
+
+    (console or rich_console()).print(
+        RichSyntax(
+            content,
+            syntax,
+            theme='ansi_dark',
+            word_wrap=True,
+            indent_guides=not environ.get('NO_COLOR'),
+        )
+    )
+
+
+def ntload(file: str | Path | TextIO) -> StringyData:
+    r"""
+    Wrap ``nestedtext.load`` with convenient configuration for this module.
+
+    Set top-level type constraint to 'any',
+    and assure the type checker the result is ``StringyData``.
+
+    Args:
+        file: NestedText file-like object, usually a ``LocalPath`` or ``sys.stdin``.
+
+    Returns:
+        Parsed NestedText data as a ``dict`` or ``list`` of ``str``\ s.
+    """
+    return cast('StringyData', _ntload(file, top='any'))
+
+
+@contextmanager
+def _open_nestedtext(src: str | Path | TextIO) -> Iterator[TopLevelItems]:
+    """
+    Open NestedText from a file path, or an already open text stream like ``sys.stdin``.
+
+    Args:
+        src: A path to a NestedText file, or a text stream.
+
+    Yields:
+        The `TopLevelItems` of the document, to parse one by one or all at once.
+    """
+    if isinstance(src, (str, PathLike)):
+        with Path(src).open(encoding='utf-8-sig') as ifile:
+            yield TopLevelItems(ifile, source=str(src))
+    else:
+        yield TopLevelItems(src, source=getattr(src, 'name', None))
+
+
+def ntdumps(data: dict | list) -> str:
+    """
+    Render the data as NestedText.
+
+    Args:
+        data: A ``dict`` or ``list`` to render as NestedText.
+
+    Returns:
+        NestedText content, ending with a newline.
+    """
+    return f"{_ntdumps(data, indent=2)}\n"
+
+
+_NT_INDENT = '  '
+_NT_SCALARS = (bool, int, float)
+_NT_NATIVE = (str, dict, list, type(None), *_NT_SCALARS)
+
+
+def _nt_lead(text: str, leader: str) -> str:
+    """
+    Prefix each line of the text, as ``nestedtext`` does for indented blocks.
+
+    Args:
+        text: The lines to prefix.
+        leader: The prefix for each non-blank line, also used right-stripped for blank lines.
+
+    Returns:
+        The prefixed lines, ending with a newline.
+    """
+    blank = leader.rstrip()
+    return '\n'.join(leader + line if line else blank for line in text.split('\n')) + '\n'
+
+
+def _nt_empty(value: dict | list) -> str:
+    """
+    Render an empty container, in the inline form ``nestedtext`` uses for it.
+
+    Args:
+        value: An empty ``dict`` or ``list``.
+
+    Returns:
+        ``{}`` or ``[]``.
+    """
+    return '{}' if isinstance(value, dict) else '[]'
+
+
+def _nt_item(head: str, value: object, pad: str) -> tuple[str, object]:
+    """
+    Render a ``dict`` or ``list`` item, as ``nestedtext`` would at indentation ``pad``.
+
+    Args:
+        head: The rendered key with its colon, or the dash of a list item, already indented.
+        value: The item's value.
+        pad: The indentation of ``head``.
+
+    Returns:
+        The rendered lines, and a nonempty container to render after them, if any.
+    """
+    if isinstance(value, (dict, list)):
+        if not value:
+            return f"{head}\n{pad}{_NT_INDENT}{_nt_empty(value)}\n", None
+        return f"{head}\n", value
+    if isinstance(value, str):
+        text = value.replace('\r\n', '\n').replace('\r', '\n')
+        if '\n' in text:
+            return f"{head}\n{_nt_lead(text, pad + _NT_INDENT + '> ')}", None
+        return (f"{head} {text}\n" if text else f"{head}\n"), None
+    if value is None:
+        return f"{head}\n", None
+    return f"{head} {value}\n", None
+
+
+def _nt_key_head(key: str, value: object, pad: str) -> str | None:
+    """
+    Render a ``dict`` item in multiline key form, if its key requires it.
+
+    Args:
+        key: The ``str`` key.
+        value: The item's value, a ``dict``, ``list``, ``str``, or scalar.
+        pad: The indentation of the item.
+
+    Returns:
+        The rendered item, or ``None`` if the key fits on the usual ``key: value`` line.
+    """
+    if not (
+        not key
+        or '\n' in key
+        or key.strip() != key
+        or key[:1] in '#[{'
+        or key[:2] in ('- ', '> ', ': ')
+        or ': ' in key
+    ):
+        return None
+    head = '\n'.join(f"{pad}: {line}" if line else f"{pad}:" for line in key.split('\n'))
+    if isinstance(value, (dict, list)):
+        if not value:
+            return f"{head}\n{pad}{_NT_INDENT}{_nt_empty(value)}\n"
+        return f"{head}\n"
+    if isinstance(value, str):
+        text = value.replace('\r\n', '\n').replace('\r', '\n')
+    else:
+        text = '' if value is None else str(value)
+    return f"{head}\n{_nt_lead(text, pad + _NT_INDENT + '> ')}"
+
+
+def _nt_children(data: dict | list) -> tuple[bool, Iterator]:
+    """
+    Start iterating over the items of a container, for `iter_ntdumps`.
+
+    Args:
+        data: A ``dict`` or ``list``.
+
+    Returns:
+        Whether ``data`` is a ``dict``, and an iterator over its items.
+    """
+    if isinstance(data, dict):
+        return True, iter(data.items())
+    return False, iter(data)
+
+
+def _nt_dict_item(key: object, value: object, pad: str) -> tuple[str, object]:
+    """
+    Render a ``dict`` item, as ``nestedtext`` would at indentation ``pad``.
+
+    Args:
+        key: The item's key.
+        value: The item's value.
+        pad: The indentation of the item.
+
+    Returns:
+        The rendered lines, and a nonempty container to render after them, if any.
+    """
+    if key is None:
+        key = ''
+    elif isinstance(key, _NT_SCALARS):
+        key = str(key)
+    if not (isinstance(key, str) and isinstance(value, _NT_NATIVE)):
+        return _nt_lead(_ntdumps({key: value}, indent=2), pad), None
+    key = key.replace('\r\n', '\n').replace('\r', '\n')
+    lines = _nt_key_head(key, value, pad)
+    if lines is None:
+        return _nt_item(f"{pad}{key}:", value, pad)
+    return lines, (value if isinstance(value, (dict, list)) and value else None)
+
+
+def iter_ntdumps(data: object) -> Iterator[str]:
+    """
+    Render the data as NestedText, in pieces as it's walked.
+
+    Each ``dict`` entry and ``list`` item is rendered as it's reached,
+    so the whole document is never held as one ``str``.
+    Items this can't render natively (unusual types or keys) are rendered by ``nestedtext``.
+
+    Args:
+        data: A ``dict`` or ``list`` to render as NestedText.
+
+    Yields:
+        Consecutive pieces of NestedText content, as a whole matching `ntdumps`.
+    """
+    if not isinstance(data, (dict, list)) or not data:
+        yield ntdumps(data)
+        return
+    stack: list[tuple[str, bool, Iterator]] = [('', *_nt_children(data))]
+    while stack:
+        pad, is_dict, items = stack[-1]
+        for item in items:
+            if is_dict:
+                lines, child = _nt_dict_item(*item, pad)
+            elif isinstance(item, _NT_NATIVE):
+                lines, child = _nt_item(f"{pad}-", item, pad)
+            else:
+                lines, child = _nt_lead(_ntdumps([item], indent=2), pad), None
+            yield lines
+            if child is not None:
+                stack.append((pad + _NT_INDENT, *_nt_children(child)))
+                break
+        else:
+            stack.pop()
+
+
+def jdumps(data: dict | list) -> str:
+    """
+    Render the data as JSON, with the fastest available `JSONBackend`.
+
+    Args:
+        data: A ``dict`` or ``list`` to render as JSON.
+
+    Returns:
+        JSON content, without a final newline.
+    """
+    return get_json_backend().dumps(data)
+
+
+def jcdumps(data: object) -> str:
+    """
+    Render the data as compact JSON, with the fastest available `JSONBackend`.
+
+    Args:
+        data: Any JSON-serializable value.
+
+    Returns:
+        JSON content on a single line, without a final newline.
+    """
+    return get_json_backend().dumps_compact(data)
+
+
+def jldumps(data: object) -> str:
+    """
+    Render the data as a single line of compact JSON.
+
+    Args:
+        data: Any JSON-serializable value.
+
+    Returns:
+        A JSON Lines record, ending with a newline.
+    """
+    return f"{jcdumps(data)}\n"
+
+
+@_PerThread
+def plain_yaml_dumper() -> YAML:
+    """
+    Get this thread's plain YAML dumper, creating it on first use.
+
+    Returns:
+        An object able to ``.dump`` YAML, as from `mk_plain_yaml_dumper`.
+    """
+    from .yamlpath_tools import mk_plain_yaml_dumper
+
+    return mk_plain_yaml_dumper()
+
+
+def ydumps(data: dict | list) -> str:
+    """
+    Render the data as YAML, with any multiline ``str`` within as a literal block scalar.
+
+    Args:
+        data: A ``dict`` or ``list`` to render as YAML.
+            If it holds anything but plain types (like ``ruamel.yaml`` objects),
+            any multiline ``str`` within is replaced in-place with a literal block scalar.
+
+    Returns:
+        YAML content, ending with a newline.
+    """
+    from ruamel.yaml.representer import RepresenterError
+
+    with io.StringIO() as out_stream:
+        try:
+            plain_yaml_dumper().dump(data, out_stream)
+        except RepresenterError:
+            # The dumper keeps unfinished representation state after an error
+            plain_yaml_dumper.cache_clear()
+        else:
+            return out_stream.getvalue()
+
+    from ruamel.yaml.scalarstring import walk_tree as use_multiline_syntax
+
+    use_multiline_syntax(data)
+    with io.StringIO() as out_stream:
+        yaml_editor().dump(data, out_stream)
+        return out_stream.getvalue()
+
+
+def _require_toml_support():
+    """
+    If TOML support is not installed, raise an exception.
+
+    Raises:
+        ImportError: The libraries for TOML support are absent.
+    """
+    if not TOML_SUPPORT:
+        raise ImportError("TOML support for nt2 is not installed. Try reinstalling as 'nt2[toml]'")
+
+
+_TOML_INLINE_MAX_KEYS = 16
+
+
+def _toml_may_inline(table: Mapping) -> bool:
+    """
+    Cheaply rule out rendering an array-of-tables item as an inline table.
+
+    An inline table only fits on one short line, so this is ``False`` for any table
+    with too many keys, a multiline string, or a nonempty array anywhere inside.
+
+    Args:
+        table: An item of an array of tables.
+
+    Returns:
+        Whether ``tomli_w`` might render ``table`` inline.
+    """
+    keys = 0
+    tables = [table]
+    while tables:
+        table = tables.pop()
+        keys += len(table)
+        if keys > _TOML_INLINE_MAX_KEYS:
+            return False
+        for value in table.values():
+            if isinstance(value, Mapping):
+                tables.append(value)
+            elif (isinstance(value, (list, tuple)) and value) or (
+                isinstance(value, str) and '\n' in value
+            ):
+                return False
+    return True
+
+
+def _tomli_w_dumps(data: dict) -> str:
+    """
+    Render the data as TOML, all at once with ``tomli_w``.
+
+    Args:
+        data: A ``dict`` to render as TOML.
+
+    Returns:
+        TOML content, ending with a newline.
+    """
+    _require_toml_support()
+    return _tdumps(data, multiline_strings=True)  # pyright: ignore [reportPossiblyUnboundVariable]
+
+
+def _toml_inline(table: Mapping) -> bool:
+    """
+    Check whether ``tomli_w`` renders an array-of-tables item as an inline table.
+
+    Args:
+        table: An item of an array of tables.
+
+    Returns:
+        Whether ``table`` is rendered inline.
+    """
+    return _toml_may_inline(table) and not _tomli_w_dumps({'': [table]}).startswith('[[')
+
+
+@lru_cache(maxsize=1024)
+def _toml_key(key: str) -> str:
+    """
+    Render a table name part, quoted only if needed.
+
+    Args:
+        key: A ``str`` key.
+
+    Returns:
+        The key as ``tomli_w`` writes it in a table header.
+    """
+    return _tomli_w_dumps({key: {}})[1:-2]
+
+
+def _iter_toml_table(
+    table: Mapping,
+    name: str = '',
+    inside_aot: bool = False,  # noqa: FBT001, FBT002
+) -> Iterator[str]:
+    """
+    Render a table and its subtables as TOML, in the order and layout of ``tomli_w``.
+
+    Args:
+        table: The table to render.
+        name: The table's full dotted name, or ``''`` for the top level.
+        inside_aot: Whether ``table`` is an item of an array of tables.
+
+    Yields:
+        The table's header and key/value lines,
+        then each subtable and array-of-tables item, separated by blank lines.
+    """
+    literals = {}
+    tables = []
+    for key, value in table.items():
+        if isinstance(value, Mapping):
+            tables.append((key, value, False))
+        elif (
+            isinstance(value, (list, tuple))
+            and value
+            and all(isinstance(item, Mapping) for item in value)
+            and not all(map(_toml_inline, value))
+        ):
+            tables.extend((key, item, True) for item in value)
+        else:
+            literals[key] = value
+    started = False
+    if inside_aot or (name and (literals or not tables)):
+        started = True
+        yield f"[[{name}]]\n" if inside_aot else f"[{name}]\n"
+    if literals:
+        started = True
+        yield _tomli_w_dumps(literals)
+    for key, value, in_aot in tables:
+        if started:
+            yield '\n'
+        started = True
+        key_part = _toml_key(key)
+        yield from _iter_toml_table(value, f"{name}.{key_part}" if name else key_part, in_aot)
+
+
+def iter_tdumps(data: dict) -> Iterator[str]:
+    """
+    Render the data as TOML, in pieces as it's walked.
+
+    Each table and array-of-tables item is rendered as it's reached,
+    with only its own key/value lines rendered at once, by ``tomli_w``.
+
+    Args:
+        data: A ``dict`` to render as TOML.
+
+    Yields:
+        Consecutive pieces of TOML content, as a whole matching ``tomli_w.dumps``.
+    """
+    _require_toml_support()
+    yield from _iter_toml_table(data)
+
+
+def tdumps(data: dict) -> str:
+    """
+    Render the data as TOML.
+
+    Args:
+        data: A ``dict`` to render as TOML.
+
+    Returns:
+        TOML content, ending with a newline.
+    """
+    return ''.join(iter_tdumps(data))
+
+
+def _emit(content: str, syntax: str):
+    """
+    Print rendered content to stdout, syntax-highlighted if interactive.
+
+    Args:
+        content: Rendered content, as from `ntdumps`.
+        syntax: A syntax name recognized by pygments (via rich).
+    """
+    if sys.stdout.isatty():
+        _syntax_print(content[:-1] if content.endswith('\n') else content, syntax)
+    else:
+        sys.stdout.write(content)
+
+
+def ntdump(data: dict | list):
+    """
+    Pretty-print the data as NestedText, with color if interactive, to stdout.
+
+    Args:
+        data: A ``dict`` or ``list`` to dump as NestedText.
+    """
+    _emit(ntdumps(data), 'nt')
+
+
+def jdump(data: dict | list):
+    """
+    Pretty-print the data as JSON, with color if interactive, to stdout.
+
+    Args:
+        data: A ``dict`` or ``list`` to dump as JSON.
+    """
+    _emit(jdumps(data), 'json')
+
+
+def ydump(data: dict | list):
+    """
+    Pretty-print the data as YAML, with color if interactive, to stdout.
+
+    Args:
+        data: A ``dict`` or ``list`` to dump as YAML.
+    """
+    _emit(ydumps(data), 'yaml')
+
+
+def tdump(data: dict):
+    """
+    Pretty-print the data as TOML, with color if interactive, to stdout.
+
+    Args:
+        data: A ``dict`` to dump as TOML.
+    """
+    _emit(tdumps(data), 'toml')
+
+
+def jloads(content: str) -> dict | list:
+    """
+    Wrap ``json.loads`` so that on failure it tries parsing as JSON Lines.
+
+    Args:
+        content: JSON or JSON Lines content.
+
+    Returns:
+        Parsed JSON data as a ``dict`` or ``list`` (usually the former).
+
+    Raises:
+        JSONDecodeError: Unable to parse ``content`` as JSON or JSONLines.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    try:
+        return _jloads(content)
+    except JSONDecodeError as original_e:
+        try:
+            return [_jloads(line) for line in content.splitlines()]
+        except JSONDecodeError:  # pragma: no cover
+            raise original_e from None
+
+
+def _read_text(src: str | Path | TextIO) -> str:
+    """
+    Read all content from a file path, or an already open text stream like ``sys.stdin``.
+
+    Args:
+        src: A path to a UTF-8 text file, or a text stream.
+
+    Returns:
+        The full content of ``src``.
+    """
+    if isinstance(src, (str, PathLike)):
+        with Path(src).open(encoding='utf-8') as ifile:
+            return ifile.read()
+    return src.read()
+
+
+def _yaml_marker(line: str) -> str:
+    """
+    Get the document marker a YAML line begins with, if any.
+
+    Args:
+        line: A line of YAML.
+
+    Returns:
+        ``'---'`` (document start), ``'...'`` (document end), or ``''``.
+    """
+    marker = line[:3]
+    if marker in ('---', '...') and line[3:4] in ('', ' ', '\t', '\r', '\n'):
+        return marker
+    return ''
+
+
+def _is_yaml_content(line: str) -> bool:
+    """
+    Check whether a YAML line outside of any document marker holds part of a document.
+
+    Args:
+        line: A line of YAML.
+
+    Returns:
+        ``False`` for a blank, comment, or directive line.
+    """
+    stripped = line.strip()
+    return bool(stripped) and not stripped.startswith('#') and not line.startswith('%')
+
+
+def _split_yaml_documents(stream: TextIO) -> Iterator[tuple[list[str], int]]:
+    """
+    Group the lines of a YAML stream by document, without parsing them.
+
+    Document markers can't appear within any scalar, so they reliably delimit documents.
+
+    Args:
+        stream: A YAML text stream.
+
+    Yields:
+        The lines of each document, including any directives, markers, and comments,
+            and the (0-based) line number of the first of those lines.
+    """
+    lines: list[str] = []
+    start = 0
+    has_content = False
+    for lineno, line in enumerate(stream):
+        marker = _yaml_marker(line)
+        if marker == '---' and has_content:
+            yield lines, start
+            lines, start, has_content = [], lineno, False
+        lines.append(line)
+        if marker == '...' and has_content:
+            yield lines, start
+            lines, start, has_content = [], lineno + 1, False
+        elif marker == '---' or (not marker and _is_yaml_content(line)):
+            has_content = True
+    if has_content:
+        yield lines, start
+
+
+def _load_yaml_document(lines: list[str], start: int, name: str) -> dict | list:
+    """
+    Parse one document of a YAML stream, as from `_split_yaml_documents`.
+
+    Args:
+        lines: The lines of the document.
+        start: The (0-based) line number of the first line, in the whole stream.
+        name: A name for the stream, like a file path, for error messages.
+
+    Returns:
+        Parsed YAML data, as from `yload_plain`.
+
+    Raises:
+        YAMLError: The document is invalid.
+            Line numbers are relative to the whole stream.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    from ruamel.yaml.error import YAMLError
+
+    document = io.StringIO(''.join(lines))
+    document.name = name
+    try:
+        return yload_plain(document)
+    except YAMLError:
+        # Parse again in context, for the same line numbers as the whole stream
+        document = io.StringIO(''.join(chain(repeat('\n', start), lines)))
+        document.name = name
+        yload(document)
+        raise  # pragma: no cover
+
+
+def _stream_yaml_documents(stream: TextIO) -> tuple[bool, Iterator]:
+    """
+    Find whether a YAML stream holds multiple documents, and parse them lazily.
+
+    Each document is only read and parsed as the returned iterator reaches it,
+    so memory use is bounded by the largest document, rather than the whole stream.
+
+    Args:
+        stream: A YAML text stream.
+
+    Returns:
+        Whether there are multiple documents, and an iterator of them
+            (or of the single parsed document).
+    """
+    name = getattr(stream, 'name', '<file>')
+    documents = (
+        _load_yaml_document(lines, start, name) for lines, start in _split_yaml_documents(stream)
+    )
+    head = list(islice(documents, 2))
+    if len(head) < 2:  # noqa: PLR2004
+        return False, iter(head or (None,))
+    return True, chain(head, documents)
+
+
+def _load_toml(src: str | Path | TextIO) -> dict:
+    """
+    Parse TOML from a file path, or an already open text stream like ``sys.stdin``.
+
+    Args:
+        src: A path to a TOML file, or a text stream.
+
+    Returns:
+        Parsed TOML data.
+    """
+    _require_toml_support()
+    if isinstance(src, (str, PathLike)):
+        with Path(src).open('rb') as ifile:
+            return tload(cast(BinaryIO, ifile))  # pyright: ignore [reportPossiblyUnboundVariable]
+    return tloads(src.read())  # pyright: ignore [reportPossiblyUnboundVariable]
+
+
+def _schema_dumps(typed_data: dict | list) -> str:
+    """
+    Render a NestedText schema literally matching the data, and maybe a briefer alternative.
+
+    Args:
+        typed_data: A nested data object whose elements can be mapped to schema entries.
+
+    Returns:
+        A NestedText schema, followed by any suggested alternative as NestedText comments.
+    """
+    from .yamlpath_tools import guess_briefer_schema, typed_data_to_schema
+
+    schema = typed_data_to_schema(typed_data)
+    content = ntdumps(schema)
+
+    briefer_schema = guess_briefer_schema(schema)
+    if sum(len(path_list) for path_list in briefer_schema.values()) < sum(
+        len(path_list) for path_list in schema.values()
+    ):
+        content += '\n'.join(
+            (
+                '',
+                '# Above is a schema that literally matches the current data.',
+                '# Below, for your review, is a guess at a better schema.',
+                '',
+                indent(_ntdumps(briefer_schema, indent=2), '# '),
+                '',
+            )
+        )
+    return content
+
+
+STREAM_CHUNK_ITEMS = 1000
+
+
+def _stream_json_values(stream: TextIO) -> tuple[bool, Iterator]:
+    """
+    Sniff whether a stream holds JSON Lines, and parse its values lazily if so.
+
+    If the first non-blank line is a complete JSON value and another non-blank line follows,
+    the content is taken to be JSON Lines, and each later line is only parsed
+    as the returned iterator reaches it. Otherwise the whole content is parsed as with `jloads`.
+
+    Args:
+        stream: A JSON or JSON Lines text stream.
+
+    Returns:
+        Whether the content is JSON Lines, and an iterator of its records
+            (or of the single parsed JSON value).
+    """
+    lines = (line for line in stream if line.strip())
+    first = next(lines, '')
+    try:
+        first_value = _jloads(first)
+    except JSONDecodeError:
+        return False, iter((jloads(first + stream.read()),))
+    second = next(lines, None)
+    if second is None:
+        return False, iter((first_value,))
+    return True, chain((first_value, _jloads(second)), map(_jloads, lines))
+
+
+def stream_json_as_nestedtext(src: str | Path | TextIO) -> Iterator[str]:
+    """
+    Convert JSON to NestedText, record by record for JSON Lines.
+
+    The NestedText is generated as the data is walked, never held whole.
+    JSON Lines content is rendered as a top-level NestedText list,
+    ``STREAM_CHUNK_ITEMS`` items at a time,
+    so memory use doesn't grow with the number of records.
+
+    Args:
+        src: A path to a JSON (or JSON Lines) file, or a text stream.
+
+    Yields:
+        Consecutive pieces of NestedText content, as a whole matching `render_json_as_nestedtext`.
+    """
+    if isinstance(src, (str, PathLike)):
+        with Path(src).open(encoding='utf-8') as ifile:
+            yield from stream_json_as_nestedtext(ifile)
+        return
+    is_lines, values = _stream_json_values(src)
+    if not is_lines:
+        yield from iter_ntdumps(next(values))
+        return
+    for chunk in iter(lambda: list(islice(values, STREAM_CHUNK_ITEMS)), []):
+        yield from iter_ntdumps(chunk)
+
+
+def render_json_as_nestedtext(src: str | Path | TextIO) -> str:
+    """
+    Convert JSON to NestedText.
+
+    Args:
+        src: A path to a JSON (or JSON Lines) file, or a text stream.
+
+    Returns:
+        NestedText content.
+    """
+    return ''.join(stream_json_as_nestedtext(src))
+
+
+def render_json_as_schema(src: str | Path | TextIO) -> str:
+    """
+    Generate a NestedText schema from JSON.
+
+    Args:
+        src: A path to a JSON (or JSON Lines) file, or a text stream.
+
+    Returns:
+        A NestedText schema, as from `dump_json_to_schema`.
+    """
+    return _schema_dumps(jloads(_read_text(src)))
+
+
+class AliasExpansion(NamedTuple):
+    """
+    Options for checking how much YAML aliases expand a document once converted.
+
+    NestedText has no aliases, so each reference to an anchored node is written out in full.
+    A small, deeply aliased document (an "alias bomb") can expand exponentially.
+
+    Attributes:
+        limit: The most times larger a document may grow, counting nodes,
+            or ``None`` for no limit.
+        report: Whether to print each document's expansion to stderr.
+    """
+
+    limit: float | None = None
+    report: bool = False
+
+    def check(self, data: object, source: str):
+        """
+        Measure a document's expansion, reporting it or raising an error as configured.
+
+        Args:
+            data: A parsed or unstructured document, possibly with shared containers.
+            source: A name for the document, like a file path, for messages.
+
+        Raises:
+            ValueError: The document expands past ``limit``.
+        """
+        if self.limit is None and not self.report:
+            return
+        from .converters import measure_expansion
+
+        distinct, expanded = measure_expansion(data)
+        ratio = expanded / distinct
+        if self.report:
+            print(
+                f"{source}: aliases expand {distinct} nodes to {expanded} ({ratio:.2f}x)",
+                file=sys.stderr,
+            )
+        if self.limit is not None and ratio > self.limit:
+            msg = (
+                f"{source}: aliases expand {distinct} nodes to {expanded} ({ratio:.2f}x), "
+                f"past the limit of {self.limit}x"
+            )
+            raise ValueError(msg)
+
+
+def stream_yaml_as_nestedtext(
+    src: str | Path | TextIO, expansion: AliasExpansion | None = None
+) -> Iterator[str]:
+    """
+    Convert YAML to NestedText, document by document for a multi-document stream.
+
+    Multiple documents are rendered as a top-level NestedText list,
+    each as soon as it's parsed, so memory use is bounded by the largest document.
+
+    Args:
+        src: A path to a YAML file, or a text stream.
+        expansion: Options for checking each document's expansion by aliases.
+
+    Yields:
+        Consecutive pieces of NestedText content, as a whole matching `render_yaml_as_nestedtext`.
+    """
+    if isinstance(src, (str, PathLike)):
+        with Path(src).open(encoding='utf-8') as ifile:
+            yield from stream_yaml_as_nestedtext(ifile, expansion)
+        return
+    unstructure = _get_converter('nestedtext').unstructure
+    name = getattr(src, 'name', '<file>')
+    is_multi, documents = _stream_yaml_documents(src)
+    for index, document in enumerate(documents):
+        data = unstructure(document)
+        if expansion is not None:
+            expansion.check(data, f"{name}[{index}]" if is_multi else name)
+        yield from iter_ntdumps([data] if is_multi else data)
+
+
+def render_yaml_as_nestedtext(
+    src: str | Path | TextIO, expansion: AliasExpansion | None = None
+) -> str:
+    """
+    Convert YAML to NestedText.
+
+    Args:
+        src: A path to a YAML file, or a text stream.
+        expansion: Options for checking each document's expansion by aliases.
+
+    Returns:
+        NestedText content.
+    """
+    return ''.join(stream_yaml_as_nestedtext(src, expansion))
+
 
-if TYPE_CHECKING:
-    from pathlib import Path
+def render_yaml_as_schema(
+    src: str | Path | TextIO, expansion: AliasExpansion | None = None
+) -> str:
+    """
+    Generate a NestedText schema from YAML.
 
-    from plumbum import LocalPath
-from os import environ
-from textwrap import indent
-from typing import BinaryIO, Sequence, TextIO, cast
-
-from nestedtext import dump as _ntdump, dumps as _ntdumps, load as _ntload
-from rich.console import Console as RichConsole
-from rich.syntax import Syntax as RichSyntax
-from ruamel.yaml.scalarstring import walk_tree as use_multiline_syntax
-
-from .casters import StringyData, cast_stringy_data
-from .converters import (
-    mk_json_types_converter,
-    mk_stringy_converter,
-    mk_toml_types_converter,
-    mk_yaml_types_converter,
-)
-from .yamlpath_tools import guess_briefer_schema, mk_yaml_editor, typed_data_to_schema
+    The documents of a multi-document stream are treated as the items of a top-level list.
 
-try:
-    from tomli import load as tload, loads as tloads
-    from tomli_w import dumps as _tdumps
-except ImportError:
-    TOML_SUPPORT = False
-else:
-    TOML_SUPPORT = True
+    Args:
+        src: A path to a YAML file, or a text stream.
+        expansion: Options for checking the data's expansion by aliases.
+
+    Returns:
+        A NestedText schema, as from `dump_yaml_to_schema`.
+    """
+    if isinstance(src, (str, PathLike)):
+        with Path(src).open(encoding='utf-8') as ifile:
+            return render_yaml_as_schema(ifile, expansion)
+    is_multi, documents = _stream_yaml_documents(src)
+    data = list(documents) if is_multi else next(documents)
+    if expansion is not None:
+        expansion.check(data, getattr(src, 'name', '<file>'))
+    return _schema_dumps(data)
+
+
+def stream_toml_as_nestedtext(src: str | Path | TextIO) -> Iterator[str]:
+    """
+    Convert TOML to NestedText, generating it as the data is walked.
 
-YAML_EDITOR = mk_yaml_editor()
-yload = YAML_EDITOR.load
+    Args:
+        src: A path to a TOML file, or a text stream.
 
-RICH = RichConsole()
+    Yields:
+        Consecutive pieces of NestedText content, as a whole matching `render_toml_as_nestedtext`.
+    """
+    yield from iter_ntdumps(_get_converter('nestedtext').unstructure(_load_toml(src)))
 
 
-def _syntax_print(content: str, syntax: str, console: RichConsole = RICH):
+def render_toml_as_nestedtext(src: str | Path | TextIO) -> str:
     """
-    Print a syntax-highlighted rendering of the content to terminal.
+    Convert TOML to NestedText.
 
     Args:
-        content: Any code to be syntax-highlighted.
-        syntax: A syntax name recognized by pygments (via rich).
-        console: An initialized Rich Console object used to print with.
+        src: A path to a TOML file, or a text stream.
+
+    Returns:
+        NestedText content.
     """
-    console.print(
-        RichSyntax(
-            content,
-            syntax,
-            theme='ansi_dark',
-            word_wrap=True,
-            indent_guides=not environ.get('NO_COLOR'),
-        )
-    )
+    return ''.join(stream_toml_as_nestedtext(src))
 
 
-def ntload(file: str | Path | TextIO) -> StringyData:
-    r"""
-    Wrap ``nestedtext.load`` with convenient configuration for this module.
+def render_toml_as_schema(src: str | Path | TextIO) -> str:
+    """
+    Generate a NestedText schema from TOML.
 
-    Set top-level type constraint to 'any',
-    and assure the type checker the result is ``StringyData``.
+    Args:
+        src: A path to a TOML file, or a text stream.
+
+    Returns:
+        A NestedText schema, as from `dump_toml_to_schema`.
+    """
+    return _schema_dumps(_load_toml(src))
+
+
+def _ydumps_items(kind: type[dict | list], items: Iterable[tuple]) -> Iterator[str]:
+    """
+    Render top-level items as YAML, ``STREAM_CHUNK_ITEMS`` at a time.
 
     Args:
-        file: NestedText file-like object, usually a ``LocalPath`` or ``sys.stdin``.
+        kind: The type of the document the items belong to, ``dict`` or ``list``.
+        items: Each key or index, and value, as from `TopLevelItems`.
+
+    Yields:
+        Consecutive pieces of YAML content, as a whole matching `ydumps` of the document.
+    """
+    items = iter(items)
+    document_start = ''
+    for chunk in iter(lambda: list(islice(items, STREAM_CHUNK_ITEMS)), []):
+        content = ydumps(dict(chunk) if kind is dict else [value for _, value in chunk])
+        # Only the first chunk begins the document
+        if content.startswith(document_start):
+            content = content[len(document_start) :]
+        document_start = '---\n'
+        yield content
+
+
+def stream_nestedtext_as_yaml(
+    src: str | Path | TextIO,
+    schema: CastSchema,
+    split: bool = False,  # noqa: FBT001, FBT002
+) -> Iterator[str]:
+    """
+    Convert NestedText to up-typed YAML, item by item for a top-level list or dict.
+
+    Args:
+        src: A path to a NestedText file, or a text stream.
+        schema: The `CastSchema` to up-type with.
+        split: Whether to write each element of a top-level ``list`` as its own document,
+            in a multi-document stream, rather than one document for the whole input.
+
+    Yields:
+        Consecutive pieces of YAML content.
+    """
+    converter = _get_converter('yaml') if schema else None
+    with _open_nestedtext(src) as items:
+        if items.kind is None or not schema.streamable:
+            data = schema.cast(items.load(), converter=converter)
+            for document in data if split and isinstance(data, list) else (data,):
+                yield ydumps(document)
+        elif split and items.kind is list:
+            for _, value in schema.cast_items(items, converter=converter):
+                yield ydumps(value)
+        else:
+            yield from _ydumps_items(items.kind, schema.cast_items(items, converter=converter))
+
+
+def render_nestedtext_as_yaml(
+    src: str | Path | TextIO,
+    schema: CastSchema,
+    split: bool = False,  # noqa: FBT001, FBT002
+) -> str:
+    """
+    Convert NestedText to up-typed YAML.
+
+    Args:
+        src: A path to a NestedText file, or a text stream.
+        schema: The `CastSchema` to up-type with.
+        split: Whether to write each element of a top-level ``list`` as its own document.
 
     Returns:
-        Parsed NestedText data as a ``dict`` or ``list`` of ``str``\ s.
+        YAML content.
     """
-    return cast(StringyData, _ntload(file, top='any'))
+    return ''.join(stream_nestedtext_as_yaml(src, schema, split))
 
 
-def ntdump(data: dict | list):
+def stream_nestedtext_as_toml(src: str | Path | TextIO, schema: CastSchema) -> Iterator[str]:
     """
-    Pretty-print the data as NestedText, with color if interactive, to stdout.
+    Convert NestedText to up-typed TOML, generating it table by table.
 
     Args:
-        data: A ``dict`` or ``list`` to dump as NestedText.
+        src: A path to a NestedText file, or a text stream.
+        schema: The `CastSchema` to up-type with.
+
+    Yields:
+        Consecutive pieces of TOML content, as a whole matching `render_nestedtext_as_toml`.
     """
-    if sys.stdout.isatty():
-        _syntax_print(_ntdumps(data, indent=2), 'nt')
-    else:
-        _ntdump(data, sys.stdout, indent=2)
+    converter = _get_converter('toml') if schema else None
+    data = schema.cast(ntload(src), converter=converter)
+    if isinstance(data, list):
+        data = {'TOML does not allow top-level arrays': data}
+    yield from iter_tdumps(data)
 
 
-def jdump(data: dict | list):
+def render_nestedtext_as_toml(src: str | Path | TextIO, schema: CastSchema) -> str:
     """
-    Pretty-print the data as JSON, with color if interactive, to stdout.
+    Convert NestedText to up-typed TOML.
 
     Args:
-        data: A ``dict`` or ``list`` to dump as JSON.
+        src: A path to a NestedText file, or a text stream.
+        schema: The `CastSchema` to up-type with.
+
+    Returns:
+        TOML content.
     """
-    if sys.stdout.isatty():
-        _syntax_print(_jdumps(data, indent=2), 'json')
-    else:
-        _jdump(data, sys.stdout, indent=2)
+    return ''.join(stream_nestedtext_as_toml(src, schema))
 
 
-def ydump(data: dict | list):
+def _jdumps_items(kind: type[dict | list], items: Iterable[tuple]) -> Iterator[str]:
     """
-    Pretty-print the data as YAML, with color if interactive, to stdout.
+    Render top-level items as JSON, one at a time.
 
     Args:
-        data: A ``dict`` or ``list`` to dump as YAML.
+        kind: The type of the document the items belong to, ``dict`` or ``list``.
+        items: Each key or index, and value, as from `TopLevelItems`.
 
-    Raises:
-        Exception: Unexpected problem dumping or highlighting data.
+    Yields:
+        Consecutive pieces of JSON content, as a whole matching `jdumps` of the document.
     """
-    use_multiline_syntax(data)
-    if sys.stdout.isatty():
-        out_stream = io.StringIO()
-        try:
-            YAML_EDITOR.dump(data, out_stream)
-        except Exception:
-            raise
+    opener, closer = ('{', '}') if kind is dict else ('[', ']')
+    separator = opener
+    for ref, value in items:
+        content = jdumps(value).replace('\n', '\n  ')
+        if kind is dict:
+            content = f"{_jdumps(ref)}: {content}"
+        yield f"{separator}\n  {content}"
+        separator = ','
+    yield closer if separator == opener else f"\n{closer}"
+
+
+def _jcdumps_items(kind: type[dict | list], items: Iterable[tuple]) -> Iterator[str]:
+    """
+    Render top-level items as one line of compact JSON, one item at a time.
+
+    Args:
+        kind: The type of the document the items belong to, ``dict`` or ``list``.
+        items: Each key or index, and value, as from `TopLevelItems`.
+
+    Yields:
+        Consecutive pieces of JSON content, as a whole matching `jcdumps` of the document.
+    """
+    opener, closer = ('{', '}') if kind is dict else ('[', ']')
+    separator = opener
+    for ref, value in items:
+        content = jcdumps(value)
+        yield f"{separator}{jcdumps(ref)}:{content}" if kind is dict else f"{separator}{content}"
+        separator = ','
+    yield f"{opener}{closer}" if separator == opener else closer
+
+
+def stream_nestedtext_as_json(
+    src: str | Path | TextIO,
+    schema: CastSchema,
+    compact: bool = False,  # noqa: FBT001, FBT002
+) -> Iterator[str]:
+    """
+    Convert NestedText to up-typed JSON, item by item for a top-level list or dict.
+
+    Args:
+        src: A path to a NestedText file, or a text stream.
+        schema: The `CastSchema` to up-type with.
+        compact: Whether to write JSON without any indentation or optional spaces.
+
+    Yields:
+        Consecutive pieces of JSON content.
+    """
+    converter = _get_converter('json') if schema else None
+    dumps, dumps_items = (jcdumps, _jcdumps_items) if compact else (jdumps, _jdumps_items)
+    with _open_nestedtext(src) as items:
+        if items.kind is None or not schema.streamable:
+            yield dumps(schema.cast(items.load(), converter=converter))
+            return
+        yield from dumps_items(items.kind, schema.cast_items(items, converter=converter))
+
+
+def render_nestedtext_as_json(
+    src: str | Path | TextIO,
+    schema: CastSchema,
+    compact: bool = False,  # noqa: FBT001, FBT002
+) -> str:
+    """
+    Convert NestedText to up-typed JSON.
+
+    Args:
+        src: A path to a NestedText file, or a text stream.
+        schema: The `CastSchema` to up-type with.
+        compact: Whether to write JSON without any indentation or optional spaces.
+
+    Returns:
+        JSON content.
+    """
+    return ''.join(stream_nestedtext_as_json(src, schema, compact))
+
+
+def stream_nestedtext_as_jsonl(
+    src: str | Path | TextIO,
+    schema: CastSchema,
+    split: bool = False,  # noqa: FBT001, FBT002
+) -> Iterator[str]:
+    """
+    Convert NestedText to up-typed JSON Lines, item by item for a top-level list or dict.
+
+    Args:
+        src: A path to a NestedText file, or a text stream.
+        schema: The `CastSchema` to up-type with.
+        split: Whether to write each element of a top-level ``list`` as its own record,
+            rather than one record for the whole document.
+
+    Yields:
+        Consecutive pieces of JSON Lines content.
+    """
+    converter = _get_converter('json') if schema else None
+    with _open_nestedtext(src) as items:
+        if items.kind is None or not schema.streamable:
+            data = schema.cast(items.load(), converter=converter)
+            for record in data if split and isinstance(data, list) else (data,):
+                yield jldumps(record)
+        elif split and items.kind is list:
+            for _, value in schema.cast_items(items, converter=converter):
+                yield jldumps(value)
         else:
-            _syntax_print(out_stream.getvalue(), 'yaml')
-        finally:
-            out_stream.close()
-    else:
-        YAML_EDITOR.dump(data, sys.stdout)
+            yield from _jcdumps_items(items.kind, schema.cast_items(items, converter=converter))
+            yield '\n'
 
 
-def _require_toml_support():
+def render_nestedtext_as_jsonl(
+    src: str | Path | TextIO,
+    schema: CastSchema,
+    split: bool = False,  # noqa: FBT001, FBT002
+) -> str:
     """
-    If TOML support is not installed, raise an exception.
+    Convert NestedText to up-typed JSON Lines.
 
-    Raises:
-        ImportError: The libraries for TOML support are absent.
+    Args:
+        src: A path to a NestedText file, or a text stream.
+        schema: The `CastSchema` to up-type with.
+        split: Whether to write each element of a top-level ``list`` as its own record.
+
+    Returns:
+        JSON Lines content.
     """
-    if not TOML_SUPPORT:
-        raise ImportError("TOML support for nt2 is not installed. Try reinstalling as 'nt2[toml]'")
+    return ''.join(stream_nestedtext_as_jsonl(src, schema, split))
 
 
-def tdump(data: dict):
+_WORKER_ARGS: tuple = ()
+
+
+def _init_worker(*args: object):
     """
-    Pretty-print the data as TOML, with color if interactive, to stdout.
+    Store the extra arguments shared by every task of a worker process.
 
     Args:
-        data: A ``dict`` to dump as TOML.
+        args: Arguments to pass after the input file, to each render function.
     """
-    _require_toml_support()
-    if sys.stdout.isatty():
-        _syntax_print(_tdumps(data, multiline_strings=True), 'toml')  # pyright: ignore [reportPossiblyUnboundVariable]
-    else:
-        print(_tdumps(data, multiline_strings=True), end='')  # pyright: ignore [reportPossiblyUnboundVariable]
+    global _WORKER_ARGS  # noqa: PLW0603
+    _WORKER_ARGS = args
 
 
-def jloads(content: str) -> dict | list:
+def _render_in_worker(render: Callable[..., str], src: str) -> str:
     """
-    Wrap ``json.loads`` so that on failure it tries parsing as JSON Lines.
+    Call a render function in a worker process, with the shared extra arguments.
 
     Args:
-        content: JSON or JSON Lines content.
+        render: A function like `render_nestedtext_as_json`.
+        src: A path to an input file.
 
     Returns:
-        Parsed JSON data as a ``dict`` or ``list`` (usually the former).
+        The rendered content.
+    """
+    return render(src, *_WORKER_ARGS)
 
-    Raises:
-        JSONDecodeError: Unable to parse ``content`` as JSON or JSONLines.
 
-    # noqa: DAR401
-    # noqa: DAR402
+def render_each(
+    render: Callable[..., str], input_files: Sequence[str | Path], *args: object, jobs: int = 1
+) -> Iterator[str]:
     """
-    try:
-        return _jloads(content)
-    except JSONDecodeError as original_e:
+    Render each input file, in parallel if requested, generating results in input order.
+
+    With multiple ``jobs``, the largest files are started first.
+
+    Args:
+        render: A function like `render_nestedtext_as_json`, taking an input file
+            and any ``args``, and returning the rendered content.
+        input_files: Paths to the input files.
+        args: Extra arguments to pass to ``render``, after each input file.
+            With multiple ``jobs``, these must be picklable.
+        jobs: The number of worker processes to use, or ``0`` for one per CPU.
+
+    Yields:
+        The rendered content of each input file.
+    """
+    workers = min(jobs or cpu_count() or 1, len(input_files))
+    if workers <= 1:
+        for src in input_files:
+            yield render(src, *args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+
+    by_size = sorted(
+        range(len(input_files)), key=lambda idx: -Path(input_files[idx]).stat().st_size
+    )
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=args) as pool:
+        futures = {
+            idx: pool.submit(_render_in_worker, render, str(input_files[idx])) for idx in by_size
+        }
         try:
-            return [_jloads(line) for line in content.splitlines()]
-        except JSONDecodeError:  # pragma: no cover
-            raise original_e from None
+            for idx in range(len(input_files)):
+                yield futures[idx].result()
+        finally:
+            for future in futures.values():
+                future.cancel()
 
 
-def dump_json_to_nestedtext(*input_files: LocalPath):
-    r"""
-    Read JSON from stdin or ``input_files``, and send NestedText to stdout.
+JSON_GLOBS = ('*.json', '*.jsonl')
+NESTEDTEXT_GLOBS = ('*.nt',)
+TOML_GLOBS = ('*.toml',)
+YAML_GLOBS = ('*.yml', '*.yaml')
+
+
+class Batch(NamedTuple):
+    """
+    Options for converting many input files in one run.
+
+    Attributes:
+        jobs: The number of worker processes to use, or ``0`` for one per CPU.
+        output_dir: A directory to write one output file per input file into,
+            mirroring the layout of any input directories, rather than printing to stdout.
+        globs: Patterns selecting files within input directories,
+            matched against their paths relative to the input directory,
+            defaulting to extensions for the input format.
+        cache_dir: A directory to keep a `RenderCache` in, so unchanged inputs
+            converted with the same options are not parsed again.
+    """
+
+    jobs: int = 1
+    output_dir: str | Path | None = None
+    globs: Sequence[str] = ()
+    cache_dir: str | Path | None = None
+
+
+def expand_input_paths(
+    input_paths: Sequence[str | Path], globs: Sequence[str]
+) -> Iterator[tuple[Path, Path]]:
+    """
+    Find the input files given as arguments, or within directories given as arguments.
+
+    Args:
+        input_paths: Paths of files or directories.
+        globs: Patterns a file within an input directory must match (any) to be included,
+            as with ``pathlib.PurePath.match``, relative to the input directory.
+
+    Yields:
+        Each input file, along with the path to mirror it at in an output directory.
+    """
+    for input_path in map(Path, input_paths):
+        if not input_path.is_dir():
+            yield input_path, Path(input_path.name)
+            continue
+        for path in sorted(input_path.rglob('*')):
+            rel_path = path.relative_to(input_path)
+            if path.is_file() and any(rel_path.match(pattern) for pattern in globs):
+                yield path, rel_path
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    """
+    Write content to a file by atomic rename, unless it already has exactly that content.
+
+    Args:
+        path: The file to write, whose parent directories are created as needed.
+        content: The text to write, encoded as UTF-8.
+
+    Returns:
+        ``True`` if the file was written, ``False`` if it was already up to date.
+    """
+    data = content.encode('utf-8')
+    try:
+        if path.read_bytes() == data:
+            return False
+        mode = path.stat().st_mode
+    except FileNotFoundError:
+        mode = 0o644
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with NamedTemporaryFile(
+        'wb', dir=path.parent, prefix=f".{path.name}.", suffix='.tmp', delete=False
+    ) as tmp:
+        tmp.write(data)
+    tmp_path = Path(tmp.name)
+    tmp_path.chmod(mode)
+    tmp_path.replace(path)
+    return True
+
+
+def _render_reporting(
+    render: Callable[..., str], src: str | Path, *args: object
+) -> tuple[str, str]:
+    """
+    Call a render function, capturing anything it prints to stderr.
+
+    Args:
+        render: A function like `render_nestedtext_as_json`.
+        src: A path to an input file.
+        args: Extra arguments to pass to ``render``, after the input file.
+
+    Returns:
+        The rendered content, and the diagnostics printed while rendering.
+    """
+    diagnostics = io.StringIO()
+    with redirect_stderr(diagnostics):
+        content = render(src, *args)
+    return content, diagnostics.getvalue()
+
+
+def render_each_cached(
+    render: Callable[..., str],
+    input_files: Sequence[str | Path],
+    *args: object,
+    jobs: int = 1,
+    cache_dir: str | Path | None = None,
+) -> Iterator[str]:
+    """
+    Render each input file as with `render_each`, reusing and storing results in a cache.
+
+    Only the input files without a cache hit are rendered.
+    Diagnostics printed to stderr while rendering are stored too,
+    and printed again on each hit, as each result is generated.
+    Once all results are generated, the cache is pruned to its size limit.
+
+    Args:
+        render: A function like `render_nestedtext_as_json`.
+        input_files: Paths to the input files.
+        args: Extra arguments to pass to ``render``, after each input file.
+            Each is represented in cache keys by its ``cache_token``, if it has one,
+            or else its ``repr``, along with the `JSONBackend` in use.
+        jobs: The number of worker processes to use, or ``0`` for one per CPU.
+        cache_dir: A directory to keep a `RenderCache` in, or ``None`` to skip caching.
+
+    Yields:
+        The rendered content of each input file.
+    """
+    if cache_dir is None:
+        yield from render_each(render, input_files, *args, jobs=jobs)
+        return
+
+    from .cache import RenderCache
+
+    cache = RenderCache(cache_dir)
+    options = '\n'.join(
+        (
+            f"json backend {get_json_backend().name}",
+            *(getattr(arg, 'cache_token', repr(arg)) for arg in args),
+        )
+    )
+    keys = [cache.key(src, render, options) for src in input_files]
+    hits = [cache.get(key) for key in keys]
+    misses = render_each(
+        cast(Callable[..., str], partial(_render_reporting, render)),
+        [src for src, hit in zip(input_files, hits) if hit is None],
+        *args,
+        jobs=jobs,
+    )
+    for key, hit in zip(keys, hits):
+        if hit is None:
+            hit = cast('tuple[str, str]', next(misses))  # noqa: PLW2901
+            cache.put(key, *hit)
+        content, diagnostics = hit
+        sys.stderr.write(diagnostics)
+        yield content
+    cache.prune()
+
+
+WRITE_BUFFER_SIZE = 256 * 1024
+
+
+def _coalesce(pieces: Iterable[str], size: int = WRITE_BUFFER_SIZE) -> Iterator[str]:
+    """
+    Join consecutive pieces of content, for fewer, larger writes.
+
+    Args:
+        pieces: Consecutive pieces of content, as from `stream_nestedtext_as_json`.
+        size: The length to collect before generating the joined content.
+
+    Yields:
+        The same content, in pieces of at least ``size`` (except the last).
+    """
+    buffer: list[str] = []
+    buffered = 0
+    for piece in pieces:
+        buffer.append(piece)
+        buffered += len(piece)
+        if buffered >= size:
+            yield ''.join(buffer)
+            buffer, buffered = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def _output_paths(inputs: Sequence[tuple[Path, Path]], suffix: str) -> list[Path]:
+    """
+    Choose the output path (relative to ``Batch.output_dir``) for each input file.
+
+    Args:
+        inputs: Each input file and the path to mirror it at, as from `expand_input_paths`.
+        suffix: The output file suffix.
+
+    Returns:
+        The relative output path for each input, in order.
+
+    Raises:
+        ValueError: Different input files would be written to the same output path.
+    """
+    sources: dict[Path, list[Path]] = {}
+    out_paths = []
+    for src, rel_path in inputs:
+        out_path = rel_path.with_suffix(suffix)
+        out_paths.append(out_path)
+        clashing = sources.setdefault(out_path, [])
+        if src not in clashing:
+            clashing.append(src)
+    clashes = [
+        f"{out_path}: {', '.join(map(str, srcs))}"
+        for out_path, srcs in sources.items()
+        if len(srcs) > 1
+    ]
+    if clashes:
+        msg = '\n'.join(("Several inputs would be written to the same output file:", *clashes))
+        raise ValueError(msg)
+    return out_paths
+
+
+def _dump_each(
+    render: Callable[..., str],
+    formats: tuple[Sequence[str], str, str],
+    input_files: Sequence[LocalPath],
+    *args: object,
+    batch: Batch | None = None,
+    stream: Callable[..., Iterator[str]] | None = None,
+):
+    """
+    Render stdin or each input file, and print or write the results in input order.
 
     Args:
-        input_files: ``LocalPath``\ s with JSON content.
+        render: A function like `render_nestedtext_as_json`.
+        formats: The default ``Batch.globs`` for the input format,
+            the syntax name of the output (for highlighting),
+            and the output file suffix (for ``Batch.output_dir``).
+        input_files: Paths to the input files or directories, or none to read stdin.
+        args: Extra arguments to pass to ``render``, after each input file.
+        batch: Options for converting many files.
+        stream: A function like `stream_json_as_nestedtext`, generating the same content
+            as ``render`` in pieces, to print as they're ready when only printing one at a time,
+            without highlighting.
+
+    Raises:
+        ValueError: There's an output directory but no input files,
+            or several input files would be written to the same output file.
     """
-    # We may need to use a converter.unstructure here; We'll see.
+    default_globs, syntax, suffix = formats
+    batch = batch or Batch()
+    inputs = list(expand_input_paths(input_files, batch.globs or default_globs))
+    if batch.output_dir is not None:
+        if not input_files:
+            msg = "An output directory can only be used with input files, not stdin"
+            raise ValueError(msg)
+        out_paths = _output_paths(inputs, suffix)
+    # Highlighting needs whole documents, so only stream when stdout isn't interactive
+    if (
+        stream
+        and batch.output_dir is None
+        and batch.cache_dir is None
+        and batch.jobs == 1
+        and not sys.stdout.isatty()
+    ):
+        for src in [src for src, _ in inputs] if input_files else [sys.stdin]:
+            for content in _coalesce(stream(src, *args)):
+                _emit(content, syntax)
+        return
     if not input_files:
-        typed_data = jloads(sys.stdin.read())
-        ntdump(typed_data)
+        _emit(render(sys.stdin, *args), syntax)
+        return
+    results = render_each_cached(
+        render, [src for src, _ in inputs], *args, jobs=batch.jobs, cache_dir=batch.cache_dir
+    )
+    if batch.output_dir is None:
+        for content in results:
+            _emit(content, syntax)
     else:
-        for f in input_files:
-            typed_data = jloads(f.read('utf-8'))
-            ntdump(typed_data)
+        for out_path, content in zip(out_paths, results):
+            write_if_changed(Path(batch.output_dir) / out_path, content)
 
 
-def _dump_typed_data_to_schema(typed_data: dict | list):
-    schema = typed_data_to_schema(typed_data)
-    ntdump(schema)
+def dump_json_to_nestedtext(*input_files: LocalPath, batch: Batch | None = None):
+    r"""
+    Read JSON from stdin or ``input_files``, and send NestedText to stdout.
 
-    briefer_schema = guess_briefer_schema(schema)
-    if sum(len(path_list) for path_list in briefer_schema.values()) < sum(
-        len(path_list) for path_list in schema.values()
-    ):
-        content = '\n'.join(
-            (
-                '',
-                '# Above is a schema that literally matches the current data.',
-                '# Below, for your review, is a guess at a better schema.',
-                '',
-                indent(_ntdumps(briefer_schema, indent=2), '# '),
-            )
-        )
-        if sys.stdout.isatty():
-            _syntax_print(content, 'nt')
-        else:
-            print(content)
+    Args:
+        input_files: ``LocalPath``\ s of files or directories with JSON content.
+        batch: Options for converting many files.
+    """
+    _dump_each(
+        render_json_as_nestedtext,
+        (JSON_GLOBS, 'nt', '.nt'),
+        input_files,
+        batch=batch,
+        stream=stream_json_as_nestedtext,
+    )
 
 
-def dump_json_to_schema(*input_files: LocalPath):
+def dump_json_to_schema(*input_files: LocalPath, batch: Batch | None = None):
     r"""
     Read JSON from stdin or ``input_files``, and send a NestedText schema to stdout.
 
     Args:
-        input_files: ``LocalPath``\ s with JSON content.
+        input_files: ``LocalPath``\ s of files or directories with JSON content.
+        batch: Options for converting many files.
     """
-    if not input_files:
-        typed_data = jloads(sys.stdin.read())
-        _dump_typed_data_to_schema(typed_data)
-    else:
-        for f in input_files:
-            typed_data = jloads(f.read('utf-8'))
-            _dump_typed_data_to_schema(typed_data)
+    _dump_each(render_json_as_schema, (JSON_GLOBS, 'nt', '.types.nt'), input_files, batch=batch)
 
 
-def dump_yaml_to_schema(*input_files: LocalPath):
+def dump_yaml_to_schema(
+    *input_files: LocalPath, batch: Batch | None = None, expansion: AliasExpansion | None = None
+):
     r"""
     Read YAML from stdin or ``input_files``, and send a NestedText schema to stdout.
 
     Args:
-        input_files: ``LocalPath``\ s with YAML content.
+        input_files: ``LocalPath``\ s of files or directories with YAML content.
+        batch: Options for converting many files.
+        expansion: Options for checking the expansion of the data by aliases.
     """
-    if not input_files:
-        typed_data = yload(sys.stdin)
-        _dump_typed_data_to_schema(typed_data)
-    else:
-        for f in input_files:
-            with f.open(encoding='utf-8') as ifile:
-                typed_data = yload(ifile)
-            _dump_typed_data_to_schema(typed_data)
+    _dump_each(
+        render_yaml_as_schema, (YAML_GLOBS, 'nt', '.types.nt'), input_files, expansion, batch=batch
+    )
 
 
-def dump_toml_to_schema(*input_files: LocalPath):
+def dump_toml_to_schema(*input_files: LocalPath, batch: Batch | None = None):
     r"""
     Read TOML from stdin or ``input_files``, and send a NestedText schema to stdout.
 
     Args:
-        input_files: ``LocalPath``\ s with TOML content.
+        input_files: ``LocalPath``\ s of files or directories with TOML content.
+        batch: Options for converting many files.
     """
     _require_toml_support()
-    if not input_files:
-        typed_data = tloads(sys.stdin.read())  # pyright: ignore [reportPossiblyUnboundVariable]
-        _dump_typed_data_to_schema(typed_data)
-    else:
-        for f in input_files:
-            with f.open('rb') as ifile:
-                typed_data = tload(cast(BinaryIO, ifile))  # pyright: ignore [reportPossiblyUnboundVariable]
-            _dump_typed_data_to_schema(typed_data)
+    _dump_each(render_toml_as_schema, (TOML_GLOBS, 'nt', '.types.nt'), input_files, batch=batch)
 
 
-def dump_yaml_to_nestedtext(*input_files: LocalPath):
+def dump_yaml_to_nestedtext(
+    *input_files: LocalPath, batch: Batch | None = None, expansion: AliasExpansion | None = None
+):
     r"""
     Read YAML from stdin or ``input_files``, and send NestedText to stdout.
 
     Args:
-        input_files: ``LocalPath``\ s with YAML content.
+        input_files: ``LocalPath``\ s of files or directories with YAML content.
+        batch: Options for converting many files.
+        expansion: Options for checking each document's expansion by aliases.
     """
-    converter = mk_stringy_converter()
-    if not input_files:
-        data = yload(sys.stdin)
-        data = converter.unstructure(data)
-        ntdump(data)
-    else:
-        for f in input_files:
-            with f.open(encoding='utf-8') as ifile:
-                data = yload(ifile)
-            data = converter.unstructure(data)
-            ntdump(data)
+    _dump_each(
+        render_yaml_as_nestedtext,
+        (YAML_GLOBS, 'nt', '.nt'),
+        input_files,
+        expansion,
+        batch=batch,
+        stream=stream_yaml_as_nestedtext,
+    )
 
 
-def dump_toml_to_nestedtext(*input_files: LocalPath):
+def dump_toml_to_nestedtext(*input_files: LocalPath, batch: Batch | None = None):
     r"""
     Read TOML from stdin or ``input_files``, and send NestedText to stdout.
 
     Args:
-        input_files: ``LocalPath``\ s with TOML content.
+        input_files: ``LocalPath``\ s of files or directories with TOML content.
+        batch: Options for converting many files.
     """
     _require_toml_support()
-    converter = mk_stringy_converter()
-    if not input_files:
-        data = tloads(sys.stdin.read())  # pyright: ignore [reportPossiblyUnboundVariable]
-        data = converter.unstructure(data)
-        ntdump(data)
-    else:
-        for f in input_files:
-            with f.open('rb') as ifile:
-                data = tload(cast(BinaryIO, ifile))  # pyright: ignore [reportPossiblyUnboundVariable]
-            data = converter.unstructure(data)
-            ntdump(data)
+    _dump_each(
+        render_toml_as_nestedtext,
+        (TOML_GLOBS, 'nt', '.nt'),
+        input_files,
+        batch=batch,
+        stream=stream_toml_as_nestedtext,
+    )
 
 
-def dump_nestedtext_to_yaml(
+def dump_nestedtext_to_yaml(  # noqa: PLR0913
     *input_files: LocalPath,
+    schema: CastSchema | None = None,
     bool_paths: Sequence[str] = (),
     null_paths: Sequence[str] = (),
     num_paths: Sequence[str] = (),
     date_paths: Sequence[str] = (),
+    batch: Batch | None = None,
+    split: bool = False,
 ):
     r"""
     Read NestedText from stdin or ``input_files``, and send up-typed YAML to stdout.
 
     Args:
-        input_files: ``LocalPath``\ s with NestedText content.
+        input_files: ``LocalPath``\ s of files or directories with NestedText content.
+        schema: A prebuilt `CastSchema` to use instead of the ``*_paths`` queries.
         bool_paths: YAMLPath queries whose matches will be casted to ``bool``.
         null_paths: YAMLPath queries whose matches will be casted to ``None``.
         num_paths: YAMLPath queries whose matches will be casted to ``int``/``float``.
         date_paths: YAMLPath queries whose matches will be casted to ``date``/``datetime``.
+        batch: Options for converting many files.
+        split: Write each element of a top-level list as its own document,
+            in a multi-document stream.
     """
-    for src in input_files or (sys.stdin,):
-        data = ntload(src)
-        data = cast_stringy_data(
-            data,
+    if schema is None:
+        from .casters import CastSchema
+
+        schema = CastSchema(
             bool_paths=bool_paths,
             null_paths=null_paths,
             num_paths=num_paths,
             date_paths=date_paths,
-            converter=mk_yaml_types_converter(),
         )
-        ydump(data)
+    _dump_each(
+        render_nestedtext_as_yaml,
+        (NESTEDTEXT_GLOBS, 'yaml', '.yml'),
+        input_files,
+        schema,
+        split,
+        batch=batch,
+        stream=stream_nestedtext_as_yaml,
+    )
 
 
 def dump_nestedtext_to_toml(
     *input_files: LocalPath,
+    schema: CastSchema | None = None,
     bool_paths: Sequence[str] = (),
     num_paths: Sequence[str] = (),
     date_paths: Sequence[str] = (),
+    batch: Batch | None = None,
 ):
     r"""
     Read NestedText from stdin or ``input_files``, and send up-typed TOML to stdout.
 
     Args:
-        input_files: ``LocalPath``\ s with NestedText content.
+        input_files: ``LocalPath``\ s of files or directories with NestedText content.
+        schema: A prebuilt `CastSchema` to use instead of the ``*_paths`` queries.
         bool_paths: YAMLPath queries whose matches will be casted to ``bool``.
         num_paths: YAMLPath queries whose matches will be casted to ``int``/``float``.
         date_paths: YAMLPath queries whose matches will be casted to
             ``date``/``datetime``/``time``.
+        batch: Options for converting many files.
     """
     _require_toml_support()
-    for src in input_files or (sys.stdin,):
-        data = ntload(src)
-        data = cast_stringy_data(
-            data,
-            bool_paths=bool_paths,
-            num_paths=num_paths,
-            date_paths=date_paths,
-            converter=mk_toml_types_converter(),
-        )
-        if isinstance(data, list):
-            data = {'TOML does not allow top-level arrays': data}
-        tdump(data)
+    if schema is None:
+        from .casters import CastSchema
+
+        schema = CastSchema(bool_paths=bool_paths, num_paths=num_paths, date_paths=date_paths)
+    _dump_each(
+        render_nestedtext_as_toml,
+        (NESTEDTEXT_GLOBS, 'toml', '.toml'),
+        input_files,
+        schema,
+        batch=batch,
+        stream=stream_nestedtext_as_toml,
+    )
 
 
 def dump_nestedtext_to_json(
     *input_files: LocalPath,
+    schema: CastSchema | None = None,
     bool_paths: Sequence[str] = (),
     null_paths: Sequence[str] = (),
     num_paths: Sequence[str] = (),
+    batch: Batch | None = None,
+    layout: str = 'indented',
 ):
     r"""
     Read NestedText from stdin or ``input_files``, and send up-typed JSON to stdout.
 
     Args:
-        input_files: ``LocalPath``\ s with NestedText content.
+        input_files: ``LocalPath``\ s of files or directories with NestedText content.
+        schema: A prebuilt `CastSchema` to use instead of the ``*_paths`` queries.
         bool_paths: YAMLPath queries whose matches will be casted to ``bool``.
         null_paths: YAMLPath queries whose matches will be casted to ``None``.
         num_paths: YAMLPath queries whose matches will be casted to ``int``/``float``.
+        batch: Options for converting many files.
+        layout: How to lay out the JSON: ``'indented'`` by two spaces,
+            ``'compact'`` without any optional whitespace,
+            or as JSON Lines, with one record per input document (``'lines'``)
+            or per element of a top-level list (``'elements'``).
     """
-    for src in input_files or (sys.stdin,):
-        data = ntload(src)
-        data = cast_stringy_data(
-            data,
-            bool_paths=bool_paths,
-            null_paths=null_paths,
-            num_paths=num_paths,
-            converter=mk_json_types_converter(),
+    if schema is None:
+        from .casters import CastSchema
+
+        schema = CastSchema(bool_paths=bool_paths, null_paths=null_paths, num_paths=num_paths)
+    if layout in ('lines', 'elements'):
+        _dump_each(
+            render_nestedtext_as_jsonl,
+            (NESTEDTEXT_GLOBS, 'json', '.jsonl'),
+            input_files,
+            schema,
+            layout == 'elements',
+            batch=batch,
+            stream=stream_nestedtext_as_jsonl,
         )
-        jdump(data)
+        return
+    _dump_each(
+        render_nestedtext_as_json,
+        (NESTEDTEXT_GLOBS, 'json', '.json'),
+        input_files,
+        schema,
+        layout == 'compact',
+        batch=batch,
+        stream=stream_nestedtext_as_json,
+    )
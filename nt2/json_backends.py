@@ -0,0 +1,209 @@
+"""
+Interchangeable JSON encoders, preferring faster libraries when installed.
+
+Every backend renders indented JSON exactly as ``json.dumps(data, indent=2)`` would,
+so output doesn't depend on which is in use. Compact JSON is always valid,
+but its details (like number notation and escaping) may vary by backend.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from json import dumps as _jdumps
+from math import isfinite
+from typing import Callable, NamedTuple
+
+
+class JSONBackend(NamedTuple):
+    """
+    A pair of JSON encoding functions.
+
+    Attributes:
+        name: The key of this backend in `JSON_BACKENDS`.
+        dumps: Render data as JSON indented by two spaces, without a final newline,
+            exactly matching ``json.dumps(data, indent=2)``.
+        dumps_compact: Render data as JSON without any optional whitespace.
+    """
+
+    name: str
+    dumps: Callable[[object], str]
+    dumps_compact: Callable[[object], str]
+
+
+def _stdlib_dumps(data: object) -> str:
+    """
+    Render data as indented JSON, with the standard library.
+
+    Args:
+        data: Any JSON-serializable value.
+
+    Returns:
+        JSON content, without a final newline.
+    """
+    return _jdumps(data, indent=2)
+
+
+def _stdlib_dumps_compact(data: object) -> str:
+    """
+    Render data as compact JSON, with the standard library.
+
+    Args:
+        data: Any JSON-serializable value.
+
+    Returns:
+        JSON content, without a final newline.
+    """
+    return _jdumps(data, separators=(',', ':'))
+
+
+def stdlib_backend() -> JSONBackend:
+    """
+    Encode JSON with the standard library's ``json`` module.
+
+    Returns:
+        The backend, always available.
+    """
+    return JSONBackend('stdlib', _stdlib_dumps, _stdlib_dumps_compact)
+
+
+_NON_ASCII = re.compile('[\x7f-\U0010ffff]')
+_FLOAT_VALUE_LINE = re.compile(
+    r'^( *(?:"(?:[^"\\]|\\.)*": )?)(-?[0-9]+(?:\.[0-9]+)?e[-+]?[0-9]+|-?[0-9]+\.[0-9]+)(?=,?$)',
+    re.MULTILINE,
+)
+
+
+def _escape_non_ascii(match: re.Match) -> str:
+    r"""
+    Escape a character as ``json.dumps`` does by default, using surrogate pairs if needed.
+
+    Args:
+        match: A match of a single character.
+
+    Returns:
+        The ``\u`` escape sequence(s) for the character.
+    """
+    code = ord(match.group())
+    if code < 0x10000:  # noqa: PLR2004
+        return f"\\u{code:04x}"
+    code -= 0x10000
+    return f"\\u{0xD800 | (code >> 10):04x}\\u{0xDC00 | (code & 0x3FF):04x}"
+
+
+def _repr_float(match: re.Match) -> str:
+    """
+    Rewrite a number on an indented JSON line as ``json.dumps`` would.
+
+    Args:
+        match: A match of `_FLOAT_VALUE_LINE`.
+
+    Returns:
+        The line's indentation and key, followed by the number as ``float.__repr__`` has it.
+    """
+    return f"{match.group(1)}{float(match.group(2))!r}"
+
+
+def _has_nonfinite_float(data: object) -> bool:
+    r"""
+    Check whether nested data holds any ``NaN`` or infinite ``float``.
+
+    Args:
+        data: Nested ``dict``\ s, ``list``\ s, and scalars.
+
+    Returns:
+        ``True`` if a non-finite ``float`` is found anywhere within.
+    """
+    stack = [data]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, float):
+            if not isfinite(node):
+                return True
+        elif isinstance(node, dict):
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return False
+
+
+def orjson_backend() -> JSONBackend:
+    r"""
+    Encode JSON with ``orjson``, adjusting indented output to match the standard library.
+
+    The adjustments escape non-ASCII characters, and respell ``float``\ s.
+    Data ``orjson`` can't represent the same way, like ``int``\ s beyond 64 bits
+    or non-finite ``float``\ s, is encoded by the standard library instead.
+
+    Returns:
+        The backend.
+
+    Raises:
+        ImportError: ``orjson`` is not installed.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    import orjson
+
+    def dumps_bytes(data: object, option: int) -> bytes | None:
+        try:
+            content = orjson.dumps(data, option=option)
+        except TypeError:
+            return None
+        if b'null' in content and _has_nonfinite_float(data):
+            return None
+        return content
+
+    def dumps(data: object) -> str:
+        content = dumps_bytes(data, orjson.OPT_INDENT_2)
+        if content is None:
+            return _stdlib_dumps(data)
+        text = content.decode('utf-8')
+        if not text.isascii() or '\x7f' in text:
+            text = _NON_ASCII.sub(_escape_non_ascii, text)
+        return _FLOAT_VALUE_LINE.sub(_repr_float, text)
+
+    def dumps_compact(data: object) -> str:
+        content = dumps_bytes(data, 0)
+        return _stdlib_dumps_compact(data) if content is None else content.decode('utf-8')
+
+    return JSONBackend('orjson', dumps, dumps_compact)
+
+
+JSON_BACKENDS: dict[str, Callable[[], JSONBackend]] = {
+    'orjson': orjson_backend,
+    'stdlib': stdlib_backend,
+}
+"""
+Functions creating each known `JSONBackend`, or raising ``ImportError`` if unavailable.
+
+They are tried in order by `get_json_backend`, and more may be registered here.
+"""
+
+
+@lru_cache(maxsize=None)
+def get_json_backend(name: str | None = None) -> JSONBackend:
+    """
+    Get a JSON backend by name, or else the first available one in `JSON_BACKENDS`.
+
+    Args:
+        name: A key of `JSON_BACKENDS`.
+
+    Returns:
+        The shared `JSONBackend`.
+
+    Raises:
+        ImportError: The named backend's library is not installed.
+
+    # noqa: DAR401
+    # noqa: DAR402
+    """
+    if name is not None:
+        return JSON_BACKENDS[name]()
+    for factory in JSON_BACKENDS.values():
+        try:
+            return factory()
+        except ImportError:
+            continue
+    return stdlib_backend()
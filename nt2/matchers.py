@@ -0,0 +1,452 @@
+"""
+Match many YAMLPath queries against a document in a single traversal.
+
+Rather than walking the document once per query (as ``yamlpath.Processor.get_nodes`` does),
+`QueryMatcher` compiles all queries into one trie of path segments,
+then resolves every match during one walk of the ``dict``/``list`` tree.
+
+Queries made only of key, index, ``*``, and ``**`` segments are compiled.
+Any others (searches, anchors, collectors, slices)
+are listed in `QueryMatcher.fallback_ids`, to be resolved by yamlpath itself.
+
+`query_signature` and `covers` help to drop redundant queries before compiling them.
+"""
+
+from __future__ import annotations
+
+from typing import Any, FrozenSet, Iterator, NamedTuple, Sequence, Tuple
+
+from yamlpath import YAMLPath
+from yamlpath.enums import PathSegmentTypes, PathSeparators
+
+try:
+    from typing import TypeAlias
+except ImportError:
+    from typing import Any as TypeAlias
+
+
+class _QueryNode:
+    r"""
+    A position in the query trie, shared by all queries with the same leading segments.
+
+    Attributes:
+        after_traverse: Whether this node is reached by a ``**`` segment,
+            in which case it stays active at every depth below,
+            and any queries ending here only match leaf nodes.
+        key_edges: Children reached by key segments, when at a ``dict``.
+        name_edges: The subset of ``key_edges`` whose keys aren't integers.
+            Like yamlpath, these pass through ``list``\ s to reach ``dict`` elements.
+        index_edges: Children reached by index segments,
+            kept apart from integer key segments, which may also match a ``dict`` key.
+        list_edges: Children reached at a ``list``, by index segments or integer key segments.
+        match_all: The child reached by a ``*`` segment.
+        traverse: The child reached by a ``**`` segment.
+        query_ids: Identifiers of the queries ending at this node.
+    """
+
+    __slots__ = (
+        'after_traverse',
+        'index_edges',
+        'key_edges',
+        'list_edges',
+        'match_all',
+        'name_edges',
+        'query_ids',
+        'traverse',
+    )
+
+    def __init__(self, *, after_traverse: bool = False):
+        """
+        Create an empty trie node.
+
+        Args:
+            after_traverse: Whether this node is reached by a ``**`` segment.
+        """
+        self.after_traverse = after_traverse
+        self.key_edges: dict[str, _QueryNode] = {}
+        self.name_edges: dict[str, _QueryNode] = {}
+        self.index_edges: dict[int, _QueryNode] = {}
+        self.list_edges: dict[int, list[_QueryNode]] = {}
+        self.match_all: _QueryNode | None = None
+        self.traverse: _QueryNode | None = None
+        self.query_ids: list[int] = []
+
+
+MatchState: TypeAlias = FrozenSet[Tuple[_QueryNode, bool]]
+Signature: TypeAlias = 'tuple[tuple[PathSegmentTypes, str | int | None], ...] | str'
+Trail: TypeAlias = 'tuple[str | int, Trail] | None'
+
+
+def trail_to_yamlpath(trail: Trail) -> str:
+    """
+    Render the keys and indices leading to a node as a YAMLPath.
+
+    Args:
+        trail: A ``Match.trail``, as nested ``(ref, parent_trail)`` pairs.
+
+    Returns:
+        A ``/``-separated YAMLPath ``str`` matching only the node at the end of the trail.
+    """
+    sections = []
+    while trail is not None:
+        ref, trail = trail
+        sections.append(
+            f"[{ref}]"
+            if isinstance(ref, int)
+            else f"/{YAMLPath.escape_path_section(ref, PathSeparators.FSLASH)}"
+        )
+    path = ''.join(reversed(sections))
+    return path if path.startswith('/') else f"/{path}"
+
+
+class Match(NamedTuple):
+    """
+    A node matched by one or more queries.
+
+    Attributes:
+        parent: The ``dict`` or ``list`` containing the node, or ``None`` for the document root.
+        ref: The key or index of the node within ``parent``.
+        node: The matched value itself.
+        query_ids: Identifiers of all queries matching this node.
+        trail: The keys and indices leading to this node, for use with `trail_to_yamlpath`.
+    """
+
+    parent: dict | list | None
+    ref: str | int | None
+    node: Any
+    query_ids: list[int]
+    trail: Trail
+
+    @property
+    def path(self) -> str:
+        """
+        Render the location of the matched node as a literal YAMLPath.
+
+        Returns:
+            A ``/``-separated YAMLPath ``str`` matching only this node.
+        """
+        return trail_to_yamlpath(self.trail)
+
+
+def _compilable(segments: Sequence[tuple[PathSegmentTypes, Any]]) -> bool:
+    """
+    Check whether a parsed query uses only segment types the trie can represent.
+
+    Args:
+        segments: The ``escaped`` segments of a ``YAMLPath``.
+
+    Returns:
+        ``True`` if the query can be compiled into the trie.
+    """
+    prev_seg_type = None
+    for seg_type, attrs in segments:
+        if seg_type is PathSegmentTypes.INDEX:
+            try:
+                int(attrs)
+            except ValueError:
+                return False
+        elif seg_type is PathSegmentTypes.TRAVERSE:
+            if prev_seg_type is PathSegmentTypes.TRAVERSE:
+                # yamlpath rejects these itself, so let it report the problem
+                return False
+        elif seg_type not in (PathSegmentTypes.KEY, PathSegmentTypes.MATCH_ALL):
+            return False
+        prev_seg_type = seg_type
+    return True
+
+
+def query_signature(ypath: YAMLPath) -> Signature:
+    """
+    Reduce a query to a canonical form, the same for all spellings of equivalent queries.
+
+    Compilable queries compare by their parsed segments,
+    so that separators (``.`` or ``/``), quoting, and escaping don't matter.
+    Others compare by their original text.
+
+    Args:
+        ypath: A parsed ``YAMLPath``.
+
+    Returns:
+        A hashable signature of the query.
+    """
+    segments = ypath.escaped
+    if not _compilable(segments):
+        return str(ypath.original)
+    return tuple(
+        (seg_type, int(attrs) if seg_type is PathSegmentTypes.INDEX else attrs)
+        for seg_type, attrs in segments
+    )
+
+
+def covers(broad: Signature, narrow: Signature) -> bool:
+    """
+    Check whether one query matches every leaf node matched by another, in any document.
+
+    Beyond identical queries, this only recognizes a query ending in ``**``
+    as covering those which begin with the same segments before it.
+
+    Args:
+        broad: The `query_signature` of the query which may cover the other.
+        narrow: The `query_signature` of the query which may be covered.
+
+    Returns:
+        ``True`` if every leaf matched by ``narrow`` is surely matched by ``broad``.
+    """
+    if broad == narrow:
+        return True
+    if isinstance(broad, str) or isinstance(narrow, str):
+        return False
+    if not broad or broad[-1][0] is not PathSegmentTypes.TRAVERSE:
+        return False
+    prefix = broad[:-1]
+    return narrow[: len(prefix)] == prefix
+
+
+class QueryMatcher:
+    """
+    A set of YAMLPath queries compiled for matching together, in one document traversal.
+
+    Each query is identified by its position in the ``queries`` sequence.
+    """
+
+    def _add(self, query_id: int, segments: Sequence[tuple[PathSegmentTypes, Any]]):
+        """
+        Add a query's segments to the trie.
+
+        Args:
+            query_id: The identifier to report when this query matches.
+            segments: The ``escaped`` segments of a compilable ``YAMLPath``.
+        """
+        qnode = self._root
+        for seg_type, attrs in segments:
+            if seg_type is PathSegmentTypes.KEY:
+                child = qnode.key_edges.get(attrs)
+                if child is None:
+                    child = qnode.key_edges[attrs] = _QueryNode()
+                    try:
+                        qnode.list_edges.setdefault(int(attrs), []).append(child)
+                    except ValueError:
+                        qnode.name_edges[attrs] = child
+            elif seg_type is PathSegmentTypes.INDEX:
+                child = qnode.index_edges.get(int(attrs))
+                if child is None:
+                    child = qnode.index_edges[int(attrs)] = _QueryNode()
+                    qnode.list_edges.setdefault(int(attrs), []).append(child)
+            elif seg_type is PathSegmentTypes.MATCH_ALL:
+                child = qnode.match_all = qnode.match_all or _QueryNode()
+            else:
+                child = qnode.traverse = qnode.traverse or _QueryNode(after_traverse=True)
+            qnode = child
+        qnode.query_ids.append(query_id)
+
+    @staticmethod
+    def _closure(states: set[tuple[_QueryNode, bool]]) -> MatchState:
+        """
+        Add the states reachable without descending, by a ``**`` matching zero levels.
+
+        Args:
+            states: Pairs of trie node and "keys only" flag.
+                The flag marks a key segment passing through a ``list``,
+                for which no other edges of the node apply.
+
+        Returns:
+            The completed, hashable state.
+        """
+        for qnode, keys_only in tuple(states):
+            if not keys_only and qnode.traverse:
+                states.add((qnode.traverse, False))
+        return frozenset(states)
+
+    def __init__(self, queries: Sequence[YAMLPath]):
+        """
+        Compile all supported queries into a single trie.
+
+        Args:
+            queries: Parsed ``YAMLPath`` queries.
+        """
+        self.queries = tuple(queries)
+        self.fallback_ids: list[int] = []
+        self._root = _QueryNode()
+        for query_id, query in enumerate(self.queries):
+            segments = query.escaped
+            if _compilable(segments):
+                self._add(query_id, segments)
+            else:
+                self.fallback_ids.append(query_id)
+        self.root_state = self._closure({(self._root, False)})
+        self._literal_cache: dict[tuple[MatchState, bool], list | None] = {}
+        self._map_cache: dict[tuple[MatchState, str], MatchState] = {}
+
+    def map_child_state(self, state: MatchState, key: str) -> MatchState:
+        """
+        Advance a state, for descending from a ``dict`` into the value at ``key``.
+
+        Args:
+            state: The state at the ``dict``.
+            key: The key of the child being visited.
+
+        Returns:
+            The state at the child, which is empty if no query can match there or below.
+        """
+        try:
+            return self._map_cache[state, key]
+        except KeyError:
+            pass
+        states = set()
+        for qnode, keys_only in state:
+            child = (qnode.name_edges if keys_only else qnode.key_edges).get(key)
+            if child is not None:
+                states.add((child, False))
+            if not keys_only:
+                if qnode.match_all is not None:
+                    states.add((qnode.match_all, False))
+                if qnode.after_traverse:
+                    states.add((qnode, False))
+        child_state = self._map_cache[state, key] = (
+            self._closure(states) if states else frozenset()
+        )
+        return child_state
+
+    def list_child_state(self, state: MatchState, index: int, length: int) -> MatchState:
+        """
+        Advance a state, for descending from a ``list`` into the element at ``index``.
+
+        Args:
+            state: The state at the ``list``.
+            index: The index of the child being visited.
+            length: The length of the ``list``, for matching negative indices.
+
+        Returns:
+            The state at the child, which is empty if no query can match there or below.
+        """
+        states = set()
+        for qnode, keys_only in state:
+            if not keys_only:
+                for child in (
+                    *qnode.list_edges.get(index, ()),
+                    *qnode.list_edges.get(index - length, ()),
+                ):
+                    states.add((child, False))
+                if qnode.match_all is not None:
+                    states.add((qnode.match_all, False))
+                if qnode.after_traverse:
+                    states.add((qnode, False))
+            if qnode.name_edges and not qnode.after_traverse:
+                states.add((qnode, True))
+        return self._closure(states) if states else frozenset()
+
+    def _literal_refs(self, state: MatchState, *, at_dict: bool) -> list | None:
+        """
+        List the only keys or indices a state can match, if it's made of literal segments.
+
+        Results are cached per state, as the same states recur throughout a document.
+
+        Args:
+            state: The state at a container.
+            at_dict: Whether the container is a ``dict`` rather than a ``list``.
+
+        Returns:
+            Every key (for a ``dict``) or index (for a ``list``) with an edge in ``state``,
+                or ``None`` if some edge (a ``*``, ``**``, or key passing through a ``list``)
+                may match any child.
+        """
+        cache_key = (state, at_dict)
+        try:
+            return self._literal_cache[cache_key]
+        except KeyError:
+            pass
+        refs: set[str | int] | None = set()
+        for qnode, keys_only in state:
+            if at_dict:
+                if not keys_only and (qnode.match_all or qnode.after_traverse):
+                    refs = None
+                    break
+                refs.update(qnode.name_edges if keys_only else qnode.key_edges)
+            else:
+                if keys_only or qnode.match_all or qnode.after_traverse or qnode.name_edges:
+                    refs = None
+                    break
+                refs.update(qnode.list_edges)
+        result = self._literal_cache[cache_key] = None if refs is None else list(refs)
+        return result
+
+    def children(
+        self, state: MatchState, container: dict | list, *, exhaustive: bool = False
+    ) -> Iterator[tuple[str | int, Any, MatchState]]:
+        """
+        Generate the children of a container, each with its advanced state.
+
+        When every query active here is literal at this level,
+        only the children those queries name are visited, by direct lookup,
+        so the cost doesn't grow with the size of the container.
+
+        Args:
+            state: The state at the container.
+            container: A ``dict`` or ``list``.
+            exhaustive: Generate every child, even those no query can match.
+
+        Yields:
+            The key or index, value, and state of each child.
+            Unless ``exhaustive``, children with empty states may be skipped.
+        """
+        at_dict = isinstance(container, dict)
+        refs = None if exhaustive or not state else self._literal_refs(state, at_dict=at_dict)
+        if at_dict:
+            items = (
+                container.items()
+                if refs is None
+                else ((key, container[key]) for key in refs if key in container)
+            )
+            for key, val in items:
+                yield key, val, self.map_child_state(state, key) if state else state
+        else:
+            length = len(container)
+            if refs is None:
+                items = enumerate(container)
+            else:
+                indices = {idx if idx >= 0 else idx + length for idx in refs}
+                items = ((idx, container[idx]) for idx in sorted(indices) if 0 <= idx < length)
+            for idx, ele in items:
+                yield idx, ele, self.list_child_state(state, idx, length) if state else state
+
+    @staticmethod
+    def matched_ids(state: MatchState, node: object) -> list[int]:
+        """
+        Identify the queries matching a node, given its state.
+
+        Args:
+            state: The state at the node.
+            node: The node itself.
+
+        Returns:
+            Identifiers of all compiled queries matching the node.
+        """
+        is_leaf = not isinstance(node, (dict, list))
+        query_ids = []
+        for qnode, keys_only in state:
+            if qnode.query_ids and not keys_only and (is_leaf or not qnode.after_traverse):
+                query_ids.extend(qnode.query_ids)
+        return query_ids
+
+    def matches(self, data: dict | list) -> Iterator[Match]:
+        """
+        Find all nodes matching any compiled query, in a single traversal.
+
+        Args:
+            data: A nested ``dict`` or ``list`` to query.
+
+        Yields:
+            A `Match` for each node matched by one or more compiled queries.
+        """
+        stack: list[tuple[dict | list | None, str | int | None, Any, MatchState, Trail]] = [
+            (None, None, data, self.root_state, None)
+        ]
+        while stack:
+            parent, ref, node, state, trail = stack.pop()
+            query_ids = self.matched_ids(state, node)
+            if query_ids:
+                yield Match(parent, ref, node, query_ids, trail)
+            if isinstance(node, (dict, list)):
+                for child_ref, child, child_state in self.children(state, node):
+                    if child_state:
+                        stack.append((node, child_ref, child, child_state, (child_ref, trail)))
@@ -0,0 +1,238 @@
+"""Incremental NestedText reading, for documents too large to comfortably hold in memory."""
+
+from __future__ import annotations
+
+from itertools import chain, repeat
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+from nestedtext import NestedTextError, load as _ntload
+
+if TYPE_CHECKING:
+    from .casters import StringyData
+
+
+def _top_level_kind(text: str) -> type[dict | list] | None:
+    """
+    Guess the type of document a top-level NestedText line belongs to.
+
+    Args:
+        text: The first non-blank, non-comment line of a document, without its newline.
+
+    Returns:
+        ``list`` for a list item, ``dict`` for a dict or key item,
+            or ``None`` for anything else, like a string item, inline value, or indented line.
+    """
+    if text[:1] in ' [{' or (text[:1] == '>' and text[1:2] in ' '):
+        return None
+    if text[:1] == '-' and text[1:2] in ' ':
+        return list
+    return dict
+
+
+def _strip_newline(line: str) -> str:
+    r"""
+    Remove the line terminator from a line.
+
+    Args:
+        line: A line as read from a text file.
+
+    Returns:
+        The line without its ``\n`` or ``\r\n``.
+    """
+    return line.rstrip('\r\n')
+
+
+def _is_value_line(text: str) -> bool:
+    """
+    Check whether a NestedText line holds any content, rather than being blank or a comment.
+
+    Args:
+        text: A line without its newline.
+
+    Returns:
+        ``True`` unless the line is blank or a comment.
+    """
+    stripped = text.lstrip(' ')
+    return bool(stripped.strip()) and not stripped.startswith('#')
+
+
+def _is_key_item(text: str) -> bool:
+    """
+    Check whether a top-level NestedText line is part of a multiline key.
+
+    Args:
+        text: A line without its newline.
+
+    Returns:
+        ``True`` for a key item line.
+    """
+    return text[:1] == ':' and text[1:2] in ' '
+
+
+class TopLevelItems:
+    r"""
+    The top-level items of a NestedText list or dict document, parsed a few at a time.
+
+    Lines are grouped into items by their indentation, and consecutive items
+    are parsed together with ``nestedtext`` once they span ``chunk_lines``,
+    so memory use is bounded by the largest item (or chunk), rather than the whole document.
+    Parse errors and duplicate keys are still reported with line numbers of the whole document.
+
+    Documents of any other shape (a top-level string or inline value)
+    have ``kind`` ``None``, and can only be parsed whole, with `load`.
+
+    Attributes:
+        kind: ``list`` or ``dict``, according to the first item of the document,
+            or ``None`` if the document can't be parsed item by item.
+        source: A name for the document, like a file path, to use in error messages.
+        chunk_lines: The number of lines to collect before parsing the items within.
+    """
+
+    chunk_lines: int = 1000
+
+    def __init__(self, lines: Iterable[str], source: str | None = None):
+        """
+        Read only as far as the first item of the document, to learn its ``kind``.
+
+        Args:
+            lines: The lines of a NestedText document, like an open text file.
+            source: A name for the document, like a file path, to use in error messages.
+        """
+        self.source = source
+        self._lines = iter(lines)
+        self._head: list[str] = []
+        self.kind: type[dict | list] | None = None
+        for line in self._lines:
+            self._head.append(line)
+            text = _strip_newline(line)
+            if _is_value_line(text):
+                self.kind = _top_level_kind(text)
+                break
+
+    def load(self) -> StringyData:
+        r"""
+        Parse the whole document at once, as `ntload` would.
+
+        Returns:
+            Parsed NestedText data as a ``dict`` or ``list`` of ``str``\ s.
+        """
+        return _ntload(chain(self._head, self._lines), top='any', source=self.source)
+
+    def _parse(self, chunk: list[str], prev: tuple[list[str], int]) -> dict | list:
+        """
+        Parse the lines of one top-level item.
+
+        Args:
+            chunk: The lines of the item, along with any surrounding blank or comment lines.
+            prev: The lines of the previous item, and the (0-based) line number
+                of the first of those, for error messages.
+
+        Returns:
+            A ``dict`` or ``list`` holding just the one item.
+
+        Raises:
+            NestedTextError: The item is invalid, or the wrong kind for the document.
+                Line numbers are relative to the whole document.
+
+        # noqa: DAR401
+        # noqa: DAR402
+        """
+        top = 'list' if self.kind is list else 'dict'
+        try:
+            return _ntload(iter(chunk), top=top, source=self.source)
+        except NestedTextError:
+            # Parse again in context, for the same error (and line numbers) as a full parse
+            prev_chunk, prev_start = prev
+            _ntload(chain(repeat('', prev_start), prev_chunk, chunk), top=top, source=self.source)
+            raise  # pragma: no cover
+
+    def _duplicate_key_error(
+        self, key: str, chunk: list[str], start: int, prev: tuple[list[str], int]
+    ) -> NestedTextError:
+        """
+        Describe a top-level key which was already used, as ``nestedtext`` would.
+
+        Args:
+            key: The repeated key.
+            chunk: The lines of the items including the one repeating ``key``.
+            start: The (0-based) line number of the first line of ``chunk`` in the document.
+            prev: The lines of the previous items, and the line number of the first of those.
+
+        Returns:
+            An exception ready to raise.
+        """
+        keymap: dict = {}
+        _ntload(iter(chunk), top='dict', keymap=keymap)
+        offset = keymap[key,].key_line.lineno
+        lineno, line = start + offset, _strip_newline(chunk[offset])
+
+        prev_chunk, prev_start = prev
+        earlier = enumerate(map(_strip_newline, chain(prev_chunk, chunk[:offset])), prev_start)
+        prev_lineno, prev_line = next(
+            (num, text) for num, text in reversed(list(earlier)) if _is_value_line(text)
+        )
+        return NestedTextError(
+            key,
+            template="duplicate key: {}.",
+            culprit=tuple(filter(None, (self.source, lineno + 1))),
+            codicil='\n'.join(
+                (f"{prev_lineno + 1:>4} ❬{prev_line}❭", f"{lineno + 1:>4} ❬{line}❭", '      ▲')
+            ),
+            colno=0,
+            lineno=lineno,
+            line=line,
+            prev_line=prev_line,
+        )
+
+    def _chunks(self) -> Iterator[tuple[list[str], int]]:
+        """
+        Group the lines of the document into whole top-level items, about ``chunk_lines`` each.
+
+        Yields:
+            The lines of some consecutive items, along with any surrounding blank or comment lines,
+                and the (0-based) line number of the first of those lines.
+        """
+        chunk: list[str] = []
+        start = 0
+        in_item = in_key = False
+        for lineno, line in enumerate(chain(self._head, self._lines)):
+            text = _strip_newline(line)
+            if text[:1] != ' ' and _is_value_line(text):
+                continues_key = in_key and _is_key_item(text)
+                if in_item and len(chunk) >= self.chunk_lines and not continues_key:
+                    yield chunk, start
+                    chunk, start = [], lineno
+                in_item, in_key = True, _is_key_item(text)
+            chunk.append(line)
+        if in_item:
+            yield chunk, start
+
+    def __iter__(self) -> Iterator[tuple[str | int, StringyData]]:
+        """
+        Parse and generate each top-level item, as soon as the lines following it are read.
+
+        Yields:
+            The key (for a ``dict``) or index (for a ``list``) and value of each item.
+
+        Raises:
+            NestedTextError: The document is invalid.
+
+        # noqa: DAR401
+        # noqa: DAR402
+        """
+        seen_keys: set[str] = set()
+        index = 0
+        prev: tuple[list[str], int] = ([], 0)
+        for chunk, start in self._chunks():
+            parsed = self._parse(chunk, prev)
+            if isinstance(parsed, list):
+                for value in parsed:
+                    yield index, value
+                    index += 1
+            else:
+                for key, value in parsed.items():
+                    if key in seen_keys:
+                        raise self._duplicate_key_error(key, chunk, start, prev)
+                    seen_keys.add(key)
+                    yield key, value
+            prev = (chunk, start)
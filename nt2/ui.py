@@ -2,27 +2,29 @@
 CLI definitions, parsing, and entry points.
 
 After argument processing, these call into the `dumpers` functions to get the job done.
+
+Only what every app needs is imported up front;
+anything heavier waits until an app (or an error) calls for it.
 """
 
 import sys
 from json import JSONDecodeError
 from typing import ClassVar, cast
 
-from nestedtext import NestedTextError, load as ntload
-from plumbum.cli import Application, ExistingFile, Flag, SwitchAttr
+from nestedtext import NestedTextError
+from plumbum import LocalPath, local
+from plumbum.cli import Application, ExistingFile, Flag, Predicate, SwitchAttr
 from plumbum.colors import (
     blue,  # pyright: ignore [reportAttributeAccessIssue]
     green,  # pyright: ignore [reportAttributeAccessIssue]
     magenta,  # pyright: ignore [reportAttributeAccessIssue]
     yellow,  # pyright: ignore [reportAttributeAccessIssue]
 )
-from rich import inspect as _rich_inspect
-from rich.console import Console as RichConsole
-from ruamel.yaml.parser import ParserError as YAMLParserError
-from ruamel.yaml.scanner import ScannerError as YAMLScannerError
 
 from . import __version__
 from .dumpers import (
+    AliasExpansion,
+    Batch,
     dump_json_to_nestedtext,
     dump_json_to_schema,
     dump_nestedtext_to_json,
@@ -34,8 +36,6 @@ from .dumpers import (
     dump_yaml_to_schema,
 )
 
-RICH = RichConsole(stderr=True)
-
 
 def inspect_exception(exc: Exception):  # pragma: no cover
     """
@@ -44,11 +44,19 @@ def inspect_exception(exc: Exception):  # pragma: no cover
     Args:
         exc: Any ``Exception``. After printing, it is swallowed, not raised.
     """
-    _rich_inspect(exc, console=RICH, value=False)
+    from rich import inspect as _rich_inspect
+    from rich.console import Console as RichConsole
 
-    if isinstance(exc, (YAMLParserError, YAMLScannerError)):
-        print("This YAML couldn't be parsed", exc, sep='\n', file=sys.stderr)
-        return
+    _rich_inspect(exc, console=RichConsole(stderr=True), value=False)
+
+    # Only check for YAML errors if ruamel.yaml was ever imported, to raise them
+    if 'ruamel.yaml' in sys.modules:
+        from ruamel.yaml.parser import ParserError as YAMLParserError
+        from ruamel.yaml.scanner import ScannerError as YAMLScannerError
+
+        if isinstance(exc, (YAMLParserError, YAMLScannerError)):
+            print("This YAML couldn't be parsed", exc, sep='\n', file=sys.stderr)
+            return
 
     if isinstance(exc, JSONDecodeError):
         lines = exc.doc.splitlines()
@@ -67,7 +75,49 @@ def inspect_exception(exc: Exception):  # pragma: no cover
         print(*filter(None, exc.get_codicil()), sep='\n', file=sys.stderr)
 
 
-class _ColorApp(Application):
+@Predicate
+def ExistingFileOrDirectory(val: str) -> LocalPath:  # noqa: N802
+    """
+    Validate that an argument is an existing file or directory.
+
+    Args:
+        val: A path given as an argument.
+
+    Returns:
+        The path, as a ``LocalPath``.
+
+    Raises:
+        ValueError: The path doesn't exist.
+    """
+    path = local.path(val)
+    if not path.exists():
+        msg = f"{val} is not a file or directory"
+        raise ValueError(msg)
+    return path
+
+
+@Predicate
+def NonNegativeInteger(val: str) -> int:  # noqa: N802
+    """
+    Validate that an argument is a whole number, zero or more.
+
+    Args:
+        val: A number given as an argument.
+
+    Returns:
+        The number, as an ``int``.
+
+    Raises:
+        ValueError: The argument isn't an integer, or is negative.
+    """
+    number = int(val)
+    if number < 0:
+        msg = f"{val} is negative"
+        raise ValueError(msg)
+    return number
+
+
+class _StyledApp(Application):
     PROGNAME = green
     VERSION = __version__ | blue
     COLOR_USAGE = green
@@ -75,7 +125,58 @@ class _ColorApp(Application):
     ALLOW_ABBREV = True
 
 
-_ColorApp.unbind_switches('help-all')
+_StyledApp.unbind_switches('help-all')
+
+
+class _ColorApp(_StyledApp):
+    jobs = SwitchAttr(
+        ('jobs', 'j'),
+        argtype=NonNegativeInteger,  # type: ignore
+        default=1,
+        argname='N',
+        help="Convert up to N input files at once, in separate processes (0 for one per CPU)",
+    )
+    output_dir = SwitchAttr(
+        ('output-dir', 'o'),
+        argname='DIRECTORY',
+        help=(
+            "Rather than print to stdout, write one file per input into this directory, "
+            "mirroring the layout of any input directories, "
+            "and leaving unchanged files untouched"
+        ),
+    )
+    globs = SwitchAttr(
+        ('glob', 'g'),
+        list=True,
+        argname='PATTERN',
+        help=(
+            "Only convert files within input directories matching any of these patterns, "
+            "rather than all those with the input format's usual extensions"
+        ),
+    )
+    cache_dir = SwitchAttr(
+        'cache-dir',
+        argname='DIRECTORY',
+        help=(
+            "Keep converted output in this directory, "
+            "and reuse it for input files whose content and conversion options are unchanged; "
+            "the least recently used output is removed once the directory passes 64 MiB"
+        ),
+    )
+
+    def batch(self) -> Batch:
+        """
+        Collect the options for converting many input files.
+
+        Returns:
+            A `Batch` from the parsed switches.
+        """
+        return Batch(
+            jobs=self.jobs,
+            output_dir=self.output_dir,
+            globs=tuple(self.globs),
+            cache_dir=self.cache_dir,
+        )
 
 
 class _TypedFormatToSchema(_ColorApp):
@@ -140,21 +241,45 @@ class NestedTextToJSON(_NestedTextToTypedFormat, _NestedTextToTypedFormatSupport
         nt2json <example.nt
         cat example.nt | nt2json
         nt2json --int People.age --boolean 'People."is a wizard"' example.nt
+        nt2json --jsonl --split events.nt
+        nt2json --compact example.nt
     """
 
-    def main(self, *input_files: ExistingFile):  # type: ignore  # noqa: D102,ANN201
+    compact = Flag(
+        ('compact', 'c'),
+        excludes=['jsonl'],
+        help="Rather than indented JSON, write compact JSON without any optional whitespace",
+    )
+    jsonl = Flag(
+        ('jsonl', 'l'),
+        help="Rather than indented JSON, write each input document as one line of compact JSON",
+    )
+    split = Flag(
+        'split',
+        requires=['jsonl'],
+        help="With --jsonl, write each element of a top-level list as its own line",
+    )
+
+    def main(self, *input_files: ExistingFileOrDirectory):  # type: ignore  # noqa: D102,ANN201
         try:
-            for schema_file in cast(list, self.schema_files):
-                schema = cast(dict, ntload(schema_file))
-                self.null_paths = [*schema.get('null', ()), *cast(list, self.null_paths)]
-                self.bool_paths = [*schema.get('boolean', ()), *cast(list, self.bool_paths)]
-                self.num_paths = [*schema.get('number', ()), *cast(list, self.num_paths)]
+            from .casters import CastSchema
 
-            dump_nestedtext_to_json(
-                *input_files,
+            schema = CastSchema.from_schema_files(
+                *cast(list, self.schema_files),
                 bool_paths=self.bool_paths,
                 null_paths=self.null_paths,
                 num_paths=self.num_paths,
+                types=('null', 'boolean', 'number'),
+            )
+            dump_nestedtext_to_json(
+                *input_files,
+                schema=schema,
+                batch=self.batch(),
+                layout=(
+                    ('elements' if self.split else 'lines')
+                    if self.jsonl
+                    else ('compact' if self.compact else 'indented')
+                ),
             )
         except Exception as e:  # pragma: no cover
             inspect_exception(e)
@@ -179,24 +304,28 @@ class NestedTextToYAML(
         nt2yaml <example.nt
         cat example.nt | nt2yaml
         nt2yaml --int People.age --boolean 'People."is a wizard"' example.nt
+        nt2yaml --split manifests.nt
     """
 
-    def main(self, *input_files: ExistingFile):  # type: ignore  # noqa: D102,ANN201
+    split = Flag(
+        'split',
+        help="Write each element of a top-level list as its own YAML document, in one stream",
+    )
+
+    def main(self, *input_files: ExistingFileOrDirectory):  # type: ignore  # noqa: D102,ANN201
         try:
-            for schema_file in cast(list, self.schema_files):
-                schema = cast(dict, ntload(schema_file))
-                self.null_paths = [*schema.get('null', ()), *cast(list, self.null_paths)]
-                self.bool_paths = [*schema.get('boolean', ()), *cast(list, self.bool_paths)]
-                self.num_paths = [*schema.get('number', ()), *cast(list, self.num_paths)]
-                self.date_paths = [*schema.get('date', ()), *cast(list, self.date_paths)]
+            from .casters import CastSchema
 
-            dump_nestedtext_to_yaml(
-                *input_files,
+            schema = CastSchema.from_schema_files(
+                *cast(list, self.schema_files),
                 bool_paths=self.bool_paths,
                 null_paths=self.null_paths,
                 num_paths=self.num_paths,
                 date_paths=self.date_paths,
             )
+            dump_nestedtext_to_yaml(
+                *input_files, schema=schema, batch=self.batch(), split=self.split
+            )
         except Exception as e:  # pragma: no cover
             inspect_exception(e)
             return 1
@@ -218,20 +347,18 @@ class NestedTextToTOML(_NestedTextToTypedFormat, _NestedTextToTypedFormatSupport
         nt2toml --int People.age --boolean 'People."is a wizard"' example.nt
     """
 
-    def main(self, *input_files: ExistingFile):  # type: ignore  # noqa: D102,ANN201
+    def main(self, *input_files: ExistingFileOrDirectory):  # type: ignore  # noqa: D102,ANN201
         try:
-            for schema_file in cast(list, self.schema_files):
-                schema = cast(dict, ntload(schema_file))
-                self.bool_paths = [*schema.get('boolean', ()), *cast(list, self.bool_paths)]
-                self.num_paths = [*schema.get('number', ()), *cast(list, self.num_paths)]
-                self.date_paths = [*schema.get('date', ()), *cast(list, self.date_paths)]
+            from .casters import CastSchema
 
-            dump_nestedtext_to_toml(
-                *input_files,
+            schema = CastSchema.from_schema_files(
+                *cast(list, self.schema_files),
                 bool_paths=self.bool_paths,
                 num_paths=self.num_paths,
                 date_paths=self.date_paths,
+                types=('boolean', 'number', 'date'),
             )
+            dump_nestedtext_to_toml(*input_files, schema=schema, batch=self.batch())
         except Exception as e:  # pragma: no cover
             inspect_exception(e)
             return 1
@@ -247,12 +374,12 @@ class JSONToNestedText(_TypedFormatToSchema):
         cat example.json | json2nt
     """
 
-    def main(self, *input_files: ExistingFile):  # type: ignore  # noqa: D102,ANN201
+    def main(self, *input_files: ExistingFileOrDirectory):  # type: ignore  # noqa: D102,ANN201
         try:
             if not self.to_schema:
-                dump_json_to_nestedtext(*input_files)
+                dump_json_to_nestedtext(*input_files, batch=self.batch())
             else:
-                dump_json_to_schema(*input_files)
+                dump_json_to_schema(*input_files, batch=self.batch())
         except Exception as e:  # pragma: no cover
             inspect_exception(e)
             return 1
@@ -266,14 +393,29 @@ class YAMLToNestedText(_TypedFormatToSchema):
         yaml2nt example.yml
         yaml2nt <example.yml
         cat example.yml | yaml2nt
+        yaml2nt --max-expansion 100 --report-expansion ci.yml
     """
 
-    def main(self, *input_files: ExistingFile):  # type: ignore  # noqa: D102,ANN201
+    max_expansion = SwitchAttr(
+        'max-expansion',
+        argtype=float,
+        argname='FACTOR',
+        help=(
+            "Fail if expanding aliases would grow a document more than this many times, "
+            "counting nodes"
+        ),
+    )
+    report_expansion = Flag(
+        'report-expansion', help="Print how much aliases expand each document, to stderr"
+    )
+
+    def main(self, *input_files: ExistingFileOrDirectory):  # type: ignore  # noqa: D102,ANN201
         try:
+            expansion = AliasExpansion(limit=self.max_expansion, report=self.report_expansion)
             if not self.to_schema:
-                dump_yaml_to_nestedtext(*input_files)
+                dump_yaml_to_nestedtext(*input_files, batch=self.batch(), expansion=expansion)
             else:
-                dump_yaml_to_schema(*input_files)
+                dump_yaml_to_schema(*input_files, batch=self.batch(), expansion=expansion)
         except Exception as e:  # pragma: no cover
             inspect_exception(e)
             return 1
@@ -289,12 +431,59 @@ class TOMLToNestedText(_TypedFormatToSchema):
         cat example.yml | toml2nt
     """
 
-    def main(self, *input_files: ExistingFile):  # type: ignore  # noqa: D102,ANN201
+    def main(self, *input_files: ExistingFileOrDirectory):  # type: ignore  # noqa: D102,ANN201
         try:
             if not self.to_schema:
-                dump_toml_to_nestedtext(*input_files)
+                dump_toml_to_nestedtext(*input_files, batch=self.batch())
             else:
-                dump_toml_to_schema(*input_files)
+                dump_toml_to_schema(*input_files, batch=self.batch())
         except Exception as e:  # pragma: no cover
             inspect_exception(e)
             return 1
+
+
+class NestedTextTo(_StyledApp):
+    """
+    Manage the nt2 server.
+
+    While nt2 serve is running, the other nt2 commands hand their work to it
+    (unless printing to a terminal), skipping their startup costs.
+    """
+
+    def main(self, *args: str):  # noqa: D102,ANN201
+        if args:
+            print(f"Unknown command: {args[0]}", file=sys.stderr)
+            return 1
+        if not self.nested_command:
+            self.help()
+            return 1
+        return None
+
+
+@NestedTextTo.subcommand('serve')
+class Serve(_StyledApp):
+    """
+    Keep nt2 loaded, and run conversions for the other nt2 commands, over a Unix socket.
+
+    Each conversion runs in a process forked from the warmed-up server,
+    with the caller's arguments, working directory, and stdin.
+
+    Examples:
+        nt2 serve &
+        nt2 serve --socket /run/user/1000/nt2.sock
+    """
+
+    socket_path = SwitchAttr(
+        'socket',
+        argname='PATH',
+        help=(
+            "Listen on this socket path, rather than $NT2_SOCKET, "
+            "or nt2-<UID>.sock in $XDG_RUNTIME_DIR (or /tmp); "
+            "clients find the server via the same default"
+        ),
+    )
+
+    def main(self):  # noqa: D102
+        from .daemon import serve
+
+        serve(self.socket_path)
@@ -14,11 +14,15 @@ except ImportError:
     NoneType = type(None)
 
 if TYPE_CHECKING:
-    from ruamel.yaml.main import YAML
+    from ruamel.yaml.nodes import MappingNode, Node, ScalarNode
     from yamlpath.wrappers.nodecoords import NodeCoords
+from ruamel.yaml.constructor import ConstructorError, RoundTripConstructor, SafeConstructor
+from ruamel.yaml.main import YAML
+from ruamel.yaml.representer import RoundTripRepresenter, SafeRepresenter
+from ruamel.yaml.scalarstring import preserve_literal
 from yamlpath import Processor, YAMLPath
 from yamlpath.common import Parsers
-from yamlpath.exceptions import YAMLPathException
+from yamlpath.exceptions import UnmatchedYAMLPathException, YAMLPathException
 from yamlpath.wrappers import ConsolePrinter
 
 
@@ -34,6 +38,144 @@ def mk_yaml_editor() -> YAML:
     return editor
 
 
+class RoundTripRequiredError(ConstructorError):
+    """YAML uses a feature `PlainConstructor` can't represent as the round-trip loader does."""
+
+
+class PlainConstructor(SafeConstructor):
+    r"""
+    A ``SafeConstructor`` building data which, once unstructured, matches the round-trip loader's.
+
+    Timestamps and dates are constructed by the round-trip loader's own function
+    (as patched by yamlpath), so they get the same ``TimeStamp``/``AnchoredDate`` handling.
+    Merge keys, sets, and ordered maps or pairs, whose order or type would differ,
+    raise `RoundTripRequiredError` instead.
+    """
+
+    def flatten_mapping(self, node: MappingNode):
+        """
+        Refuse to merge mappings, as the safe loader orders merged keys differently.
+
+        Args:
+            node: A mapping about to be constructed.
+
+        Raises:
+            RoundTripRequiredError: The mapping has a merge key.
+        """
+        if any(key_node.tag == 'tag:yaml.org,2002:merge' for key_node, _ in node.value):
+            raise RoundTripRequiredError(problem="merge key", problem_mark=node.start_mark)
+        super().flatten_mapping(node)
+
+    def construct_round_trip_only(self, node: Node):
+        """
+        Refuse to construct a node whose type would differ from the round-trip loader's.
+
+        Args:
+            node: A node tagged as a set, ordered map, or pairs.
+
+        Raises:
+            RoundTripRequiredError: Always.
+        """
+        raise RoundTripRequiredError(problem=f"tag {node.tag}", problem_mark=node.start_mark)
+
+
+PlainConstructor.add_constructor(
+    'tag:yaml.org,2002:timestamp',
+    RoundTripConstructor.yaml_constructors['tag:yaml.org,2002:timestamp'],
+)
+for _tag in ('set', 'omap', 'pairs'):
+    PlainConstructor.add_constructor(
+        f"tag:yaml.org,2002:{_tag}", PlainConstructor.construct_round_trip_only
+    )
+
+
+def mk_plain_yaml_loader() -> YAML:
+    r"""
+    Construct a YAML loader producing plain ``dict``\ s, ``list``\ s, and scalars.
+
+    It uses the C-based libyaml parser when available,
+    and skips the comment and formatting metadata kept by `mk_yaml_editor`'s loader.
+
+    Returns:
+        A configured object able to ``.load`` YAML (``ruamel.yaml.main.YAML``),
+            raising `RoundTripRequiredError` for YAML it can't load as the round-trip loader does.
+    """
+    loader = YAML(typ='safe')
+    loader.Constructor = PlainConstructor
+    return loader
+
+
+class PlainRepresenter(SafeRepresenter):
+    """
+    A ``SafeRepresenter`` for plain data, whose output matches `mk_yaml_editor`'s dumper.
+
+    Multiline string values within a document are represented as literal block scalars
+    as they're emitted, rather than by wrapping them beforehand,
+    and ``None`` is represented as the round-trip dumper does.
+    """
+
+    def represent_key(self, data: object) -> Node:
+        """
+        Represent a mapping key, leaving multiline strings in their default style.
+
+        Args:
+            data: A mapping key to represent.
+
+        Returns:
+            A node, styled as ``ruamel.yaml.scalarstring.walk_tree`` would have it, skipping keys.
+        """
+        if isinstance(data, str):
+            # As represent_data would, so the key isn't anchored for an earlier node
+            self.alias_key = None
+            return super().represent_str(data)
+        return super().represent_key(data)
+
+    def represent_str(self, data: str) -> ScalarNode:
+        """
+        Represent a string, as a literal block scalar if it's multiline and not the whole document.
+
+        Args:
+            data: A string to represent.
+
+        Returns:
+            A scalar node, styled as ``ruamel.yaml.scalarstring.walk_tree`` would have it.
+        """
+        if '\n' in data and self.represented_objects:
+            return self.represent_scalar(
+                'tag:yaml.org,2002:str', preserve_literal(data), style='|'
+            )
+        return super().represent_str(data)
+
+
+PlainRepresenter.add_representer(str, PlainRepresenter.represent_str)
+PlainRepresenter.add_representer(NoneType, RoundTripRepresenter.represent_none)
+
+
+def mk_plain_yaml_dumper() -> YAML:
+    r"""
+    Construct a YAML dumper for plain ``dict``\ s, ``list``\ s, and scalars.
+
+    Its output matches that of `mk_yaml_editor`'s dumper (after ``walk_tree``),
+    but it skips the round-trip representer's handling of comments and formatting metadata.
+    The C-based libyaml emitter isn't used, as it can't offset sequence indentation.
+
+    Returns:
+        A configured object able to ``.dump`` YAML (``ruamel.yaml.main.YAML``),
+            raising ``RepresenterError`` for data beyond plain types, like ``CommentedMap``\ s.
+    """
+    dumper = YAML(typ='safe', pure=True)
+    dumper.Representer = PlainRepresenter
+    dumper.indent(mapping=2, sequence=4, offset=2)
+    dumper.explicit_start = True
+    dumper.width = sys.maxsize
+    dumper.default_flow_style = False
+    dumper.sort_base_mapping_type_on_output = False
+    return dumper
+
+
+QUIET_LOG = ConsolePrinter(SimpleNamespace(quiet=True, verbose=False, debug=False))
+
+
 def mk_yamlpath_processor(data: dict | list) -> Processor:
     """
     Construct a YAML Path processor/document for the ``data``.
@@ -44,11 +186,55 @@ def mk_yamlpath_processor(data: dict | list) -> Processor:
     Returns:
         A document object able to ``.set_value`` and ``.get_nodes`` (``yamlpath.Processor``).
     """
-    log = ConsolePrinter(SimpleNamespace(quiet=True, verbose=False, debug=False))
-    return Processor(log, data)
+    return Processor(QUIET_LOG, data)
+
+
+def parse_yamlpath(query_path: str | YAMLPath) -> YAMLPath:
+    """
+    Parse and validate a YAMLPath query, so it's ready for repeated use.
+
+    Args:
+        query_path: A YAMLPath query ``str``, or an already parsed ``YAMLPath``.
+
+    Returns:
+        A ``YAMLPath`` whose segments have already been parsed.
+
+    Raises:
+        ValueError: The query is not a valid YAMLPath.
+    """
+    ypath = query_path if isinstance(query_path, YAMLPath) else YAMLPath(query_path)
+    try:
+        ypath.escaped  # noqa: B018
+    except YAMLPathException as e:
+        raise ValueError(*e.args) from None
+    except Exception as e:
+        raise ValueError(f"Invalid YAML Path: {query_path}") from e
+    return ypath
+
+
+def _report_exception(exc: YAMLPathException):
+    """
+    Print a yamlpath problem to stderr, without interrupting the program.
+
+    Args:
+        exc: The ``YAMLPathException`` to report.
+    """
+    print(*exc.args, sep='\n', file=sys.stderr)
+
+
+def report_unmatched(query_path: str | YAMLPath):
+    """
+    Print to stderr that a query matched nothing, just as yamlpath would have reported it.
+
+    Args:
+        query_path: The YAMLPath query which matched no nodes.
+    """
+    _report_exception(
+        UnmatchedYAMLPathException("Required YAML Path does not match any nodes", str(query_path))
+    )
 
 
-def non_null_matches(surgeon: Processor, *query_paths: str) -> Iterable[NodeCoords]:
+def non_null_matches(surgeon: Processor, *query_paths: str | YAMLPath) -> Iterable[NodeCoords]:
     r"""
     Generate ``NodeCoords`` matching any ``query_paths``.
 
@@ -56,7 +242,8 @@ def non_null_matches(surgeon: Processor, *query_paths: str) -> Iterable[NodeCoor
 
     Args:
         surgeon: A ``yamlpath.Processor``, already storing the YAML document to be queried.
-        query_paths: YAMLPath query ``str``\ s to find matches for in the document.
+        query_paths: YAMLPath queries (``str``\ s or parsed ``YAMLPath``\ s)
+            to find matches for in the document.
 
     Yields:
         Matching ``NodeCoords`` items from the document,
@@ -68,7 +255,7 @@ def non_null_matches(surgeon: Processor, *query_paths: str) -> Iterable[NodeCoor
                 m for m in surgeon.get_nodes(query_path, mustexist=True) if m.node is not None
             ]
         except YAMLPathException as e:
-            print(*e.args, sep='\n', file=sys.stderr)
+            _report_exception(e)
             continue
         else:
             yield from matches
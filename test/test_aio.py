@@ -0,0 +1,133 @@
+"""Test the async library API."""
+
+from __future__ import annotations
+
+import asyncio
+import io
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import AsyncIterator, Callable
+
+from plumbum import local
+from ward import test
+from ward.expect import assert_equal, assert_less_than_equal_to
+
+from nt2 import aio, convert
+
+SAMPLES = local.path(__file__).up() / 'samples'
+
+
+class CountingExecutor(ThreadPoolExecutor):
+    """A thread pool recording the most tasks it ever ran at once."""
+
+    def __init__(self, max_workers: int):
+        """
+        Start counting.
+
+        Args:
+            max_workers: The number of threads.
+        """
+        super().__init__(max_workers)
+        self.running = self.most_running = 0
+        self._lock = threading.Lock()
+
+    def submit(self, fn: Callable, *args: object, **kwargs: object) -> Future:
+        """
+        Schedule a task, counting it while it runs.
+
+        Args:
+            fn: The task's function.
+            args: Positional arguments for ``fn``.
+            kwargs: Keyword arguments for ``fn``.
+
+        Returns:
+            The task's ``Future``.
+        """
+
+        def counted() -> object:
+            with self._lock:
+                self.running += 1
+                self.most_running = max(self.most_running, self.running)
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                with self._lock:
+                    self.running -= 1
+
+        return super().submit(counted)
+
+
+@test("Async API [limited concurrency in a thread pool]")
+def _():
+    sources = [
+        (SAMPLES / 'yaml' / f"{name}.yml").read('utf-8')
+        for name in ('typed_all', 'untyped', 'lines')
+    ]
+    executor = CountingExecutor(max_workers=8)
+    pool = aio.ConversionPool(executor, limit=2)
+
+    async def convert_all() -> list[str]:
+        return await asyncio.gather(
+            *(pool.convert(source, 'yaml', 'nestedtext') for source in sources * 10)
+        )
+
+    with executor:
+        results = asyncio.run(convert_all())
+    expected = [convert(source, 'yaml', 'nestedtext') for source in sources] * 10
+    assert_equal(results, expected, "NestedText from each conversion")
+    assert_less_than_equal_to(executor.most_running, 2, "most conversions at once")
+
+
+@test("Async API [async sources only read once under the limit]")
+def _():
+    content = (SAMPLES / 'json' / 'untyped.json').read('utf-8')
+    reads = {'running': 0, 'most_running': 0}
+
+    async def chunks() -> AsyncIterator[str]:
+        reads['running'] += 1
+        reads['most_running'] = max(reads['most_running'], reads['running'])
+        for line in content.splitlines(keepends=True):
+            await asyncio.sleep(0)
+            yield line
+        reads['running'] -= 1
+
+    pool = aio.ConversionPool(limit=2)
+
+    async def convert_all() -> list[str]:
+        return await asyncio.gather(
+            *(pool.convert(chunks(), 'json', 'nestedtext') for _ in range(10))
+        )
+
+    results = asyncio.run(convert_all())
+    assert_equal(results, [convert(content, 'json', 'nestedtext')] * 10, "NestedText")
+    assert_less_than_equal_to(reads['most_running'], 2, "most sources read at once")
+
+
+@test("Async API [async stream source and writer, in a process pool]")
+def _():
+    json_file = SAMPLES / 'json' / 'untyped.json'
+    content = json_file.read('utf-8').encode('utf-8')
+
+    async def convert_stream() -> str:
+        reader = asyncio.StreamReader()
+        reader.feed_data(content)
+        reader.feed_eof()
+        out = io.StringIO()
+        with ProcessPoolExecutor(1) as executor:
+            await aio.ConversionPool(executor).convert_into(out, reader, 'json', 'nestedtext')
+        return out.getvalue()
+
+    expected = convert(json_file, 'json', 'nestedtext')
+    assert_equal(asyncio.run(convert_stream()), expected, "written NestedText")
+
+
+@test("Async API [default pool, async iterable source]")
+def _():
+    nt_file = SAMPLES / 'json' / 'base.nt'
+
+    async def chunks():
+        for line in nt_file.read('utf-8').splitlines(keepends=True):
+            yield line
+
+    result = asyncio.run(aio.convert(chunks(), 'nestedtext', 'json'))
+    assert_equal(result, convert(nt_file, 'nestedtext', 'json'), "JSON")
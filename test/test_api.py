@@ -0,0 +1,76 @@
+"""Test the library API."""
+
+from __future__ import annotations
+
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from plumbum import local
+from ward import raises, test
+from ward.expect import assert_equal
+
+from nt2 import convert, convert_into
+from nt2.casters import CastSchema
+
+from .commands import json2nt, nt2json, yaml2nt
+from .utils import assert_file_content
+
+SAMPLES = local.path(__file__).up() / 'samples'
+
+
+@test("API [same output as the CLI, from a path, str, bytes, or stream]")
+def _():
+    json_file = SAMPLES / 'json' / 'untyped.json'
+    content = json_file.read('utf-8')
+    for source in (json_file, content, content.encode('utf-8'), io.StringIO(content)):
+        assert_equal(convert(source, 'json', 'nestedtext'), json2nt(json_file), "NestedText")
+    schema = CastSchema.from_schema_files(SAMPLES / 'json' / 'base.all.types.nt')
+    assert_file_content(
+        SAMPLES / 'json' / 'typed_all.json',
+        convert(SAMPLES / 'json' / 'base.nt', 'nestedtext', 'json', schema=schema),
+    )
+    assert_equal(
+        convert(SAMPLES / 'json' / 'base.nt', 'nestedtext', 'json', layout='compact'),
+        nt2json(SAMPLES / 'json' / 'base.nt', compact=True),
+        "compact JSON",
+    )
+
+
+@test("API [writer variant]")
+def _():
+    yaml_file = SAMPLES / 'yaml' / 'typed_all.yml'
+    out = io.StringIO()
+    convert_into(out, yaml_file, 'yaml', 'nestedtext')
+    assert_equal(out.getvalue(), yaml2nt(yaml_file), "written NestedText")
+
+
+@test("API [unsupported conversions]")
+def _():
+    for from_format, to_format, layout in (
+        ('json', 'yaml', 'indented'),
+        ('nestedtext', 'schema', 'indented'),
+        ('xml', 'nestedtext', 'indented'),
+        ('nestedtext', 'json', 'pretty'),
+    ):
+        with raises(ValueError):
+            convert('{}', from_format, to_format, layout=layout)
+
+
+@test("API [concurrent YAML conversions in threads]")
+def _():
+    yaml_names = ('typed_all', 'typed_dates', 'untyped', 'lines')
+    sources = [(SAMPLES / 'yaml' / f"{name}.yml").read('utf-8') for name in yaml_names]
+    expected = [convert(source, 'yaml', 'nestedtext') for source in sources]
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        nt_results = list(
+            pool.map(lambda source: convert(source, 'yaml', 'nestedtext'), sources * 25)
+        )
+        yaml_results = list(
+            pool.map(lambda content: convert(content, 'nestedtext', 'yaml'), nt_results)
+        )
+    assert_equal(nt_results, expected * 25, "NestedText from each thread")
+    assert_equal(
+        yaml_results,
+        [convert(content, 'nestedtext', 'yaml') for content in expected] * 25,
+        "YAML from each thread",
+    )
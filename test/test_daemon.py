@@ -0,0 +1,75 @@
+"""Test the nt2 server and the console scripts' thin client mode."""
+
+import sys
+import time
+from tempfile import TemporaryDirectory
+
+from plumbum import local
+from ward import test
+from ward.expect import assert_equal, assert_not_in
+
+from .commands import json2nt, nt2json
+
+SAMPLES = local.path(__file__).up() / 'samples'
+PYTHON = local[sys.executable]
+
+SERVE = "from nt2.ui import NestedTextTo; NestedTextTo.run(['nt2', 'serve'])"
+RUN_SCRIPT = "import sys; from nt2 import daemon; getattr(daemon, sys.argv.pop(1))()"
+FORWARD = """
+import sys
+from nt2 import daemon
+print(daemon.forward('JSONToNestedText', sys.argv), 'nt2.ui' in sys.modules, file=sys.stderr)
+"""
+
+
+@test("Server [same output via the thin client, from files and stdin, with fallback]")
+def _():
+    json_file = SAMPLES / 'json' / 'untyped.json'
+    nt_file = SAMPLES / 'json' / 'base.nt'
+    schema_file = SAMPLES / 'json' / 'base.all.types.nt'
+    with TemporaryDirectory() as tmp:
+        socket_path = local.path(tmp) / 'nt2.sock'
+        # Many times the size of each chunk relayed through the socket
+        jsonl_file = local.path(tmp) / 'long.jsonl'
+        jsonl_file.write((SAMPLES / 'json' / 'lines.jsonl').read('utf-8') * 2000, 'utf-8')
+        with local.env(NT2_SOCKET=str(socket_path)):
+            assert_equal(
+                PYTHON('-c', RUN_SCRIPT, 'json2nt', json_file),
+                json2nt(json_file),
+                "NestedText without a server",
+            )
+            server = PYTHON.popen(('-c', SERVE))
+            try:
+                for _ in range(100):
+                    if socket_path.exists():
+                        break
+                    time.sleep(0.1)
+                assert_equal(socket_path.stat().st_mode & 0o777, 0o600, "socket permissions")
+                _, stdout, stderr = PYTHON.run(('-c', FORWARD, json_file))
+                assert_equal(stdout, json2nt(json_file), "NestedText from a file")
+                assert_equal(stderr, '0 False\n', "exit code and local import of nt2.ui")
+                assert_equal(
+                    (PYTHON['-c', RUN_SCRIPT, 'json2nt'] < json_file)(),
+                    json2nt(json_file),
+                    "NestedText from stdin",
+                )
+                assert_equal(
+                    (PYTHON['-c', RUN_SCRIPT, 'json2nt'] < jsonl_file)(),
+                    json2nt(jsonl_file),
+                    "NestedText from long stdin",
+                )
+                with local.cwd(nt_file.up()):
+                    assert_equal(
+                        PYTHON('-c', RUN_SCRIPT, 'nt2json', '-s', schema_file.name, nt_file.name),
+                        nt2json(nt_file, schema_files=(schema_file,)),
+                        "typed JSON, from relative paths",
+                    )
+                exit_code, _, stderr = PYTHON.run(
+                    ('-c', RUN_SCRIPT, 'json2nt', nt_file), retcode=None
+                )
+                assert_equal(exit_code, 1, "exit code for invalid input")
+                assert_not_in('Traceback', stderr, "error message")
+            finally:
+                server.terminate()
+                server.wait()
+            assert_not_in(socket_path, local.path(tmp).list(), "files left after termination")
@@ -1,9 +1,21 @@
 """Test JSON <-> NestedText."""
 
+import io
+import sys
+from contextlib import redirect_stderr, redirect_stdout
+from json import dumps, loads
 from typing import cast
 
 from plumbum import LocalPath, local
-from ward import test
+from ward import raises, skip, test
+from ward.expect import assert_equal, assert_in
+
+from nt2 import dumpers
+from nt2.cache import RenderCache
+from nt2.dumpers import STREAM_CHUNK_ITEMS, Batch, dump_json_to_nestedtext, iter_ntdumps, ntdumps
+from nt2.json_backends import JSON_BACKENDS, get_json_backend
+from nt2.streaming import TopLevelItems
+from nt2.ui import JSONToNestedText
 
 from .commands import json2nt, nt2json
 from .utils import assert_file_content, casting_args_from_schema_file
@@ -30,6 +42,39 @@ for input_json_name, output_nt_name in {
         assert_file_content(expected_file, output)
 
 
+@test("JSON Lines -> NestedText [more records than one streamed chunk]")
+def _():
+    lines = SAMPLES.join('lines.jsonl').read('utf-8').splitlines()
+    copies = STREAM_CHUNK_ITEMS // len(lines) + 1
+    expected_items = SAMPLES.join('lines.nt').read('utf-8').splitlines()
+    with local.tempdir() as tmp:
+        input_file = cast(LocalPath, tmp / 'long.jsonl')
+        input_file.write('\n'.join(lines * copies), 'utf-8')
+        output = json2nt(input_file)
+    assert_equal(output.splitlines(), expected_items * copies, "line for line equivalence check")
+
+
+@test("JSON -> NestedText [single line document is not JSON Lines]")
+def _():
+    with local.tempdir() as tmp:
+        input_file = cast(LocalPath, tmp / 'single.json')
+        input_file.write(SAMPLES.join('lines.jsonl').read('utf-8').splitlines()[0], 'utf-8')
+        output = json2nt(input_file)
+    assert_equal(output.splitlines()[0], 'name: Twoflower', "first line")
+
+
+@test("JSON -> NestedText [streamed rendering matches nestedtext]")
+def _():
+    data = loads(SAMPLES.join('typed_all.json').read('utf-8'))
+    data['edge cases'] = {
+        '': [{}, [], None, '', 'two\r\nlines', ' padded ', {'- dash': {}, 'a: b': 'c\n\nd'}],
+        'multi\nline': [[[]], {'#': 1.5}],
+        '[inline': True,
+    }
+    for value in (data, [data, data['edge cases']], {}, []):
+        assert_equal(''.join(iter_ntdumps(value)), ntdumps(value), "byte for byte equivalence")
+
+
 @test("NestedText -> JSON [untyped]")
 def _():
     expected_file = SAMPLES / 'untyped.json'
@@ -37,6 +82,25 @@ def _():
     assert_file_content(expected_file, output)
 
 
+@test("NestedText -> JSON [casting items of a long top level array and map]")
+def _():
+    count = 3 * TopLevelItems.chunk_lines
+    numbers = [{'n': str(num), 'note': f"line one\nline {num}"} for num in range(count)]
+    with local.tempdir() as tmp:
+        input_file = cast(LocalPath, tmp / 'long.nt')
+        input_file.write(ntdumps(numbers), 'utf-8')
+        output = nt2json(input_file, num_paths=('/*/n',))
+        input_file.write(ntdumps(dict(enumerate(numbers))), 'utf-8')
+        map_output = nt2json(input_file, num_paths=('/*/n',))
+    expected = [{**item, 'n': num} for num, item in enumerate(numbers)]
+    assert_equal(output, dumps(expected, indent=2), "array content")
+    assert_equal(
+        map_output,
+        dumps({str(num): item for num, item in enumerate(expected)}, indent=2),
+        "map content",
+    )
+
+
 @test("NestedText -> JSON [top level array]")
 def _():
     expected_file = SAMPLES / 'lines.json'
@@ -90,3 +154,320 @@ def _():
         schema_file.write(schema_content, 'utf-8')
         output = nt2json(SAMPLES / 'base.nt', schema_files=(schema_file,))
     assert_file_content(expected_file, output)
+
+
+@test("NestedText -> JSON [schema file, multiple inputs]")
+def _():
+    expected_content = (SAMPLES / 'typed_all.json').read('utf-8') * 2
+    output = nt2json(
+        SAMPLES / 'base.nt', SAMPLES / 'base.nt', schema_files=(SAMPLES / 'base.all.types.nt',)
+    )
+    assert_equal(
+        expected_content.splitlines(), output.splitlines(), "line for line equivalence check"
+    )
+
+
+@test("NestedText -> JSON [wildcard and index casting args]")
+def _():
+    expected_file = SAMPLES / 'typed_num.json'
+    output = nt2json(
+        SAMPLES / 'base.nt',
+        num_paths=('/**/age', '/People/*/"temp in celsius"', '/People[0]/"nullable number"'),
+    )
+    assert_file_content(expected_file, output)
+
+
+@test("NestedText -> JSON Lines [one record per document, or per top level element]")
+def _():
+    output = nt2json(
+        SAMPLES / 'lines.nt',
+        SAMPLES / 'base.nt',
+        jsonl=True,
+        schema_files=(SAMPLES / 'base.all.types.nt',),
+    )
+    assert_equal(
+        [loads(line) for line in output.splitlines()],
+        [
+            loads(SAMPLES.join('lines.json').read('utf-8')),
+            loads(SAMPLES.join('typed_all.json').read('utf-8')),
+        ],
+        "records",
+    )
+    output = nt2json(SAMPLES / 'lines.nt', jsonl=True, split=True)
+    assert_equal(
+        [loads(line) for line in output.splitlines()],
+        [loads(line) for line in SAMPLES.join('lines.jsonl').read('utf-8').splitlines()],
+        "records",
+    )
+
+
+@test("NestedText -> JSON [compact]")
+def _():
+    output = nt2json(
+        SAMPLES / 'base.nt', compact=True, schema_files=(SAMPLES / 'base.all.types.nt',)
+    )
+    assert_equal(len(output.splitlines()), 1, "line count")
+    assert_equal(loads(output), loads(SAMPLES.join('typed_all.json').read('utf-8')), "data")
+
+
+def _orjson_missing() -> bool:
+    try:
+        get_json_backend('orjson')
+    except ImportError:
+        return True
+    return False
+
+
+for backend_name in JSON_BACKENDS:
+
+    @skip("orjson is not installed", when=backend_name == 'orjson' and _orjson_missing())
+    @test(f"JSON backend matches the standard library [{backend_name}]")
+    def _(backend_name: str = backend_name):
+        backend = get_json_backend(backend_name)
+        data = [
+            {'text': 'tab\t "quote" é 🐍 \x7f \u2028', '': None, '\x00key': [True, False]},
+            [0.1, 1e16, -2.5e-07, 1.0, 123456789.125, float('inf'), float('nan')],
+            [2**64, -(2**63), 0, []],
+            {},
+        ]
+        assert_equal(backend.dumps(data), dumps(data, indent=2), "indented")
+        assert_equal(loads(backend.dumps_compact(data[0])), data[0], "compact")
+
+
+@test("NestedText -> JSON [literal casting args beside a search query]")
+def _():
+    expected_file = SAMPLES / 'typed_num.json'
+    output = nt2json(
+        SAMPLES / 'base.nt',
+        num_paths=(
+            '/People[0]/age',
+            '/People[-1]/age',
+            '/People[0]/"temp in celsius"',
+            '/People[1]/"temp in celsius"',
+            '/People/"nullable number"[. != ""]',
+        ),
+    )
+    assert_file_content(expected_file, output)
+
+
+@test("NestedText -> JSON [overlapping schema files and respelled casting args]")
+def _():
+    expected_file = SAMPLES / 'typed_all.json'
+    output = nt2json(
+        SAMPLES / 'base.nt',
+        schema_files=(
+            SAMPLES / 'base.all.types.nt',
+            SAMPLES / 'base.bool_null.types.nt',
+            SAMPLES / 'base.num.types.nt',
+        ),
+        num_paths=('People.age', '/People/*/age', '/People/"temp in celsius"/**'),
+    )
+    assert_file_content(expected_file, output)
+
+
+@test("NestedText -> JSON [parallel jobs keep input order]")
+def _():
+    input_files = (SAMPLES / 'base.nt', SAMPLES / 'lines.nt', SAMPLES / 'base.nt')
+    expected_files = (
+        SAMPLES / 'typed_num.json',
+        SAMPLES / 'lines.json',
+        SAMPLES / 'typed_num.json',
+    )
+    output = nt2json(*input_files, schema_files=(SAMPLES / 'base.num.types.nt',), jobs=2)
+    assert_equal(
+        ''.join(f.read('utf-8') for f in expected_files).splitlines(),
+        output.splitlines(),
+        "line for line equivalence check",
+    )
+
+
+class _FakeTerminal(io.StringIO):
+    """A text stream claiming to be interactive."""
+
+    def isatty(self) -> bool:
+        """
+        Claim to be a terminal.
+
+        Returns:
+            ``True``.
+        """
+        return True
+
+
+@test("JSON -> NestedText [highlighted once per document on a terminal, however long]")
+def _():
+    with local.tempdir() as tmp:
+        jsonl_file = cast(LocalPath, tmp / 'long.jsonl')
+        # Long enough to be streamed in several pieces when not on a terminal
+        jsonl_file.write((SAMPLES / 'lines.jsonl').read('utf-8') * 2000, 'utf-8')
+        printed = []
+        syntax_print, stdout = dumpers._syntax_print, sys.stdout  # noqa: SLF001
+        dumpers._syntax_print = lambda content, syntax: printed.append((content, syntax))  # noqa: SLF001
+        sys.stdout = _FakeTerminal()
+        try:
+            dump_json_to_nestedtext(jsonl_file)
+        finally:
+            dumpers._syntax_print, sys.stdout = syntax_print, stdout  # noqa: SLF001
+    expected = (SAMPLES / 'lines.nt').read('utf-8') * 2000
+    assert_equal(printed, [(expected[:-1], 'nt')], "highlighted content")
+
+
+@test("JSON -> NestedText [negative jobs rejected]")
+def _():
+    with redirect_stdout(io.StringIO()) as stdout:
+        _, exit_code = JSONToNestedText.run(
+            ['json2nt', '--jobs', '-1', str(SAMPLES / 'untyped.json')], exit=False
+        )
+    assert_equal(exit_code, 2, "exit code")
+    assert_in('-1 is negative', stdout.getvalue(), "usage error")
+
+
+@test("JSON -> NestedText [parallel jobs keep input order]")
+def _():
+    output = json2nt(SAMPLES / 'lines.jsonl', SAMPLES / 'untyped.json', jobs=0)
+    assert_equal(
+        ''.join(f.read('utf-8') for f in (SAMPLES / 'lines.nt', SAMPLES / 'base.nt')).splitlines(),
+        output.splitlines(),
+        "line for line equivalence check",
+    )
+
+
+@test("NestedText -> JSON [output directory mirrors input directory]")
+def _():
+    with local.tempdir() as tmp:
+        input_dir = cast(LocalPath, tmp / 'input')
+        (input_dir / 'sub').mkdir()
+        (SAMPLES / 'base.nt').copy(input_dir / 'base.nt')
+        (SAMPLES / 'lines.nt').copy(input_dir / 'sub' / 'lines.nt')
+        (SAMPLES / 'untyped.json').copy(input_dir / 'ignored.json')
+        output_dir = cast(LocalPath, tmp / 'output')
+
+        output = nt2json(input_dir, output_dir=str(output_dir))
+        assert_equal(output, '', "stdout content")
+        assert_equal(
+            sorted(str(path.relative_to(output_dir)) for path in output_dir.walk()),
+            ['base.json', 'sub', 'sub/lines.json'],
+            "output files",
+        )
+        assert_file_content(SAMPLES / 'untyped.json', output_dir.join('base.json').read('utf-8'))
+        assert_file_content(
+            SAMPLES / 'lines.json', output_dir.join('sub/lines.json').read('utf-8')
+        )
+
+        mtime = output_dir.join('base.json').stat().st_mtime_ns
+        output_dir.join('sub/lines.json').delete()
+        nt2json(input_dir, output_dir=str(output_dir))
+        assert_equal(output_dir.join('base.json').stat().st_mtime_ns, mtime, "unchanged mtime")
+        assert_file_content(
+            SAMPLES / 'lines.json', output_dir.join('sub/lines.json').read('utf-8')
+        )
+
+        glob_output_dir = cast(LocalPath, tmp / 'glob_output')
+        nt2json(input_dir, output_dir=str(glob_output_dir), globs=('sub/*.nt',))
+        assert_equal(
+            sorted(str(path.relative_to(glob_output_dir)) for path in glob_output_dir.walk()),
+            ['sub', 'sub/lines.json'],
+            "output files",
+        )
+
+
+@test("JSON -> NestedText [output directory rejects stdin, and inputs with the same output]")
+def _():
+    with local.tempdir() as tmp:
+        output_dir = cast(LocalPath, tmp / 'output')
+        with raises(ValueError):
+            dump_json_to_nestedtext(batch=Batch(output_dir=str(output_dir)))
+
+        for sub in ('one', 'two'):
+            (tmp / sub).mkdir()
+            (SAMPLES / 'untyped.json').copy(tmp / sub / 'base.json')
+        (SAMPLES / 'lines.jsonl').copy(tmp / 'one' / 'base.jsonl')
+        for input_paths, clashing in (
+            ((tmp / 'one',), ('one/base.json', 'one/base.jsonl')),
+            ((tmp / 'one' / 'base.json', tmp / 'two'), ('one/base.json', 'two/base.json')),
+        ):
+            with raises(ValueError) as exception:
+                dump_json_to_nestedtext(*input_paths, batch=Batch(output_dir=str(output_dir)))
+            for path in clashing:
+                assert_in(str(tmp / path), str(exception.raised), "error message")
+        assert_equal(sorted(tmp.list()), [tmp / 'one', tmp / 'two'], "files and directories")
+
+
+@test("NestedText <-> JSON [cache reuses output for unchanged inputs and options]")
+def _():
+    with local.tempdir() as tmp:
+        cache_dir = cast(LocalPath, tmp / 'cache')
+        schema_files = (SAMPLES / 'base.all.types.nt',)
+        typed_output = nt2json(SAMPLES / 'base.nt', schema_files=schema_files, cache_dir=cache_dir)
+        assert_file_content(SAMPLES / 'typed_all.json', typed_output)
+        untyped_output = json2nt(SAMPLES / 'untyped.json', cache_dir=cache_dir)
+        assert_file_content(SAMPLES / 'base.nt', untyped_output)
+
+        entries = [path for path in cache_dir.walk() if path.is_file()]
+        assert_equal(len(entries), 2, "cache entries")
+        for entry in entries:
+            RenderCache(cache_dir).put(entry.name, 'from cache')
+
+        output = nt2json(
+            SAMPLES / 'base.nt',
+            cache_dir=cache_dir,
+            **casting_args_from_schema_file(SAMPLES / 'base.all.types.nt'),
+        )
+        assert_equal(output, 'from cache', "cached output for equivalent casting args")
+        output = json2nt(SAMPLES / 'untyped.json', cache_dir=cache_dir)
+        assert_equal(output, 'from cache', "cached output")
+        output = nt2json(SAMPLES / 'base.nt', cache_dir=cache_dir)
+        assert_file_content(SAMPLES / 'untyped.json', output)
+
+
+@test("Cache pruning [least recently used first, skipping files being written]")
+def _():
+    with local.tempdir() as tmp:
+        cache = RenderCache(tmp, max_bytes=0)
+        key = cache.key(SAMPLES / 'base.nt', loads)
+        cache.put(key, 'content')
+        in_progress = tmp / key[:2] / f".{key}.tmpname.tmp"
+        in_progress.write('partial', 'utf-8')
+        cache.prune()
+        assert_equal(cache.get(key), None, "pruned entry")
+        assert_equal(in_progress.read('utf-8'), 'partial', "file being written")
+
+
+@test("NestedText -> JSON [cache repeats diagnostics on a hit]")
+def _():
+    with local.tempdir() as tmp:
+        cache_dir = cast(LocalPath, tmp / 'cache')
+        schema_files = (SAMPLES / 'base.all.types.nt',)
+        stderrs = []
+        for _ in range(2):
+            stderr = io.StringIO()
+            with redirect_stderr(stderr):
+                nt2json(SAMPLES / 'base.nt', schema_files=schema_files, cache_dir=cache_dir)
+            stderrs.append(stderr.getvalue())
+        assert_in('/this/will/never/match', stderrs[0], "unmatched query report")
+        assert_equal(stderrs[1], stderrs[0], "diagnostics from the cache")
+        assert_equal(
+            len([path for path in cache_dir.walk() if path.is_file()]), 1, "cache entries"
+        )
+
+
+@skip("orjson is not installed", when=_orjson_missing())
+@test("NestedText -> JSON [cache keeps output of each JSON backend apart]")
+def _():
+    with local.tempdir() as tmp:
+        cache_dir = cast(LocalPath, tmp / 'cache')
+        output = nt2json(SAMPLES / 'base.nt', compact=True, cache_dir=cache_dir)
+        backends = dict(JSON_BACKENDS)
+        JSON_BACKENDS.clear()
+        JSON_BACKENDS['stdlib'] = backends['stdlib']
+        get_json_backend.cache_clear()
+        try:
+            stdlib_output = nt2json(SAMPLES / 'base.nt', compact=True, cache_dir=cache_dir)
+        finally:
+            JSON_BACKENDS.clear()
+            JSON_BACKENDS.update(backends)
+            get_json_backend.cache_clear()
+        assert_equal(loads(stdlib_output), loads(output), "data")
+        assert_equal(
+            len([path for path in cache_dir.walk() if path.is_file()]), 2, "cache entries"
+        )
@@ -0,0 +1,51 @@
+"""Test the startup cost of the console scripts."""
+
+import sys
+
+from plumbum import LocalPath, local
+from ward import test
+from ward.expect import assert_equal
+
+SAMPLES = local.path(__file__).up() / 'samples'
+PYTHON = local[sys.executable]
+
+HEAVY_MODULES = ('cattrs', 'rich', 'ruamel', 'yamlpath')
+
+LIST_MODULES_AFTER_IMPORT = """
+import sys
+import nt2.ui
+print(*sorted({name.split('.')[0] for name in sys.modules}), sep='\\n', file=sys.stderr)
+"""
+
+RUN_APP_AND_LIST_MODULES = """
+import sys
+from nt2 import ui
+getattr(ui, sys.argv[1]).run(['app', *sys.argv[2:]], exit=False)
+print(*sorted({name.split('.')[0] for name in sys.modules}), sep='\\n', file=sys.stderr)
+"""
+
+
+@test("Heavy imports [import nt2.ui]")
+def _():
+    _, _, stderr = PYTHON.run(('-c', LIST_MODULES_AFTER_IMPORT))
+    loaded_heavy_modules = set(HEAVY_MODULES) & set(stderr.splitlines())
+    assert_equal(loaded_heavy_modules, set(), "unexpected heavy imports")
+
+
+for app_name, input_file, allowed_heavy_modules in (
+    ('JSONToNestedText', SAMPLES / 'json' / 'untyped.json', ()),
+    ('NestedTextToJSON', SAMPLES / 'json' / 'base.nt', ()),
+    ('YAMLToNestedText', SAMPLES / 'yaml' / 'typed_all.yml', ('cattrs', 'ruamel', 'yamlpath')),
+):
+
+    @test(f"Heavy imports when piped [{app_name}]")
+    def _(
+        app_name: str = app_name,
+        input_file: LocalPath = input_file,
+        allowed_heavy_modules: tuple = allowed_heavy_modules,
+    ):
+        _, _, stderr = PYTHON.run(('-c', RUN_APP_AND_LIST_MODULES, app_name, input_file))
+        loaded_heavy_modules = set(HEAVY_MODULES) & set(stderr.splitlines())
+        assert_equal(
+            loaded_heavy_modules - set(allowed_heavy_modules), set(), "unexpected heavy imports"
+        )
@@ -6,13 +6,16 @@ from typing import Sequence, cast
 
 from plumbum import LocalPath, local
 from ward import skip, test
+from ward.expect import assert_equal
+
+from nt2.dumpers import iter_tdumps
 
 from .commands import nt2toml, toml2nt
 from .utils import assert_file_content, casting_args_from_schema_file
 
 try:
-    import tomli  # noqa: F401
-    import tomli_w  # noqa: F401
+    import tomli
+    import tomli_w
 except ImportError:
     TOML_DISABLED = True
 else:
@@ -37,6 +40,25 @@ for input_toml_name, output_nt_name in {
         assert_file_content(expected_file, output)
 
 
+@skip("TOML support not enabled", when=TOML_DISABLED)
+@test("NestedText -> TOML [streamed rendering matches tomli_w]")
+def _():
+    samples = [tomli.loads(toml_file.read('utf-8')) for toml_file in SAMPLES // '*.toml']
+    edge_cases = {
+        'inline': [{'a': 1}, {'b c': {'d': 'e'}}],
+        'tables': [{'a': 1}, {'b': [1, 2]}, {'c': 'two\nlines'}],
+        'mixed': [{'a': 1}, 2],
+        'empty': {},
+        'nested': {'x.y': {'': {}, 'z': [{'w': 'x' * 100}]}},
+    }
+    for data in (*samples, edge_cases):
+        assert_equal(
+            ''.join(iter_tdumps(data)),
+            tomli_w.dumps(data, multiline_strings=True),
+            "byte for byte equivalence",
+        )
+
+
 @skip("TOML support not enabled", when=TOML_DISABLED)
 @test("NestedText -> TOML [untyped]")
 def _():
@@ -1,9 +1,23 @@
 """Test YAML <-> NestedText."""
 
+import io
+from datetime import date
 from typing import cast
 
 from plumbum import LocalPath, local
-from ward import test
+from ruamel.yaml.error import YAMLError
+from ward import raises, test
+from ward.expect import assert_equal, assert_in, assert_is
+
+from nt2.converters import get_converter
+from nt2.dumpers import (
+    STREAM_CHUNK_ITEMS,
+    AliasExpansion,
+    render_yaml_as_nestedtext,
+    ydumps,
+    yload,
+    yload_plain,
+)
 
 from .commands import nt2yaml, yaml2nt
 from .utils import assert_file_content, casting_args_from_schema_file
@@ -26,6 +40,56 @@ for input_yaml_name, output_nt_name in {
         assert_file_content(expected_file, output)
 
 
+@test("Plain YAML loading matches round-trip loading [timestamps, merge keys, and tags]")
+def _():
+    plain_content = (
+        "timestamps: [2001-12-14t21:59:43.10-05:00, 2001-12-14 21:59:43.10, 2002-12-14]\n"
+        "numbers: [0o17, 0x1F, 1_000, .inf, 1e3]\n"
+    )
+    round_trip_content = (
+        "base: &base {x: 1, y: 2}\n"
+        "merged:\n  <<: *base\n  z: 3\n  x: 9\n"
+        "set: !!set {b, a}\n"
+        "tagged: !custom value\n"
+    )
+    unstructure = get_converter('nestedtext').unstructure
+    for content in (plain_content, plain_content + round_trip_content):
+        assert_equal(
+            unstructure(yload_plain(io.StringIO(content))),
+            unstructure(yload(io.StringIO(content))),
+            "unstructured data",
+        )
+    assert_equal(type(yload_plain(io.StringIO(plain_content))), dict, "loaded type")
+
+
+@test("YAML dumping [plain data, and round-trip data with comments]")
+def _():
+    assert_equal(
+        ydumps({'text': 'multi\nline', 'empty': None, 'list': [{'z': 1, 'a': 2}]}),
+        "---\ntext: |-\n  multi\n  line\nempty:\nlist:\n  - z: 1\n    a: 2\n",
+        "plain YAML",
+    )
+    content = "---\ntext: |-\n  multi\n  line\nlist: [1, 2]  # flow style\n"
+    assert_equal(ydumps(yload(io.StringIO(content))), content, "round-trip YAML")
+
+
+@test("YAML dumping [multiline keys keep their default style]")
+def _():
+    assert_equal(
+        ydumps({'multi\nline': 'multi\nline', 'map': {'key\n': 'value'}}),
+        '---\n? "multi\\nline"\n: |-\n  multi\n  line\nmap:\n  ? "key\\n"\n  : value\n',
+        "plain YAML",
+    )
+
+
+@test("YAML dumping [a date shared between values is anchored on the first value]")
+def _():
+    shared = date(2020, 1, 2)
+    assert_equal(
+        ydumps({'a': shared, 'b': shared}), "---\na: &id001 2020-01-02\nb: *id001\n", "plain YAML"
+    )
+
+
 @test("NestedText -> YAML [untyped]")
 def _():
     expected_file = SAMPLES / 'untyped.yml'
@@ -40,6 +104,63 @@ def _():
     assert_file_content(expected_file, output)
 
 
+@test("NestedText -> YAML [top level array split into documents]")
+def _():
+    expected_file = SAMPLES / 'lines_split.yml'
+    output = nt2yaml(SAMPLES / 'lines.nt', split=True)
+    assert_file_content(expected_file, output)
+
+
+@test("YAML -> NestedText [multiple documents]")
+def _():
+    expected_file = SAMPLES / 'lines.nt'
+    output = yaml2nt(SAMPLES / 'lines_split.yml')
+    assert_file_content(expected_file, output)
+
+
+@test("YAML -> NestedText [error line numbers within later documents]")
+def _():
+    with raises(YAMLError) as exception:
+        render_yaml_as_nestedtext(io.StringIO("a: 1\n---\nb: 2\n---\nc: [\n"))
+    assert_in("line 6, column 1", str(exception.raised), "error message")
+
+
+@test("YAML -> NestedText [aliases expanded, within or past a limit]")
+def _():
+    content = "a: &a [x, y]\nb: &b [*a, *a, *a]\nc: [*b, *b, *b]\n"
+    output = render_yaml_as_nestedtext(io.StringIO(content), AliasExpansion(limit=4))
+    assert_equal(output.count('- x\n'), 1 + 3 + 9, "expanded aliases")
+    with raises(ValueError) as exception:
+        render_yaml_as_nestedtext(io.StringIO(content), AliasExpansion(limit=2))
+    assert_in("aliases expand 12 nodes to 45", str(exception.raised), "error message")
+
+
+@test("Unstructuring shares the conversion of shared containers, and rejects cycles")
+def _():
+    unstructure = get_converter('nestedtext').unstructure
+    shared = {'key': 1}
+    data = unstructure([shared, [shared]])
+    assert_equal(data, [{'key': '1'}, [{'key': '1'}]], "unstructured data")
+    assert_is(data[0], data[1][0], "shared container")
+    cycle: list = []
+    cycle.append([cycle])
+    with raises(ValueError):
+        unstructure({'a': cycle[0], 'b': cycle})
+
+
+@test("NestedText -> YAML [top level array longer than one streamed chunk]")
+def _():
+    header, *expected_lines = SAMPLES.join('lines.yml').read('utf-8').splitlines()
+    copies = STREAM_CHUNK_ITEMS // 3 + 1
+    with local.tempdir() as tmp:
+        input_file = cast(LocalPath, tmp / 'long.nt')
+        input_file.write(SAMPLES.join('lines.nt').read('utf-8') * copies, 'utf-8')
+        output = nt2yaml(input_file)
+    assert_equal(
+        output.splitlines(), [header, *expected_lines * copies], "line for line equivalence check"
+    )
+
+
 for schema_file in SAMPLES // 'base.*.types.nt':
 
     @test(f"NestedText -> YAML [schema file: {schema_file.name}]")